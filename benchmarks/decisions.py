@@ -0,0 +1,127 @@
+"""
+Scaling benchmark of ``DecisionsParser`` over synthetic corpora (see ``decisions_corpus.py``).
+
+Every measurement runs in a fresh subprocess, so the reported peak RSS belongs to that
+measurement alone. "rss +MB" is the peak minus the RSS after imports, which shows whether
+memory grows with the corpus size. For the mmap based measurements (single_mmap, index_build,
+indexed_lookup) RSS includes the touched pages of the mapped file, which are page cache
+shared with the OS rather than heap.
+
+Usage::
+
+    python benchmarks/decisions.py --sizes 1000 10000 100000 --dir /tmp/corpora
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from decisions_corpus import decision_code, generate_corpus
+
+from epopy.decisions import DecisionsParser
+
+BATCH = 100
+
+def _rss_mb() -> float:
+    # ru_maxrss is in kB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def _sample(size: int) -> List[str]:
+    return [decision_code(i) for i in random.Random(size).sample(range(size), min(BATCH, size))]
+
+def _single_stream(parser: DecisionsParser, size: int) -> Any:
+    # The last decision is the worst case of a streaming lookup
+    return parser.find_decision(decision_code(size - 1)) is not None
+
+def _single_mmap(parser: DecisionsParser, size: int) -> Any:
+    return parser.find_decision(decision_code(size - 1), use_mmap=True) is not None
+
+def _iterate_full(parser: DecisionsParser, size: int) -> Any:
+    return sum(1 for _ in parser.iter_decisions())
+
+def _iterate_metadata(parser: DecisionsParser, size: int) -> Any:
+    return sum(1 for _ in parser.iter_decisions(fields=[]))
+
+def _batch_lookup(parser: DecisionsParser, size: int) -> Any:
+    return sum(1 for d in parser.find_decisions(_sample(size)).values() if d is not None)
+
+def _index_build(parser: DecisionsParser, size: int) -> Any:
+    return parser.build_index()
+
+def _indexed_lookup(parser: DecisionsParser, size: int) -> Any:
+    # Index build is measured separately; this times BATCH single lookups against it
+    parser.build_index()
+    codes = _sample(size)
+    start = time.perf_counter()
+    found = sum(1 for code in codes if parser.find_decision(code) is not None)
+    return {"found": found, "lookup_seconds": time.perf_counter() - start}
+
+MEASUREMENTS: Dict[str, Callable[[DecisionsParser, int], Any]] = {
+    "single_stream": _single_stream,
+    "single_mmap": _single_mmap,
+    "iterate_full": _iterate_full,
+    "iterate_metadata": _iterate_metadata,
+    "batch_lookup": _batch_lookup,
+    "index_build": _index_build,
+    "indexed_lookup": _indexed_lookup,
+}
+
+def measure(name: str, path: str, size: int) -> Dict[str, Any]:
+    """Runs one measurement in this process."""
+    parser = DecisionsParser(path)
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    result = MEASUREMENTS[name](parser, size)
+    elapsed = time.perf_counter() - start
+    if isinstance(result, dict) and "lookup_seconds" in result:
+        # Report the per-lookup cost, not the index build
+        elapsed = result["lookup_seconds"]
+    return {"seconds": elapsed, "peak_rss_mb": _rss_mb(), "rss_delta_mb": _rss_mb() - baseline, "result": result}
+
+def run(sizes: List[int], directory: Path, only: List[str]) -> List[Dict[str, Any]]:
+    directory.mkdir(parents=True, exist_ok=True)
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:
+        path = directory / f"EPDecisions_synthetic_{size}.xml"
+        if not path.exists():
+            start = time.perf_counter()
+            generate_corpus(path, size)
+            print(f"Generated {path} ({path.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+        for name in MEASUREMENTS:
+            if only and name not in only:
+                continue
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", name, str(path), str(size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            row = {"size": size, "measurement": name, "file_mb": path.stat().st_size / 1e6, **json.loads(output)}
+            rows.append(row)
+            print(
+                f"{size:>8} {name:<18}{row['seconds']:>10.3f}s{row['peak_rss_mb']:>10.1f} MB"
+                f"{row['rss_delta_mb']:>+10.1f} MB"
+            )
+    return rows
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--dir", default="benchmarks/.corpora", help="Where generated corpora are kept")
+    parser.add_argument("--only", nargs="*", default=[], help="Measurement names to run")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'measurement':<18}{'time':>11}{'peak RSS':>13}{'rss +':>13}")
+    results = run(args.sizes, Path(args.dir), args.only)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,90 @@
+"""
+Generator of synthetic EPDecisions-style XML files for benchmarking ``DecisionsParser``.
+
+Decisions follow the structure of the published Boards of Appeal dump (bibliographic
+data, board, keywords, headnote, summary of facts, reasons) with text lengths drawn
+around those of real decisions: a handful of paragraphs of facts and a few dozen
+paragraphs of reasons, i.e. roughly 20-40 kB per decision.
+
+Usage::
+
+    python benchmarks/decisions_corpus.py 10000 corpus_10k.xml
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import IO, Iterator, Tuple
+
+WORDS = (
+    "the claim board appellant respondent invention request auxiliary main feature "
+    "prior art document inventive step novelty amendment application patent skilled "
+    "person technical effect problem solution disclosure opposition division examining "
+    "article rule convention proceedings appeal decision reasons therefore however"
+).split()
+
+KEYWORDS = (
+    "Inventive step - (no)", "Novelty - (yes)", "Amendments - allowable (yes)",
+    "Added subject-matter - (no)", "Sufficiency of disclosure - (yes)",
+    "Late-filed request - admitted (no)", "Remittal - (yes)", "Clarity - (no)",
+)
+
+BOARDS = ("3.2.01", "3.2.04", "3.3.02", "3.3.07", "3.4.03", "3.5.01", "3.5.06")
+
+def case_number(position: int) -> Tuple[str, str, str]:
+    """Case number (type, appeal number, year) of the n-th generated decision; all unique."""
+    year = 1990 + position % 35
+    return "T", str(position // 35 + 1).zfill(4), str(year)
+
+def decision_code(position: int) -> str:
+    case_type, number, year = case_number(position)
+    return f"{case_type} {int(number)}/{year[-2:]}"
+
+def _paragraphs(rng: random.Random, count: int, words: Tuple[int, int]) -> Iterator[str]:
+    for _ in range(count):
+        yield " ".join(rng.choice(WORDS) for _ in range(rng.randint(*words))) + "."
+
+def write_decision(out: IO[str], position: int, rng: random.Random) -> None:
+    case_type, number, year = case_number(position)
+    language = rng.choice(("en", "en", "en", "de", "fr"))
+    facts = "".join(f"<p>{p}</p>" for p in _paragraphs(rng, rng.randint(4, 12), (40, 160)))
+    reasons = "".join(f"<p>{p}</p>" for p in _paragraphs(rng, rng.randint(10, 40), (40, 200)))
+    keywords = "".join(f"<keyword>{k}</keyword>" for k in rng.sample(KEYWORDS, rng.randint(1, 4)))
+    headnote = (
+        f"<ep-headnote><p>{next(_paragraphs(rng, 1, (30, 80)))}</p></ep-headnote>"
+        if rng.random() < 0.05 else ""
+    )
+    out.write(
+        f'<ep-appeal-decision lang="{language}">'
+        f"<ep-appeal-bib-data>"
+        f'<ep-case-num code="{case_type}"><ep-appeal-num>{number}</ep-appeal-num><ep-year>{year}</ep-year></ep-case-num>'
+        f"<ep-date-of-decision><date>{year}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}</date></ep-date-of-decision>"
+        f"<application-reference><document-id><doc-number>{rng.randint(10**7, 10**8 - 1)}</doc-number></document-id></application-reference>"
+        f"<publication-reference><document-id><doc-number>{rng.randint(10**6, 4 * 10**6):07d}</doc-number></document-id></publication-reference>"
+        f"<invention-title>{' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))}</invention-title>"
+        f"</ep-appeal-bib-data>"
+        f"<ep-board-of-appeal-code>{rng.choice(BOARDS)}</ep-board-of-appeal-code>"
+        f"<ep-keywords>{keywords}</ep-keywords>{headnote}"
+        f"<ep-summary-of-facts>{facts}</ep-summary-of-facts>"
+        f"<ep-reasons-for-decision>{reasons}</ep-reasons-for-decision>"
+        f"</ep-appeal-decision>\n"
+    )
+
+def generate_corpus(path: str | Path, count: int, seed: int = 0) -> Path:
+    """Writes ``count`` synthetic decisions to ``path``, streaming so memory stays flat."""
+    path = Path(path)
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n<ep-appeal-decisions>\n')
+        for position in range(count):
+            write_decision(out, position, rng)
+        out.write("</ep-appeal-decisions>\n")
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic EPDecisions XML file")
+    parser.add_argument("count", type=int, help="Number of decisions")
+    parser.add_argument("path", help="Output file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    output = generate_corpus(args.path, args.count, args.seed)
+    print(f"Wrote {args.count} decisions ({output.stat().st_size / 1e6:.1f} MB) to {output}")
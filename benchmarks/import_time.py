@@ -0,0 +1,52 @@
+"""
+Import-time benchmark: how long typical entry points take in a fresh interpreter.
+
+Each scenario runs ``--runs`` times in a new process; the median is reported. With
+``--max-ms`` the exit status is 1 if ``import epopy`` takes longer, which catches
+heavy modules creeping back into the package import.
+
+Usage::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --max-ms 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import epopy": "import epopy",
+    "import epopy.decisions": "import epopy.decisions",
+    "client construction": "from epopy import AsyncClient; AsyncClient('key', 'secret')",
+    "client + first parse": (
+        "from epopy import AsyncClient; client = AsyncClient('key', 'secret'); "
+        "client.parse_response({'ops:world-patent-data': {}}); "
+        "from epopy.client import _xmltodict; _xmltodict().parse('<a/>')"
+    ),
+    "client + pdf merge": (
+        "from epopy import AsyncClient; AsyncClient('key', 'secret'); "
+        "from epopy.patent import _pypdf; _pypdf()"
+    ),
+}
+
+def measure(code: str) -> float:
+    """Seconds spent running ``code`` in a fresh interpreter, excluding interpreter startup."""
+    timed = f"import time\n_start = time.perf_counter()\n{code}\nprint(time.perf_counter() - _start)"
+    output = subprocess.run([sys.executable, "-c", timed], check=True, capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, help="Fail if 'import epopy' takes longer than this")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        results[name] = statistics.median(measure(code) for _ in range(args.runs)) * 1000
+        print(f"{name:<24}{results[name]:>9.1f} ms")
+
+    if args.max_ms is not None and results["import epopy"] > args.max_ms:
+        print(f"'import epopy' took {results['import epopy']:.1f} ms, more than {args.max_ms} ms")
+        sys.exit(1)
@@ -0,0 +1,366 @@
+"""
+Local ASGI stand-in for the EPO OPS REST services, used by the benchmarks.
+
+Responses follow the structure of recorded OPS payloads (search results, exchange
+documents with bibliographic data and abstracts, images inquiries, fulltext inquiries,
+claims and descriptions, single-page PDFs)
+with deterministic synthetic content. The server can add latency, reports
+throttle/quota headers and can answer a fraction of image requests with a
+403 RobotDetected fault, as OPS does under fair use enforcement.
+
+Use it through httpx without opening a socket::
+
+    app = MockOPS(latency=0.005)
+    client = AsyncClient("key", "secret", transport=httpx.ASGITransport(app=app))
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+NAMESPACES = (
+    'xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:ftxt="http://www.epo.org/fulltext"'
+)
+
+WORDS = (
+    "method apparatus system device composition layer polymer signal control unit "
+    "substrate surface process wherein comprising first second member housing sensor "
+    "configured plurality element data network module frequency temperature fluid"
+).split()
+
+ROBOT_DETECTED = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<fault xmlns="http://ops.epo.org"><code>CLIENT.RobotDetected</code>'
+    '<message>Recent behaviour implies you are a robot.</message></fault>'
+)
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def doc_number(position: int) -> str:
+    """Docdb number of the n-th synthetic publication, e.g. "1000001"."""
+    return str(1000000 + position)
+
+def exchange_document(number: str, kind: str = "A1", full_cycle: bool = False) -> str:
+    """An exchange-document as returned by the biblio (or full-cycle) endpoint."""
+    rng = random.Random(number)
+    applicants = "".join(
+        f'<applicant sequence="{i}" data-format="epodoc"><applicant-name><name>'
+        f'{_text(rng, 3).upper()} GMBH</name></applicant-name></applicant>'
+        for i in range(1, rng.randint(2, 4))
+    )
+    inventors = "".join(
+        f'<inventor sequence="{i}" data-format="epodoc"><inventor-name><name>'
+        f'{_text(rng, 2).upper()}</name></inventor-name></inventor>'
+        for i in range(1, rng.randint(2, 6))
+    )
+    classifications = "".join(
+        f'<patent-classification sequence="{i}"><classification-scheme office="EP" scheme="CPCI"/>'
+        f'<section>H</section><class>04</class><subclass>L</subclass>'
+        f'<main-group>{rng.randint(1, 99)}</main-group><subgroup>{rng.randint(1, 999)}</subgroup>'
+        f'</patent-classification>'
+        for i in range(1, rng.randint(3, 12))
+    )
+    citations = "".join(
+        f'<citation cited-phase="search" sequence="{i}"><patcit num="{i}">'
+        f'<document-id document-id-type="docdb"><country>US</country>'
+        f'<doc-number>{rng.randint(5000000, 9999999)}</doc-number><kind>B2</kind></document-id>'
+        f'</patcit></citation>'
+        for i in range(1, rng.randint(4, 15))
+    )
+    cycles = ""
+    if full_cycle:
+        cycles = "".join(
+            f'<bibliographic-data><publication-reference><document-id document-id-type="docdb">'
+            f'<country>EP</country><doc-number>{number}</doc-number><kind>{cycle_kind}</kind>'
+            f'</document-id></publication-reference><abstract lang="en"><p>{_text(rng, 150)}</p>'
+            f'</abstract></bibliographic-data>'
+            for cycle_kind in ("A2", "A3", "B1")
+        )
+    return (
+        f'<exchange-document system="ops.epo.org" family-id="{rng.randint(10**7, 10**8)}" '
+        f'country="EP" doc-number="{number}" kind="{kind}">'
+        f'<bibliographic-data>'
+        f'<publication-reference><document-id document-id-type="docdb"><country>EP</country>'
+        f'<doc-number>{number}</doc-number><kind>{kind}</kind><date>2020{rng.randint(10, 12)}01</date>'
+        f'</document-id></publication-reference>'
+        f'<classifications-ipcr><classification-ipcr sequence="1"><text>H04L  29/06</text>'
+        f'</classification-ipcr></classifications-ipcr>'
+        f'<patent-classifications>{classifications}</patent-classifications>'
+        f'<application-reference doc-id="{rng.randint(10**8, 10**9)}"><document-id document-id-type="docdb">'
+        f'<country>EP</country><doc-number>{rng.randint(10**7, 10**8)}</doc-number></document-id>'
+        f'</application-reference>'
+        f'<parties><applicants>{applicants}</applicants><inventors>{inventors}</inventors></parties>'
+        f'<invention-title lang="en">{_text(rng, 8)}</invention-title>'
+        f'<references-cited>{citations}</references-cited>'
+        f'</bibliographic-data>'
+        f'<abstract lang="en"><p>{_text(rng, 120)}</p></abstract>'
+        f'{cycles}'
+        f'</exchange-document>'
+    )
+
+def search_response(cql: str, total: int, start: int, end: int, with_biblio: bool) -> str:
+    """A published-data search page for positions start-end of ``total`` results."""
+    end = min(end, total)
+    if with_biblio:
+        # Every hit comes wrapped in its own exchange-documents element
+        hits = "".join(
+            f'<exchange-documents>{exchange_document(doc_number(i))}</exchange-documents>'
+            for i in range(start, end + 1)
+        )
+        results = f'<ops:search-result>{hits}</ops:search-result>'
+    else:
+        hits = "".join(
+            f'<ops:publication-reference system="ops.epo.org" family-id="{10**7 + i}">'
+            f'<document-id document-id-type="docdb"><country>EP</country>'
+            f'<doc-number>{doc_number(i)}</doc-number><kind>A1</kind></document-id>'
+            f'</ops:publication-reference>'
+            for i in range(start, end + 1)
+        )
+        results = f'<ops:search-result>{hits}</ops:search-result>'
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><ops:world-patent-data {NAMESPACES}>'
+        f'<ops:biblio-search total-result-count="{total}"><ops:query syntax="CQL">{cql}</ops:query>'
+        f'<ops:range begin="{start}" end="{end}"/>{results}</ops:biblio-search>'
+        f'</ops:world-patent-data>'
+    )
+
+def exchange_documents_response(documents: List[str]) -> str:
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><ops:world-patent-data {NAMESPACES}>'
+        f'<exchange-documents>{"".join(documents)}</exchange-documents></ops:world-patent-data>'
+    )
+
+def images_inquiry(country: str, number: str, kind: str, pages: int) -> str:
+    """Images inquiry listing a FullDocument of ``pages`` pages plus drawings."""
+    link = f"published-data/images/{country}/{number}/{kind}/fullimage"
+    drawings = max(1, pages // 4)
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><ops:world-patent-data {NAMESPACES}>'
+        f'<ops:document-inquiry><ops:inquiry-result>'
+        f'<ops:document-instance system="ops.epo.org" number-of-pages="{pages}" desc="FullDocument" link="{link}">'
+        f'<ops:document-format-options><ops:document-format>application/pdf</ops:document-format>'
+        f'<ops:document-format>image/tiff</ops:document-format></ops:document-format-options>'
+        f'<ops:document-section name="ABSTRACT" start-page="1"/>'
+        f'<ops:document-section name="DESCRIPTION" start-page="2"/>'
+        f'<ops:document-section name="DRAWINGS" start-page="{pages - drawings + 1}"/>'
+        f'</ops:document-instance>'
+        f'<ops:document-instance system="ops.epo.org" number-of-pages="{drawings}" desc="Drawing" '
+        f'link="published-data/images/{country}/{number}/{kind}/thumbnail">'
+        f'<ops:document-format-options><ops:document-format>image/tiff</ops:document-format>'
+        f'</ops:document-format-options></ops:document-instance>'
+        f'</ops:inquiry-result></ops:document-inquiry></ops:world-patent-data>'
+    )
+
+def has_fulltext(number: str) -> bool:
+    """Every third synthetic publication has no fulltext, like older or non-EP documents."""
+    return int(number) % 3 != 0
+
+def fulltext_inquiry(numbers: List[Tuple[str, str, str]]) -> str:
+    """Fulltext inquiry listing claims and description for the numbers that have them."""
+    results = "".join(
+        f'<ftxt:inquiry-result><publication-reference data-format="docdb">'
+        f'<document-id document-id-type="docdb"><country>{country}</country>'
+        f'<doc-number>{number}</doc-number><kind>{kind}</kind></document-id></publication-reference>'
+        f'<ftxt:fulltext-instance desc="description"><ftxt:fulltext-format>text-only</ftxt:fulltext-format>'
+        f'</ftxt:fulltext-instance>'
+        f'<ftxt:fulltext-instance desc="claims"><ftxt:fulltext-format>text-only</ftxt:fulltext-format>'
+        f'</ftxt:fulltext-instance></ftxt:inquiry-result>'
+        for country, number, kind in numbers if has_fulltext(number)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><ops:world-patent-data {NAMESPACES}>'
+        f'<ftxt:fulltext-inquiry>{results}</ftxt:fulltext-inquiry></ops:world-patent-data>'
+    )
+
+def fulltext_document(country: str, number: str, kind: str, section: str) -> str:
+    """Claims (15 in three languages) or description (60 paragraphs) of a publication."""
+    rng = random.Random(f"{number}{section}")
+    if section == "claims":
+        body = "".join(
+            f'<claims lang="{lang}">' + "".join(
+                f'<claim><claim-text>{i}. {_text(rng, 60)}</claim-text></claim>' for i in range(1, 16)
+            ) + '</claims>'
+            for lang in ("EN", "DE", "FR")
+        )
+    else:
+        body = '<description lang="EN">' + "".join(
+            f'<p num="{i:04d}">{_text(rng, 80)}</p>' for i in range(1, 61)
+        ) + '</description>'
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><ops:world-patent-data {NAMESPACES}>'
+        f'<ftxt:fulltext-documents><ftxt:fulltext-document system="ops.epo.org" fulltext-format="text-only">'
+        f'<bibliographic-data><publication-reference data-format="docdb"><document-id document-id-type="docdb">'
+        f'<country>{country}</country><doc-number>{number}</doc-number><kind>{kind}</kind></document-id>'
+        f'</publication-reference></bibliographic-data>{body}'
+        f'</ftxt:fulltext-document></ftxt:fulltext-documents></ops:world-patent-data>'
+    )
+
+@lru_cache(maxsize=1)
+def pdf_page() -> bytes:
+    """A single A4 PDF page padded to roughly the size of a scanned OPS page."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=595, height=842)
+    # Scanned pages are ~50-150 kB; metadata padding keeps the transfer size realistic
+    writer.add_metadata({"/Padding": "x" * 80_000})
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    robot_detected: int = 0
+    by_service: Dict[str, int] = field(default_factory=lambda: {})
+
+class MockOPS:
+    """
+    ASGI application imitating the OPS endpoints the client uses.
+
+    Args:
+        total_results: Total result count reported for every search.
+        pages: Number of pages of every FullDocument.
+        latency: Base latency per request in seconds.
+        jitter: Extra uniformly distributed latency in seconds, for tail latency.
+        robot_rate: Fraction of image requests answered with 403 RobotDetected.
+        hourly_quota_start: Initial value of X-IndividualQuotaPerHour-Used.
+        seed: Seed of the latency/fault randomness.
+    """
+
+    def __init__(
+        self,
+        total_results: int = 2000,
+        pages: int = 10,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        robot_rate: float = 0.0,
+        hourly_quota_start: int = 0,
+        seed: int = 0
+    ):
+        self.total_results = total_results
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.robot_rate = robot_rate
+        self.rng = random.Random(seed)
+        self.hourly_used = hourly_quota_start
+        self.weekly_used = hourly_quota_start
+        self.stats = MockStats()
+        self._recent: List[float] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        status, content_type, content, service = self.handle(scope, body)
+        self.stats.requests += 1
+        self.stats.by_service[service] = self.stats.by_service.get(service, 0) + 1
+        headers = [(b"content-type", content_type.encode())]
+        if service != "auth":
+            headers.extend(self._quota_headers(len(content)))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+    def handle(self, scope: Scope, body: bytes) -> Tuple[int, str, bytes, str]:
+        """Routes a request; returns status, content type, body and service name."""
+        path: str = scope["path"]
+        query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+
+        if path.endswith("/auth/accesstoken"):
+            token = {"access_token": "benchmark-token", "expires_in": "1200", "token_type": "BearerToken"}
+            return 200, "application/json", json.dumps(token).encode(), "auth"
+
+        path = path.split("/rest-services/", 1)[-1]
+
+        if path.startswith("published-data/search"):
+            start, end = 1, 25
+            match = re.match(r"(\d+)-(\d+)", headers.get("range", ""))
+            if match:
+                start, end = int(match.group(1)), int(match.group(2))
+            xml = search_response(query.get("q", ""), self.total_results, start, end, path.endswith("/biblio"))
+            return 200, "application/xml", xml.encode(), "search"
+
+        if path.startswith("published-data/images/"):
+            if self.robot_rate and self.rng.random() < self.robot_rate:
+                self.stats.robot_detected += 1
+                return 403, "application/xml", ROBOT_DETECTED.encode(), "images"
+            return 200, "application/pdf", pdf_page(), "images"
+
+        match = re.match(r"published-data/publication/docdb/(?:([^/]+)/)?(fulltext|claims|description)$", path)
+        if match:
+            number_part, endpoint = match.groups()
+            if endpoint == "fulltext":
+                numbers = [number_part] if number_part else body.decode().split(",")
+                xml = fulltext_inquiry([self._split(number) for number in numbers])
+                return 200, "application/xml", xml.encode(), "inquiry"
+            country, number, kind = self._split(number_part or "")
+            if not has_fulltext(number):
+                return 404, "application/xml", b"<fault><code>SERVER.EntityNotFound</code></fault>", "fulltext"
+            return 200, "application/xml", fulltext_document(country, number, kind, endpoint).encode(), "fulltext"
+
+        match = re.match(r"published-data/publication/docdb/(?:([^/]+)/)?(biblio|full-cycle|images)$", path)
+        if match:
+            number_part, endpoint = match.groups()
+            numbers = [number_part] if number_part else body.decode().split(",")
+            if endpoint == "images":
+                country, number, kind = self._split(numbers[0])
+                return 200, "application/xml", images_inquiry(country, number, kind, self.pages).encode(), "inquiry"
+            documents = [
+                exchange_document(number, kind, full_cycle=endpoint == "full-cycle")
+                for _, number, kind in map(self._split, numbers)
+            ]
+            return 200, "application/xml", exchange_documents_response(documents).encode(), "retrieval"
+
+        return 404, "application/xml", b"<fault><code>SERVER.EntityNotFound</code></fault>", "unknown"
+
+    @staticmethod
+    def _split(docdb: str) -> Tuple[str, str, str]:
+        """Splits "EP.1000001.A1" (or "EP1000001A1") into its parts."""
+        parts = docdb.strip().split(".")
+        if len(parts) == 3:
+            return parts[0], parts[1], parts[2]
+        match = re.match(r"([A-Z]{2})(\d+)([A-Z]\d?)?$", docdb.strip())
+        if not match:
+            return "EP", docdb.strip(), "A1"
+        return match.group(1), match.group(2), match.group(3) or "A1"
+
+    def _quota_headers(self, size: int) -> List[Tuple[bytes, bytes]]:
+        """Throttle state from the request rate over the last second, plus quota counters."""
+        now = time.monotonic()
+        self._recent = [t for t in self._recent if now - t < 1.0]
+        self._recent.append(now)
+        rate = len(self._recent)
+        state, color = ("idle", "green") if rate < 200 else ("busy", "yellow") if rate < 1000 else ("overloaded", "red")
+        self.hourly_used += size
+        self.weekly_used += size
+        control = f"{state} (images={color}:200, inpadoc={color}:60, other={color}:1000, retrieval={color}:200, search={color}:30)"
+        return [
+            (b"x-throttling-control", control.encode()),
+            (b"x-individualquotaperhour-used", str(self.hourly_used).encode()),
+            (b"x-registeredquotaperweek-used", str(self.weekly_used).encode()),
+        ]
@@ -0,0 +1,53 @@
+"""
+CPU cost per response of building the OPSResponse models, next to the XML parse that
+precedes it. "construct" builds the same models without validation
+(``model_construct`` on every exchange document), for comparison with a trusted
+fast path; the ``*_raw`` service methods skip models altogether.
+
+Usage::
+
+    python benchmarks/response_models.py --repeat 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent))
+from mock_ops import doc_number, exchange_document, exchange_documents_response, images_inquiry, search_response
+
+import xmltodict
+
+from epopy.models import ExchangeDocument, OPSResponse
+
+PAYLOADS: Dict[str, str] = {
+    "full-cycle x100": exchange_documents_response([
+        exchange_document(doc_number(i), full_cycle=True) for i in range(1, 101)
+    ]),
+    "search biblio x100": search_response("ti=benchmark", 2000, 1, 100, with_biblio=True),
+    "search refs x100": search_response("ti=benchmark", 2000, 1, 100, with_biblio=False),
+    "images inquiry": images_inquiry("EP", "1000001", "A1", 20),
+}
+
+def per_call_ms(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20}{'size kB':>9}{'parse ms':>10}{'validate ms':>13}{'construct ms':>14}")
+    for name, xml in PAYLOADS.items():
+        data = xmltodict.parse(xml)
+        root = data["ops:world-patent-data"]
+        docs = (root.get("exchange-documents") or {}).get("exchange-document") or []
+        docs = [docs] if isinstance(docs, dict) else docs
+        parse = per_call_ms(lambda: xmltodict.parse(xml), args.repeat)
+        validate = per_call_ms(lambda: OPSResponse(**data), args.repeat * 10)
+        construct = per_call_ms(lambda: [ExchangeDocument.model_construct(**doc) for doc in docs], args.repeat * 10)
+        print(f"{name:<20}{len(xml) / 1000:>9.0f}{parse:>10.2f}{validate:>13.3f}{construct:>14.3f}")
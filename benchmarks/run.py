@@ -0,0 +1,206 @@
+"""
+Offline benchmarks of the OPS client against the local mock server (``mock_ops.py``).
+
+No credentials or network access are needed: the client talks to the ASGI app through
+``httpx.ASGITransport``. Every scenario reports wall time, throughput and request
+latency percentiles (from the client's instrumentation events).
+
+Usage::
+
+    python benchmarks/run.py                       # full run, table output
+    python benchmarks/run.py --quick --json out.json
+    python benchmarks/run.py --quick --baseline base.json --tolerance 0.3
+
+With ``--baseline`` the exit status is 1 if any scenario's throughput dropped by more
+than ``--tolerance`` compared to the baseline results.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent))
+from mock_ops import MockOPS, doc_number, exchange_document, exchange_documents_response
+
+from epopy import AsyncClient
+from epopy.instrumentation import StatsCollector
+from epopy.patent import Document
+
+@dataclass
+class Sizes:
+    search_results: int
+    batch_numbers: int
+    pages: int
+    documents: int
+    parse_documents: int
+    fulltext_numbers: int
+
+FULL = Sizes(search_results=2000, batch_numbers=1000, pages=20, documents=5, parse_documents=100, fulltext_numbers=150)
+QUICK = Sizes(search_results=500, batch_numbers=300, pages=10, documents=2, parse_documents=50, fulltext_numbers=45)
+
+Scenario = Callable[[AsyncClient, Sizes], Awaitable[int]]
+
+async def search_pagination(client: AsyncClient, sizes: Sizes) -> int:
+    client.search.clear_cache()
+    count = 0
+    async for _ in client.search.iter_patents("ti=benchmark", page_size=100):
+        count += 1
+    return count
+
+async def search_with_biblio(client: AsyncClient, sizes: Sizes) -> int:
+    client.search.clear_cache()
+    count = 0
+    async for _ in client.search.iter_patents("ti=benchmark", page_size=100, include=["biblio"]):
+        count += 1
+    return count
+
+async def batch_retrieval(client: AsyncClient, sizes: Sizes) -> int:
+    client.published_data.clear_cache()
+    numbers = [f"EP.{doc_number(i)}.A1" for i in range(1, sizes.batch_numbers + 1)]
+    results = await client.published_data.published_data_many("publication", "docdb", numbers, "biblio")
+    return len(results)
+
+async def document_download(client: AsyncClient, sizes: Sizes) -> int:
+    pages = 0
+    for i in range(1, sizes.documents + 1):
+        patent = client.get_patent(f"EP.{doc_number(i)}.A1")
+        documents = await patent.get_documents()
+        full = next(doc for doc in documents if doc.description == "FullDocument")
+        await full.download(use_store=False)
+        pages += full.number_of_pages or 0
+    return pages
+
+async def fulltext(client: AsyncClient, sizes: Sizes) -> int:
+    client.published_data.clear_cache()
+    numbers = [f"EP.{doc_number(i)}.A1" for i in range(1, sizes.fulltext_numbers + 1)]
+    count = 0
+    async for _ in client.published_data.iter_fulltext("docdb", numbers):
+        count += 1
+    return count
+
+def parsing_scenario(size: int) -> Scenario:
+    xml = exchange_documents_response([
+        exchange_document(doc_number(i), full_cycle=True) for i in range(1, size + 1)
+    ])
+
+    async def parsing(client: AsyncClient, sizes: Sizes) -> int:
+        import xmltodict
+        for _ in range(5):
+            client.parse_response(xmltodict.parse(xml))
+        return 5 * size
+    return parsing
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+async def run_scenario(name: str, scenario: Scenario, app: MockOPS, sizes: Sizes, rounds: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+
+    def _collect(event: Any) -> None:
+        if event.kind == "request" and event.name != "auth" and event.duration is not None:
+            latencies.append(event.duration)
+
+    async with AsyncClient("benchmark", "benchmark", transport=httpx.ASGITransport(app=app)) as client:
+        stats = StatsCollector()
+        client.instrumentation.add_hook(stats)
+        client.instrumentation.add_hook(_collect)
+        walls: List[float] = []
+        items = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            items = await scenario(client, sizes)
+            walls.append(time.perf_counter() - start)
+
+    wall = statistics.median(walls)
+    return {
+        "scenario": name,
+        "items": items,
+        "wall": wall,
+        "throughput": items / wall if wall else 0.0,
+        "requests": len(latencies) // rounds,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "retries": stats.retries // rounds,
+    }
+
+async def main(args: argparse.Namespace) -> int:
+    sizes = QUICK if args.quick else FULL
+    # Pacing and back-off are Fair Use measures against the real service
+    Document.PAGE_DELAY = 0.0
+    Document.RETRY_DELAY = 0.001
+    Document.ROBOT_DELAY = 0.001
+
+    def app(**kwargs: Any) -> MockOPS:
+        options: Dict[str, Any] = dict(
+            total_results=sizes.search_results, pages=sizes.pages, latency=args.latency, jitter=args.jitter
+        )
+        options.update(kwargs)
+        return MockOPS(**options)
+
+    scenarios: List[tuple[str, Scenario, MockOPS]] = [
+        ("search_pagination", search_pagination, app()),
+        ("search_with_biblio", search_with_biblio, app()),
+        ("batch_retrieval", batch_retrieval, app()),
+        ("document_download", document_download, app()),
+        ("document_download_robot", document_download, app(robot_rate=0.05, seed=1)),
+        ("parse_full_cycle", parsing_scenario(sizes.parse_documents), app()),
+        ("fulltext", fulltext, app()),
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for name, scenario, mock in scenarios:
+        if args.only and name not in args.only:
+            continue
+        results.append(await run_scenario(name, scenario, mock, sizes, args.rounds))
+
+    print(f"{'scenario':<26}{'items':>8}{'wall s':>10}{'items/s':>12}{'reqs':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for r in results:
+        print(
+            f"{r['scenario']:<26}{r['items']:>8}{r['wall']:>10.3f}{r['throughput']:>12.1f}{r['requests']:>7}"
+            f"{r['p50'] * 1000:>9.2f}{r['p95'] * 1000:>9.2f}{r['p99'] * 1000:>9.2f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"sizes": "quick" if args.quick else "full", "results": results}, indent=2))
+
+    if args.baseline:
+        return compare(results, json.loads(Path(args.baseline).read_text())["results"], args.tolerance)
+    return 0
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> int:
+    """Prints throughput changes against a baseline; returns 1 on a regression."""
+    previous = {r["scenario"]: r for r in baseline}
+    status = 0
+    print()
+    for r in results:
+        base: Optional[Dict[str, Any]] = previous.get(r["scenario"])
+        if not base or not base["throughput"]:
+            continue
+        change = r["throughput"] / base["throughput"] - 1
+        regressed = change < -tolerance
+        status |= regressed
+        print(f"{r['scenario']:<26}{change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes, e.g. for CI")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per scenario (median wall time is reported)")
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock server base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.003, help="Mock server latency jitter in seconds")
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results file to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative throughput drop")
+    sys.exit(asyncio.run(main(parser.parse_args())))
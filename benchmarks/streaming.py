@@ -0,0 +1,97 @@
+"""
+Buffered vs streamed parsing of large responses: time to the first exchange document,
+total time and peak Python memory (tracemalloc) for batch full-cycle responses of
+growing size.
+
+"buffered" is ``get_data``, which reads the whole body and parses it with xmltodict;
+"streamed" is ``stream_elements``, which yields every document once its bytes arrived.
+The body is served in 64 kB chunks from memory, so the numbers show parsing cost
+rather than network time; the payload bytes themselves are excluded from the peak.
+
+Usage::
+
+    python benchmarks/streaming.py --sizes 10 100 400
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from mock_ops import doc_number, exchange_document, exchange_documents_response
+
+import httpx
+
+from epopy import AsyncClient
+
+CHUNK = 64 * 1024
+ENDPOINT = "/published-data/publication/docdb/full-cycle"
+
+def _transport(body: bytes) -> httpx.MockTransport:
+    async def _chunks() -> AsyncIterator[bytes]:
+        for i in range(0, len(body), CHUNK):
+            await asyncio.sleep(0)
+            yield body[i:i + CHUNK]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/accesstoken"):
+            return httpx.Response(200, json={"access_token": "benchmark", "expires_in": 1200})
+        return httpx.Response(200, content=_chunks())
+    return httpx.MockTransport(handler)
+
+async def _buffered(client: AsyncClient, marks: Dict[str, float]) -> int:
+    data = await client.post_data(ENDPOINT, content="numbers")
+    docs = data["ops:world-patent-data"]["exchange-documents"]["exchange-document"]
+    marks["first"] = time.perf_counter()
+    return sum(1 for doc in docs if doc.get("@doc-number"))
+
+async def _streamed(client: AsyncClient, marks: Dict[str, float]) -> int:
+    count = 0
+    async for doc in client.stream_elements("POST", ENDPOINT, ["exchange-document"], content="numbers"):
+        if count == 0:
+            marks["first"] = time.perf_counter()
+        count += 1 if doc.get("@doc-number") else 0
+    return count
+
+MODES = {"buffered": _buffered, "streamed": _streamed}
+
+async def measure(mode: str, body: bytes) -> Dict[str, Any]:
+    """Times one run, then repeats it under tracemalloc for the peak, which slows it down."""
+    marks: Dict[str, float] = {}
+    async with AsyncClient("key", "secret", transport=_transport(body)) as client:
+        # Warm up: token, lazy imports
+        await MODES[mode](client, {})
+        start = time.perf_counter()
+        count = await MODES[mode](client, marks)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        await MODES[mode](client, {})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"documents": count, "first_ms": (marks["first"] - start) * 1000, "total_ms": elapsed * 1000, "peak_mb": peak / 1e6}
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:
+        body = exchange_documents_response(
+            [exchange_document(doc_number(i), full_cycle=True) for i in range(1, size + 1)]
+        ).encode("utf-8")
+        for mode in MODES:
+            row = {"size": size, "mode": mode, "body_mb": len(body) / 1e6, **asyncio.run(measure(mode, body))}
+            rows.append(row)
+            print(
+                f"{size:>6} {mode:<10}{row['body_mb']:>9.1f}{row['first_ms']:>12.1f}"
+                f"{row['total_ms']:>12.1f}{row['peak_mb']:>11.1f}"
+            )
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 400])
+    args = parser.parse_args()
+
+    print(f"{'docs':>6} {'mode':<10}{'body MB':>9}{'first ms':>12}{'total ms':>12}{'peak MB':>11}")
+    run(args.sizes)
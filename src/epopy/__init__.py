@@ -5,8 +5,30 @@ This library provides an async API for searching patents, retrieving
 bibliographic data, downloading documents, and parsing EPO Boards of Appeal decisions.
 """
 
-from .client import AsyncClient
-from .models import OPSResponse
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .client import AsyncClient
+    from .models import OPSResponse
 
 __all__ = ["AsyncClient", "OPSResponse"]
 
+# Public names and the submodules defining them. They are imported on first access,
+# so ``import epopy`` (e.g. only for the decisions parser) does not load httpx or pydantic.
+_LAZY = {
+    "AsyncClient": ".client",
+    "OPSResponse": ".models",
+}
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
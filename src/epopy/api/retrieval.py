@@ -1,10 +1,61 @@
-from typing import Literal
+import asyncio
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncGenerator, AsyncIterator, Any, Dict, FrozenSet, List, Literal, Optional, Sequence, Set, Tuple, TypeVar, TYPE_CHECKING, cast
+import httpx
 from ..client import AsyncClient
-from ..models import OPSResponse
+from ..numbers import PatentNumber, normalize_number, parse_number
+
+if TYPE_CHECKING:
+    from ..models import OPSResponse
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# OPS accepts up to 100 numbers in the body of a single POST retrieval request
+BATCH_SIZE = 100
+# Endpoints that support multiple numbers per request
+BATCH_ENDPOINTS = ("biblio", "abstract", "full-cycle")
+
+FulltextSection = Literal["claims", "description"]
+# Fulltext sections a fulltext inquiry can list
+FULLTEXT_SECTIONS: Tuple[FulltextSection, ...] = ("claims", "description")
+# Element holding one paragraph of each fulltext section
+_PARAGRAPH_TAGS = {"claims": "claim-text", "description": "p"}
+
+@dataclass
+class Paragraph:
+    """
+    One plain-text paragraph of a publication's fulltext: a claim, or a paragraph of
+    the description. ``position`` counts the paragraphs of the section from 0 over all
+    languages; ``num`` is the paragraph number OPS gives, if any (for claims, the
+    number of the enclosing claim).
+    """
+    number: str
+    section: str
+    position: int
+    text: str
+    lang: Optional[str] = None
+    num: Optional[str] = None
 
 class RetrievalService:
-    def __init__(self, client: AsyncClient):
+    def __init__(self, client: AsyncClient, cache_size: int = 4096):
+        """
+        Args:
+            client: The AsyncClient instance.
+            cache_size: Number of per-number responses of ``published_data_many``, and
+                        of fulltext availabilities, kept; the least recently used one
+                        is dropped beyond that. 0 disables the caches.
+        """
         self.client = client
+        self.cache_size = cache_size
+        # Per-number responses collected by published_data_many, least recently used first
+        self._cache: OrderedDict[Tuple[str, str, str, str], 'OPSResponse'] = OrderedDict()
+        # Number-service conversions, keyed by (reference_type, input_format, number, output_format)
+        self._number_cache: Dict[Tuple[str, str, str, str], Optional[str]] = {}
+        # Fulltext sections available per number, keyed by (input_format, number)
+        self._fulltext_cache: OrderedDict[Tuple[str, str], FrozenSet[str]] = OrderedDict()
         
     async def published_data(
         self,
@@ -12,7 +63,7 @@ class RetrievalService:
         input_format: Literal["docdb", "epodoc"],
         number: str,
         endpoint: Literal["biblio", "abstract", "full-cycle", "claims", "description", "fulltext", "images"] = "biblio"
-    ) -> OPSResponse:
+    ) -> 'OPSResponse':
         """
         Retrieve published data.
         
@@ -22,15 +73,369 @@ class RetrievalService:
             number: The patent number
             endpoint: The specific data to retrieve (biblio, abstract, etc.)
         """
+        data = await self.published_data_raw(reference_type, input_format, number, endpoint)
+        return self.client.parse_response(data)
+
+    async def published_data_raw(
+        self,
+        reference_type: Literal["publication", "application", "priority"],
+        input_format: Literal["docdb", "epodoc"],
+        number: str,
+        endpoint: Literal["biblio", "abstract", "full-cycle", "claims", "description", "fulltext", "images"] = "biblio"
+    ) -> Dict[str, Any]:
+        """Like ``published_data``, but returns the parsed XML without building models."""
         url = f"/published-data/{reference_type}/{input_format}/{number}/{endpoint}"
-        data = await self.client.get_data(url)
-        return OPSResponse(**data)
+        return await self.client.get_data(url)
+
+    async def published_data_many(
+        self,
+        reference_type: Literal["publication", "application", "priority"],
+        input_format: Literal["docdb", "epodoc"],
+        numbers: Sequence[str],
+        endpoint: Literal["biblio", "abstract", "full-cycle"] = "biblio",
+        concurrency: int = 4
+    ) -> Dict[str, 'OPSResponse']:
+        """
+        Retrieve published data for many numbers at once.
+
+        Numbers are normalized (see ``epopy.numbers``) and deduplicated, sent in POST
+        batches of up to 100 and the batches run concurrently. Responses are cached
+        per canonical number, so repeated calls only fetch numbers that were not seen
+        before, whichever notation they were requested in.
+        
+        Args:
+            reference_type: Type of reference (publication, application, priority)
+            input_format: Format of the input numbers (docdb, epodoc)
+            numbers: The patent numbers
+            endpoint: The data to retrieve (biblio, abstract, full-cycle)
+            concurrency: Maximum number of batch requests in flight
+            
+        Returns:
+            A mapping from requested number to a response holding only its exchange
+            documents. Numbers OPS returned nothing for are left out.
+        """
+        if endpoint not in BATCH_ENDPOINTS:
+            raise ValueError(f"Endpoint '{endpoint}' does not support batch retrieval")
+            
+        canonical = {number: normalize_number(number, input_format) for number in numbers}
+        fetched: Dict[str, 'OPSResponse'] = {}
+        missing: List[str] = []
+        for number in dict.fromkeys(canonical.values()):
+            key = (reference_type, input_format, number, endpoint)
+            cached = self._cache.get(key)
+            self.client.instrumentation.emit("cache", "retrieval", hit=cached is not None)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                fetched[number] = cached
+            else:
+                missing.append(number)
+                
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _fetch(batch: List[str]) -> None:
+            async with semaphore:
+                try:
+                    data = await self.client.post_data(
+                        f"/published-data/{reference_type}/{input_format}/{endpoint}",
+                        content=",".join(batch),
+                        headers={"Content-Type": "text/plain"}
+                    )
+                except httpx.HTTPStatusError as e:
+                    # OPS answers 404 when none of the numbers are known
+                    if e.response.status_code == 404:
+                        return
+                    raise
+            for number, response in self._split_response(data, batch).items():
+                self._remember(self._cache, (reference_type, input_format, number, endpoint), response)
+                fetched[number] = response
+                
+        await asyncio.gather(*(
+            _fetch(missing[i:i + BATCH_SIZE]) for i in range(0, len(missing), BATCH_SIZE)
+        ))
+        return {number: fetched[key] for number, key in canonical.items() if key in fetched}
+
+    def clear_cache(self) -> None:
+        """Drops all cached responses, number conversions and fulltext availability."""
+        self._cache.clear()
+        self._number_cache.clear()
+        self._fulltext_cache.clear()
+
+    def _remember(self, cache: "OrderedDict[K, V]", key: K, value: V) -> None:
+        """Caches a value in one of the LRU caches; evicts beyond ``cache_size``."""
+        if self.cache_size <= 0:
+            return
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    async def stream_documents(
+        self,
+        reference_type: Literal["publication", "application", "priority"],
+        input_format: Literal["docdb", "epodoc"],
+        numbers: Sequence[str],
+        endpoint: Literal["biblio", "abstract", "full-cycle"] = "biblio"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the raw exchange documents of many numbers while the responses are still
+        arriving, see ``AsyncClient.stream_elements``.
+
+        Numbers are normalized and deduplicated and sent in POST batches of up to 100,
+        one batch after the other. Unlike ``published_data_many`` nothing is cached and
+        no models are built, so memory stays bounded by the largest document, which
+        suits full-cycle retrieval at volume. Batches OPS knows none of are skipped.
+        """
+        if endpoint not in BATCH_ENDPOINTS:
+            raise ValueError(f"Endpoint '{endpoint}' does not support batch retrieval")
+
+        unique = list(dict.fromkeys(normalize_number(number, input_format) for number in numbers))
+        for i in range(0, len(unique), BATCH_SIZE):
+            stream = self.client.stream_elements(
+                "POST", f"/published-data/{reference_type}/{input_format}/{endpoint}", ["exchange-document"],
+                content=",".join(unique[i:i + BATCH_SIZE]),
+                headers={"Content-Type": "text/plain"}
+            )
+            try:
+                async with aclosing(stream):
+                    async for document in stream:
+                        yield document
+            except httpx.HTTPStatusError as e:
+                # OPS answers 404 when none of the numbers are known
+                if e.response.status_code != 404:
+                    raise
+
+    def _split_response(self, data: Dict[str, Any], numbers: List[str]) -> Dict[str, 'OPSResponse']:
+        """Distributes the exchange documents of a batch response over the requested numbers."""
+        root = cast(Dict[str, Any], data.get("ops:world-patent-data") or {})
+        exchange = cast(Dict[str, Any], root.get("exchange-documents") or {})
+        docs_raw = exchange.get("exchange-document", [])
+        docs = cast(List[Dict[str, Any]], [docs_raw] if isinstance(docs_raw, dict) else docs_raw)
+        
+        split: Dict[str, 'OPSResponse'] = {}
+        for number in numbers:
+            try:
+                parsed = parse_number(number)
+            except ValueError:
+                continue
+            matched = [
+                doc for doc in docs
+                if _same_publication(parsed, doc.get("@country"), doc.get("@doc-number"), doc.get("@kind"))
+            ]
+            if matched:
+                wrapped: Dict[str, Any] = {
+                    "ops:world-patent-data": {"exchange-documents": {"exchange-document": matched}}
+                }
+                split[number] = self.client.parse_response(wrapped)
+        return split
+
+    async def fulltext_availability(
+        self,
+        input_format: Literal["docdb", "epodoc"],
+        numbers: Sequence[str],
+        concurrency: int = 4
+    ) -> Dict[str, FrozenSet[str]]:
+        """
+        Find out which fulltext sections (claims, description) OPS has for publications.
+
+        Numbers are normalized and deduplicated, and their fulltext inquiries sent in
+        POST batches of up to 100, at most ``concurrency`` at a time. Answers are cached
+        per canonical number, including the empty ones, so each publication is only
+        inquired about once. A number the inquiry answer does not mention is reported
+        without sections, but asked about again next time.
+        
+        Returns:
+            A mapping from requested number to the available sections.
+        """
+        canonical = {number: normalize_number(number, input_format) for number in numbers}
+        available: Dict[str, FrozenSet[str]] = {}
+        missing: List[str] = []
+        for number in dict.fromkeys(canonical.values()):
+            cached = self._fulltext_cache.get((input_format, number))
+            self.client.instrumentation.emit("cache", "fulltext", hit=cached is not None)
+            if cached is not None:
+                self._fulltext_cache.move_to_end((input_format, number))
+                available[number] = cached
+            else:
+                missing.append(number)
+                
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _inquire(batch: List[str]) -> None:
+            found: Dict[str, Set[str]] = {number: set() for number in batch}
+            # Numbers the answer covers; the others are not cached
+            answered: Set[str] = set()
+            async with semaphore:
+                try:
+                    async for result in self.client.stream_elements(
+                        "POST", f"/published-data/publication/{input_format}/fulltext", ["ftxt:inquiry-result"],
+                        content=",".join(batch),
+                        headers={"Content-Type": "text/plain"}
+                    ):
+                        instances = _as_list(result.get("ftxt:fulltext-instance"))
+                        sections = {str(instance.get("@desc")) for instance in instances} & set(FULLTEXT_SECTIONS)
+                        for number in _inquired_numbers(result, batch):
+                            found[number] |= sections
+                            answered.add(number)
+                except httpx.HTTPStatusError as e:
+                    # OPS answers 404 when it has fulltext for none of the numbers
+                    if e.response.status_code != 404:
+                        raise
+                    answered.update(batch)
+            for number, sections in found.items():
+                if number in answered:
+                    self._remember(self._fulltext_cache, (input_format, number), frozenset(sections))
+                available[number] = frozenset(sections)
+                
+        await asyncio.gather(*(
+            _inquire(missing[i:i + BATCH_SIZE]) for i in range(0, len(missing), BATCH_SIZE)
+        ))
+        return {number: available[key] for number, key in canonical.items()}
+
+    async def stream_paragraphs(
+        self,
+        input_format: Literal["docdb", "epodoc"],
+        number: str,
+        section: FulltextSection,
+        priority: Optional[str] = None
+    ) -> AsyncGenerator[Paragraph, None]:
+        """
+        Yield the claims or description paragraphs of a publication as plain text while
+        the response is still arriving, see ``AsyncClient.stream_elements``.
+
+        Inline markup is dropped and whitespace collapsed; the claims or description
+        of every language are yielded in document order, tagged with their language.
+        This does not check availability first, see ``iter_fulltext``.
+        """
+        if section not in FULLTEXT_SECTIONS:
+            raise ValueError(f"Unknown fulltext section '{section}'")
+        stream = self.client.stream_elements(
+            "GET", f"/published-data/publication/{input_format}/{number}/{section}", [_PARAGRAPH_TAGS[section]],
+            text=True, priority=priority
+        )
+        position = 0
+        async with aclosing(stream):
+            async for element in stream:
+                text = element.get("#text")
+                if not text:
+                    continue
+                yield Paragraph(
+                    number=number, section=section, position=position, text=text,
+                    lang=element.get("@lang"), num=element.get("@num")
+                )
+                position += 1
+
+    async def iter_fulltext(
+        self,
+        input_format: Literal["docdb", "epodoc"],
+        numbers: Sequence[str],
+        sections: Sequence[FulltextSection] = FULLTEXT_SECTIONS,
+        concurrency: int = 4
+    ) -> AsyncIterator[Paragraph]:
+        """
+        Yield the fulltext paragraphs of many publications, requesting only what exists.
+
+        Availability of all numbers is inquired first (batched and cached, see
+        ``fulltext_availability``); then the available sections are streamed one
+        after the other, so memory stays bounded by a single paragraph. Paragraphs
+        carry the canonical number.
+        
+        Args:
+            input_format: Format of the input numbers (docdb, epodoc)
+            numbers: The publication numbers
+            sections: Which sections to retrieve
+            concurrency: Maximum number of inquiry requests in flight
+        """
+        availability = await self.fulltext_availability(input_format, numbers, concurrency)
+        present_by_number = {normalize_number(number, input_format): present for number, present in availability.items()}
+        for number, present in present_by_number.items():
+            for section in sections:
+                if section in present:
+                    async for paragraph in self.stream_paragraphs(input_format, number, section):
+                        yield paragraph
+
+    async def convert_numbers(
+        self,
+        numbers: Sequence[str],
+        reference_type: Literal["publication", "application", "priority"] = "publication",
+        input_format: Literal["original", "docdb", "epodoc"] = "original",
+        output_format: Literal["original", "docdb", "epodoc"] = "docdb",
+        concurrency: int = 4
+    ) -> Dict[str, Optional[str]]:
+        """
+        Convert numbers between formats.
+
+        Publication numbers between docdb and epodoc are converted locally without
+        any request. Everything else goes to the OPS number service, one request per
+        distinct number with at most ``concurrency`` in flight; conversions are cached.
+        
+        Returns:
+            A mapping from input number to converted number, None where OPS could not
+            convert it.
+        """
+        results: Dict[str, Optional[str]] = {}
+        remote: List[str] = []
+        for number in dict.fromkeys(numbers):
+            if reference_type == "publication" and input_format != "original" and output_format != "original":
+                try:
+                    results[number] = parse_number(number).format(output_format)
+                    continue
+                except ValueError:
+                    pass
+            key = (reference_type, input_format, number, output_format)
+            if key in self._number_cache:
+                results[number] = self._number_cache[key]
+            else:
+                remote.append(number)
+                
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _convert(number: str) -> None:
+            async with semaphore:
+                try:
+                    data = await self.client.post_data(
+                        f"/number-service/{reference_type}/{input_format}/{output_format}",
+                        content=number,
+                        headers={"Content-Type": "text/plain"}
+                    )
+                    converted = self._parse_number_service(data, output_format)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code not in (400, 404):
+                        raise
+                    converted = None
+            self._number_cache[(reference_type, input_format, number, output_format)] = converted
+            results[number] = converted
+            
+        await asyncio.gather(*(_convert(n) for n in remote))
+        return results
+
+    def _parse_number_service(self, data: Dict[str, Any], output_format: str) -> Optional[str]:
+        """Extracts the converted number from a number-service response."""
+        root = cast(Dict[str, Any], data.get("ops:world-patent-data") or {})
+        standardization = cast(Dict[str, Any], root.get("ops:standardization") or {})
+        output = cast(Dict[str, Any], standardization.get("ops:output") or {})
+        reference = next((cast(Dict[str, Any], v) for k, v in output.items() if k.endswith("-reference")), None)
+        if not reference:
+            return None
+        doc_id_raw = reference.get("document-id", {})
+        doc_id = cast(Dict[str, Any], doc_id_raw[0] if isinstance(doc_id_raw, list) else doc_id_raw)
+        
+        num = doc_id.get("doc-number")
+        if not num:
+            return None
+        country = doc_id.get("country")
+        kind = doc_id.get("kind")
+        if output_format == "docdb" and country:
+            return PatentNumber(str(country), str(num), str(kind) if kind else None).docdb
+        if output_format == "epodoc" and country and not str(num).startswith(str(country)):
+            return f"{country}{num}"
+        return str(num)
 
     async def download_image(
         self, 
         path: str, 
         range_position: int | str = 1, 
-        document_format: str = "application/pdf"
+        document_format: str = "application/pdf",
+        use_store: bool = True
     ) -> bytes:
         """
         Download a specific image variant (document instance).
@@ -39,13 +444,59 @@ class RetrievalService:
             path: The link/path to the image resource (e.g. from document-instance @link)
             range_position: The page range/position (required by OPS for images). Can be "1-10", "1", etc.
             document_format: The expected format (Accept header)
+            use_store: Go through the client's blob store, if one is configured.
             
         Returns:
             The raw bytes of the image/document.
         """
-        response = await self.client.get(
-            path, 
-            headers={"Accept": document_format}, 
-            params={"range": str(range_position)}
-        )
-        return response.content
+        async def _fetch() -> bytes:
+            response = await self.client.get(
+                path, 
+                headers={"Accept": document_format}, 
+                params={"range": str(range_position)}
+            )
+            return response.content
+            
+        store = self.client.blob_store
+        if store is None or not use_store:
+            return await _fetch()
+            
+        fetched = False
+        
+        async def _fetch_miss() -> bytes:
+            nonlocal fetched
+            fetched = True
+            return await _fetch()
+            
+        content = await store.fetch(store.key(path.lstrip("/"), range_position, document_format), _fetch_miss)
+        self.client.instrumentation.emit("cache", "blob_store", hit=not fetched)
+        return content
+
+def _as_list(value: Any) -> List[Dict[str, Any]]:
+    if value is None:
+        return []
+    return cast(List[Dict[str, Any]], value if isinstance(value, list) else [value])
+
+def _same_publication(parsed: PatentNumber, country: Any, doc_number: Any, kind: Any) -> bool:
+    """Whether a country/doc-number/kind triple from a response is the parsed number."""
+    return (
+        country == parsed.country
+        and str(doc_number or "").lstrip("0") == parsed.number.lstrip("0")
+        and (parsed.kind is None or kind == parsed.kind)
+    )
+
+def _inquired_numbers(result: Dict[str, Any], batch: List[str]) -> List[str]:
+    """The numbers of a batch that a fulltext inquiry result is about."""
+    if len(batch) == 1:
+        return batch
+    reference = cast(Dict[str, Any], result.get("publication-reference") or {})
+    matched: List[str] = []
+    for doc_id in _as_list(reference.get("document-id")):
+        for number in batch:
+            try:
+                parsed = parse_number(number)
+            except ValueError:
+                continue
+            if number not in matched and _same_publication(parsed, doc_id.get("country"), doc_id.get("doc-number"), doc_id.get("kind")):
+                matched.append(number)
+    return matched
@@ -1,13 +1,106 @@
-from typing import List, Optional, Any, Dict, cast
+import re
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, List, Literal, Optional, Any, Dict, Sequence, Tuple, TYPE_CHECKING, cast
+from ..checkpoints import CheckpointStore, QueryCheckpoint
 from ..client import AsyncClient
-from ..models import OPSResponse
+from ..patent import Patent
+from ..numbers import PatentNumber
+
+if TYPE_CHECKING:
+    from ..models import OPSResponse
+
+# OPS serves at most 100 hits per search request
+MAX_RANGE = 100
+# OPS serves at most the first 2000 hits of a result set
+MAX_RESULTS = 2000
+
+_CQL_TOKEN = re.compile(r'"[^"]*"|<=|>=|==|<>|[=<>()/]|[^\s=<>()/"]+')
+
+def normalize_cql(cql: str) -> str:
+    """
+    Canonical form of a CQL query, used as the result-set cache key.
+
+    Whitespace is folded, case is folded (OPS matching is case-insensitive) and
+    relations and parentheses are written without surrounding spaces, so
+    "TI = Plastic  AND pa=Siemens" and "ti=plastic and pa=siemens" share a key.
+    """
+    tokens = [
+        " ".join(token.lower().split()) if token.startswith('"') else token.lower()
+        for token in _CQL_TOKEN.findall(cql)
+    ]
+    out = ""
+    for token in tokens:
+        if out and not out.endswith(("=", "<", ">", "(", "/")) and token not in ("=", "==", "<", ">", "<=", ">=", "<>", ")", "/"):
+            out += " "
+        out += token
+    return out
+
+@dataclass
+class _ResultSet:
+    """Hits collected for one normalized query, keyed by 1-based result position."""
+    total: Optional[int] = None
+    hits: Dict[int, Dict[str, Any]] = field(default_factory=lambda: {})
+    created_at: float = field(default_factory=time.monotonic)
+
+@dataclass
+class FamilyPolicy:
+    """
+    Preferred-member policy used to collapse the publications of a patent family.
+
+    Members are ranked by country first and kind code second; countries and kinds not
+    listed rank after the listed ones. The default prefers EP over WO over US and
+    granted (B) over application (A) publications.
+    """
+    countries: Sequence[str] = ("EP", "WO", "US")
+    kinds: Sequence[str] = ("B1", "B2", "B3", "A1", "A2", "A3", "A4", "A")
+
+    def rank(self, patent: Patent) -> Tuple[int, int]:
+        parsed = patent.parsed
+        country = parsed.country if parsed else None
+        kind = parsed.kind if parsed else None
+        country_rank = list(self.countries).index(country) if country is not None and country in self.countries else len(self.countries)
+        kind_rank = list(self.kinds).index(kind) if kind is not None and kind in self.kinds else len(self.kinds)
+        return country_rank, kind_rank
+
+    def collapse(self, patents: Sequence[Patent]) -> List[Patent]:
+        """
+        Keeps the preferred member of every family, at the position of the family's
+        first hit. Patents without a family id are kept as they are.
+        """
+        best: Dict[str, Patent] = {}
+        order: List[Any] = []
+        for patent in patents:
+            if patent.family_id is None:
+                order.append(patent)
+                continue
+            current = best.get(patent.family_id)
+            if current is None:
+                order.append(patent.family_id)
+                best[patent.family_id] = patent
+            elif self.rank(patent) < self.rank(current):
+                best[patent.family_id] = patent
+        return [best[item] if isinstance(item, str) else item for item in order]
 
 class SearchError(Exception):
     pass
 
 class SearchService:
-    def __init__(self, client: AsyncClient):
+    def __init__(self, client: AsyncClient, cache_ttl: float = 3600.0, cache_size: int = 64):
+        """
+        Args:
+            client: The AsyncClient instance.
+            cache_ttl: Seconds a cached search result set stays valid.
+            cache_size: Number of result sets kept; the least recently used one is
+                        dropped beyond that. 0 disables the cache.
+        """
         self.client = client
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._result_sets: OrderedDict[Tuple[str, str], _ResultSet] = OrderedDict()
         
     async def published_data_search(
         self, 
@@ -15,7 +108,7 @@ class SearchService:
         start: int = 1, 
         end: int = 25, 
         constituents: Optional[str] = None
-    ) -> OPSResponse:
+    ) -> 'OPSResponse':
         """
         Search for published data.
         
@@ -25,6 +118,17 @@ class SearchService:
             end: End index
             constituents: Optional constituent (e.g. 'abstract')
         """
+        data = await self.published_data_search_raw(cql, start, end, constituents)
+        return self.client.parse_response(data)
+
+    async def published_data_search_raw(
+        self,
+        cql: str,
+        start: int = 1,
+        end: int = 25,
+        constituents: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Like ``published_data_search``, but returns the parsed XML without building models."""
         range_header = f"{start}-{end}"
         params = {"q": cql}
         
@@ -32,73 +136,333 @@ class SearchService:
         if constituents:
             url = f"{url}/{constituents}"
             
-        data = await self.client.get_data(
+        return await self.client.get_data(
             url, 
             params=params, 
             headers={"Range": range_header}
         )
-        
-        return OPSResponse(**data)
 
     async def search_patents(
         self,
         cql: str,
         start: int = 1,
-        end: int = 25
+        end: int = 25,
+        include: Optional[Sequence[Literal["biblio", "abstract", "full-cycle"]]] = None,
+        collapse_families: bool = False,
+        policy: Optional['FamilyPolicy'] = None
     ) -> List[Any]:
         """
         Search and return a list of Patent objects.
+
+        Hits are served from the result-set cache where possible, see ``search_hits``.
+        
+        Args:
+            cql: Contextual Query Language string
+            start: Start index (1-based)
+            end: End index
+            include: Constituents to request with the search itself (e.g. ["biblio", "abstract"]).
+                     Their data is stored on the returned Patents, so ``patent.biblio()``
+                     does not need another request.
+            collapse_families: Keep one publication per @family-id within the window.
+            policy: Which family member to keep (defaults to ``FamilyPolicy()``).
         """
-        from ..patent import Patent
-        response = await self.published_data_search(cql, start=start, end=end)
+        _, hits = await self.search_hits(cql, start=start, end=end, include=include)
+        results = self._patents_from_hits(hits, include)
+        if collapse_families:
+            results = (policy or FamilyPolicy()).collapse(results)
+        return results
+
+    async def iter_patents(
+        self,
+        cql: str,
+        page_size: int = MAX_RANGE,
+        include: Optional[Sequence[Literal["biblio", "abstract", "full-cycle"]]] = None,
+        collapse_families: bool = False,
+        policy: Optional['FamilyPolicy'] = None
+    ) -> AsyncIterator[Patent]:
+        """
+        Iterate over all Patents matching a query, fetching ``page_size`` hits per request.
+
+        With ``collapse_families`` the whole result set is paged in before anything is
+        yielded, because the preferred member of a family may appear on a later page.
+        OPS caps result sets at 2000 hits (``MAX_RESULTS``); hits beyond that are not
+        reachable and are not requested, so this also stays small.
+        """
+        position = 1
+        total: Optional[int] = None
+        collected: List[Patent] = []
+        while total is None or position <= min(total, MAX_RESULTS):
+            last = min(position + page_size - 1, MAX_RESULTS)
+            total, hits = await self.search_hits(cql, start=position, end=last, include=include)
+            patents = self._patents_from_hits(hits, include)
+            if collapse_families:
+                collected.extend(patents)
+            else:
+                for patent in patents:
+                    yield patent
+            if not hits:
+                break
+            position += page_size
+            
+        if collapse_families:
+            for patent in (policy or FamilyPolicy()).collapse(collected):
+                yield patent
+
+    async def sync(
+        self,
+        name: str,
+        cql: str,
+        store: CheckpointStore,
+        include: Optional[Sequence[Literal["biblio", "abstract", "full-cycle"]]] = None,
+        today: Optional[date] = None,
+        overlap_days: int = 7
+    ) -> AsyncIterator[Patent]:
+        """
+        Yield only the publications of a saved query that were not seen in earlier runs.
+
+        The first run pages through the full query. Later runs send a delta query
+        bounded by the publication date (``pd>=YYYYMMDD``) ``overlap_days`` before the
+        previous run, so publications OPS indexes a few days late are still found, and
+        skip the numbers already yielded in that window; a daily sync costs a few calls.
+        The checkpoint is stored once the iteration completes; an interrupted run is
+        repeated in full the next time. Changing the query of a name restarts it.
         
+        Args:
+            name: Name of the saved query in the checkpoint store.
+            cql: The query.
+            store: Where checkpoints are kept.
+            include: Constituents to request with the search, see ``search_patents``.
+            today: Date of the run, defaults to the current UTC date.
+            overlap_days: Days before the previous run the delta query reaches back.
+        """
+        run_day = today or datetime.now(timezone.utc).date()
+        checkpoint = store.get(name)
+        if checkpoint is not None and checkpoint.cql != cql:
+            checkpoint = None
+            
+        query = cql
+        seen: Dict[str, str] = {}
+        if checkpoint is not None and checkpoint.last_date:
+            since = datetime.strptime(checkpoint.last_date, "%Y%m%d").date() - timedelta(days=overlap_days)
+            query = f"({cql}) and pd>={since.strftime('%Y%m%d')}"
+            seen = dict(checkpoint.seen)
+            
+        run_date = run_day.strftime("%Y%m%d")
+        async for patent in self.iter_patents(query, include=include):
+            if patent.key in seen:
+                continue
+            seen[patent.key] = run_date
+            yield patent
+            
+        # A publication was published no later than the run that first yielded it, so
+        # numbers first seen before the next delta's window cannot come back
+        horizon = (run_day - timedelta(days=overlap_days)).strftime("%Y%m%d")
+        next_seen = {key: day for key, day in sorted(seen.items()) if day >= horizon}
+        store.put(name, QueryCheckpoint(cql=cql, last_date=run_date, seen=next_seen))
+
+    def _patents_from_hits(self, hits: List[Dict[str, Any]], include: Optional[Sequence[str]]) -> List[Patent]:
         results: List[Patent] = []
-        # Extract results from the search response
+        for hit in hits:
+            if include:
+                patent = self._patent_from_exchange_document(hit, include)
+            else:
+                patent = self._patent_from_reference(hit)
+            if patent is not None:
+                results.append(patent)
+        return results
+
+    async def search_hits(
+        self,
+        cql: str,
+        start: int = 1,
+        end: int = 25,
+        include: Optional[Sequence[str]] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Return the total result count and the raw hits in the range ``start``-``end``.
+
+        Result sets are cached per normalized query (see ``normalize_cql``) and
+        constituents, up to ``cache_size`` of them. Positions already held are served
+        from the cache; only the missing slices are requested, in chunks of at most
+        100 hits. Positions past the end of the result set or past ``MAX_RESULTS``
+        are never requested.
+        
+        Returns:
+            A (total_result_count, hits) tuple. Hits are ops:publication-reference
+            dicts, or exchange-document dicts when ``include`` is given.
+        """
+        constituents = ",".join(include) if include else None
+        key = (normalize_cql(cql), constituents or "")
+        
+        result_set = self._result_set(key)
+        end = min(end, MAX_RESULTS)
+        missing = self._missing_slices(result_set, start, end)
+        self.client.instrumentation.emit("cache", "search", hit=not missing)
+        for slice_start, slice_end in missing:
+            response = await self.published_data_search(cql, start=slice_start, end=slice_end, constituents=constituents)
+            search_res = response.world_patent_data.biblio_search
+            result_set.total = search_res.total_result_count if search_res else 0
+            for offset, hit in enumerate(self._extract_hits(response, bool(constituents))):
+                result_set.hits[slice_start + offset] = hit
+            if result_set.total <= slice_end:
+                # Later slices lie beyond the end of the result set
+                break
+                
+        total = result_set.total or 0
+        last = min(end, total)
+        return total, [result_set.hits[i] for i in range(start, last + 1) if i in result_set.hits]
+
+    async def stream_hits(
+        self,
+        cql: str,
+        start: int = 1,
+        end: int = 25,
+        include: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the raw hits in the range ``start``-``end`` while the responses are still
+        arriving, see ``AsyncClient.stream_elements``.
+
+        Meant for large windows with constituents (100 exchange documents with biblio
+        and abstract are several MB): the first hit is available after its own bytes,
+        and memory does not grow with the response. Every slice of up to 100 hits is
+        requested up to the end of the result set (and ``MAX_RESULTS``); the hits are
+        added to the result-set cache of ``search_hits``.
+
+        The loop body runs outside the scheduler slots of the requests, so it can make
+        requests of its own.
+        """
+        from ..streaming import ElementStream
+        constituents = ",".join(include) if include else None
+        key = (normalize_cql(cql), constituents or "")
+        result_set = self._result_set(key)
+
+        url = "/published-data/search"
+        if constituents:
+            url = f"{url}/{constituents}"
+        tag = "exchange-document" if constituents else "ops:publication-reference"
+
+        end = min(end, MAX_RESULTS)
+        position = start
+        while position <= end:
+            if result_set.total is not None:
+                end = min(end, result_set.total)
+                if position > end:
+                    break
+            slice_end = min(end, position + MAX_RANGE - 1)
+            parser = ElementStream([tag])
+            stream = self.client.stream_elements(
+                "GET", url, [tag], parser=parser, params={"q": cql}, headers={"Range": f"{position}-{slice_end}"}
+            )
+            count = 0
+            async with aclosing(stream):
+                async for hit in stream:
+                    if result_set.total is None:
+                        attributes = parser.attributes("ops:biblio-search") or {}
+                        result_set.total = int(attributes.get("total-result-count", 0))
+                    result_set.hits[position + count] = hit
+                    count += 1
+                    yield hit
+            if count < slice_end - position + 1:
+                # The result set ended within this slice
+                break
+            position = slice_end + 1
+
+    def clear_cache(self) -> None:
+        """Drops all cached search result sets."""
+        self._result_sets.clear()
+
+    def _result_set(self, key: Tuple[str, str]) -> '_ResultSet':
+        """The cached result set of a query, or a new one; evicts beyond ``cache_size``."""
+        result_set = self._result_sets.get(key)
+        if result_set is None or time.monotonic() - result_set.created_at > self.cache_ttl:
+            result_set = _ResultSet()
+        if self.cache_size > 0:
+            self._result_sets[key] = result_set
+            self._result_sets.move_to_end(key)
+            while len(self._result_sets) > self.cache_size:
+                self._result_sets.popitem(last=False)
+        return result_set
+
+    def _missing_slices(self, result_set: '_ResultSet', start: int, end: int) -> List[Tuple[int, int]]:
+        """Contiguous ranges of positions not held by a result set, split into API-sized chunks."""
+        if result_set.total is not None:
+            end = min(end, result_set.total)
+        slices: List[Tuple[int, int]] = []
+        position = start
+        while position <= end:
+            if position in result_set.hits:
+                position += 1
+                continue
+            slice_end = position
+            while slice_end + 1 <= end and slice_end + 1 not in result_set.hits and slice_end + 1 - position < MAX_RANGE:
+                slice_end += 1
+            slices.append((position, slice_end))
+            position = slice_end + 1
+        return slices
+
+    def _extract_hits(self, response: 'OPSResponse', with_constituents: bool) -> List[Dict[str, Any]]:
+        """Lists the raw hits of a search response in result order."""
         search_res = response.world_patent_data.biblio_search
         if not search_res or not search_res.search_result:
-            return results # type: ignore
-            
-        # The search_result structure can be complex, let's look at the XML mapping
-        # In a real scenario, we'd navigate the dict carefully.
-        # For now, let's assume we can find the numbers.
+            return []
         data = cast(Dict[str, Any], search_res.search_result)
+        
+        if with_constituents:
+            # With constituents every hit is an exchange document wrapped in exchange-documents
+            wrappers_raw = data.get("exchange-documents", [])
+            wrappers = cast(List[Dict[str, Any]], [wrappers_raw] if isinstance(wrappers_raw, dict) else wrappers_raw)
+            hits: List[Dict[str, Any]] = []
+            for wrapper in wrappers:
+                exch_raw = wrapper.get("exchange-document", [])
+                hits.extend(cast(List[Dict[str, Any]], [exch_raw] if isinstance(exch_raw, dict) else exch_raw))
+            return hits
+            
         # Navigate to the documents
         docs_raw = data.get("ops:publication-reference", [])
-        docs: List[Any] = [docs_raw] if isinstance(docs_raw, dict) else cast(List[Any], docs_raw)
+        return cast(List[Dict[str, Any]], [docs_raw] if isinstance(docs_raw, dict) else docs_raw)
+
+    def _patent_from_reference(self, doc: Dict[str, Any]) -> Optional[Patent]:
+        """Builds a Patent from an ops:publication-reference search hit."""
+        doc_id_raw = doc.get("document-id", {})
+        doc_id = cast(Dict[str, Any], doc_id_raw[0] if isinstance(doc_id_raw, list) else doc_id_raw)
         
-        for doc_item in docs:
-            doc = cast(Dict[str, Any], doc_item)
-            
-            doc_id_raw = doc.get("document-id", {})
-            doc_id = cast(Dict[str, Any], doc_id_raw[0] if isinstance(doc_id_raw, list) else doc_id_raw)
+        num = _text(doc_id.get("doc-number"))
+        if not num:
+            return None
             
-            val_data = doc_id.get("doc-number")
-            num: Optional[str] = None
-            if isinstance(val_data, dict):
-                inner_val = cast(Dict[str, Any], val_data)
-                num = cast(Optional[str], inner_val.get("$") or inner_val.get("#text"))
-            else:
-                num = cast(Optional[str], val_data)
+        cc = _text(doc_id.get("country"))
+        kind = _text(doc_id.get("kind"))
+        
+        family_id = cast(Optional[str], doc.get("@family-id"))
+        if cc and kind:
+            return Patent(self.client, PatentNumber(cc, num, kind).docdb, family_id=family_id)
+        return Patent(self.client, str(num), family_id=family_id)
+
+    def _patent_from_exchange_document(self, exch: Dict[str, Any], include: Sequence[str]) -> Optional[Patent]:
+        """Builds a Patent from an exchange-document hit and seeds its memoized data."""
+        cc = cast(Optional[str], exch.get("@country"))
+        num = cast(Optional[str], exch.get("@doc-number"))
+        kind = cast(Optional[str], exch.get("@kind"))
+        if not num:
+            return None
             
-            if num:
-                cc_raw = doc_id.get("country", {})
-                cc: Optional[str] = None
-                if isinstance(cc_raw, dict):
-                    cc = cast(Optional[str], cast(Dict[str, Any], cc_raw).get("$"))
-                else:
-                    cc = cast(Optional[str], cc_raw)
-                
-                kind_raw = doc_id.get("kind", {})
-                kind: Optional[str] = None
-                if isinstance(kind_raw, dict):
-                    kind = cast(Optional[str], cast(Dict[str, Any], kind_raw).get("$"))
-                else:
-                    kind = cast(Optional[str], kind_raw)
-                
-                if cc and kind:
-                    patent_num = f"{cc}.{num}.{kind}"
-                    results.append(Patent(self.client, patent_num))
-                else:
-                    results.append(Patent(self.client, str(num)))
-                    
-        return results # type: ignore
+        patent = Patent(
+            self.client,
+            PatentNumber(cc, num, kind).docdb if cc and kind else num,
+            family_id=cast(Optional[str], exch.get("@family-id"))
+        )
+        wrapped: Dict[str, Any] = {
+            "ops:world-patent-data": {"exchange-documents": {"exchange-document": exch}}
+        }
+        response = self.client.parse_response(wrapped)
+        for part in include:
+            patent._data[part] = response
+        return patent
+
+def _text(value: Any) -> Optional[str]:
+    """Returns the text of an xmltodict value that may carry attributes."""
+    if isinstance(value, dict):
+        inner = cast(Dict[str, Any], value)
+        return cast(Optional[str], inner.get("$") or inner.get("#text"))
+    return cast(Optional[str], value)
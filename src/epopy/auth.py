@@ -1,7 +1,8 @@
 import time
 import base64
 import httpx
-from typing import Optional
+from typing import Any, Dict, Optional
+from . import deadlines
 
 class AuthManager:
     """Handles OAuth 2.0 authentication for EPO OPS API."""
@@ -34,13 +35,15 @@ class AuthManager:
             "Content-Type": "application/x-www-form-urlencoded"
         }
         data = {"grant_type": "client_credentials"}
+        # Within a deadline the token request may only use the time left
+        extra: Dict[str, Any] = {"timeout": deadlines.timeout(30.0)} if deadlines.remaining() is not None else {}
         
         # Use provided client or create a new one for the auth request
         if client:
-            response = await client.post(self.TOKEN_URL, headers=headers, data=data)
+            response = await client.post(self.TOKEN_URL, headers=headers, data=data, **extra)
         else:
             async with httpx.AsyncClient() as temp_client:
-                response = await temp_client.post(self.TOKEN_URL, headers=headers, data=data)
+                response = await temp_client.post(self.TOKEN_URL, headers=headers, data=data, **extra)
                 
         response.raise_for_status()
         token_data = response.json()
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class BlobStore:
+    """
+    Content-addressed store for downloaded documents on local disk.
+
+    Downloads are looked up by a key derived from link, range and format. The key
+    points to a blob named after the SHA-256 of its content, so identical pages
+    fetched through different links are stored once. All writes go through a
+    temporary file and an atomic rename, and a lock file per key makes concurrent
+    workers (also in other processes sharing the volume) wait for a running
+    download instead of fetching the same page again. With ``max_bytes`` set, the
+    least recently used blobs are evicted once the store grows past the cap.
+
+    The blob sizes, their total and their LRU order are read from disk once and then
+    kept in memory, so a put into a full store evicts without scanning the disk;
+    ``fetch`` does its file I/O in a worker thread.
+    """
+    
+    def __init__(
+        self, root: str | Path, max_bytes: Optional[int] = None, lock_timeout: float = 300.0,
+        rescan_interval: float = 60.0
+    ):
+        """
+        Args:
+            root: Directory of the store, created if missing.
+            max_bytes: Size cap for the stored blobs, None for unlimited.
+            lock_timeout: Seconds after which a download lock is considered stale.
+            rescan_interval: Seconds after which a put reads the in-memory index from
+                             disk again before checking the size cap, to account for
+                             blobs other processes added or evicted.
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+        self.rescan_interval = rescan_interval
+        for sub in ("blobs", "keys", "locks"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Blob sizes by digest, least recently used first, and the keys pointing to each
+        self._blobs: Optional["OrderedDict[str, int]"] = None
+        self._keys: Dict[str, Set[str]] = {}
+        self._total = 0
+        self._index_lock = threading.Lock()
+        self._scanned = 0.0
+
+    @staticmethod
+    def key(link: str, range_position: int | str, document_format: str) -> str:
+        """Store key of a download."""
+        return hashlib.sha256(f"{link}|{range_position}|{document_format}".encode()).hexdigest()
+
+    def _key_path(self, key: str) -> Path:
+        return self.root / "keys" / key[:2] / key
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the stored content for a key, or None."""
+        try:
+            digest = self._key_path(key).read_text().strip()
+            blob_path = self._blob_path(digest)
+            content = blob_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Mark as recently used for LRU eviction, also for other processes
+        try:
+            os.utime(blob_path)
+        except FileNotFoundError:
+            pass
+        with self._index_lock:
+            self._touch(digest, len(content), key)
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        """Stores content under a key, deduplicated by its hash."""
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            self._atomic_write(blob_path, content)
+        else:
+            os.utime(blob_path)
+        self._atomic_write(self._key_path(key), digest.encode())
+        with self._index_lock:
+            if self.max_bytes is not None and time.monotonic() - self._scanned > self.rescan_interval:
+                self._rescan()
+            self._touch(digest, len(content), key)
+            if self.max_bytes is not None and self._total > self.max_bytes:
+                self._evict()
+
+    async def fetch(self, key: str, fetcher: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Returns the stored content for a key, calling ``fetcher`` to download and store
+        it on a miss. Concurrent fetches of the same key download it only once.
+        """
+        content = await asyncio.to_thread(self.get, key)
+        if content is not None:
+            return content
+            
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            content = await asyncio.to_thread(self.get, key)
+            if content is not None:
+                return content
+            await self._acquire_file_lock(key)
+            try:
+                # Another process may have finished the download while we waited
+                content = await asyncio.to_thread(self.get, key)
+                if content is None:
+                    content = await fetcher()
+                    await asyncio.to_thread(self.put, key, content)
+                return content
+            finally:
+                self._release_file_lock(key)
+                self._locks.pop(key, None)
+
+    async def _acquire_file_lock(self, key: str) -> None:
+        lock_path = self.root / "locks" / key
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > self.lock_timeout:
+                        logger.warning(f"Removing stale blob store lock {lock_path}")
+                        lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                await asyncio.sleep(0.1)
+
+    def _release_file_lock(self, key: str) -> None:
+        (self.root / "locks" / key).unlink(missing_ok=True)
+
+    def _atomic_write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def size(self) -> int:
+        """Total size of the stored blobs in bytes."""
+        with self._index_lock:
+            self._index()
+            return self._total
+
+    def _touch(self, digest: str, size: int, key: str) -> None:
+        """Records a blob and a key pointing to it as most recently used."""
+        blobs = self._index()
+        if digest not in blobs:
+            self._total += size
+            blobs[digest] = size
+        blobs.move_to_end(digest)
+        self._keys.setdefault(digest, set()).add(key)
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """The in-memory blob index, loaded from disk on first use."""
+        if self._blobs is None:
+            self._rescan()
+        assert self._blobs is not None
+        return self._blobs
+
+    def _rescan(self) -> None:
+        """Rebuilds the blob index from disk, e.g. after other processes changed the store."""
+        blobs = []
+        for path in (self.root / "blobs").glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, path.name, stat.st_size))
+        self._blobs = OrderedDict((digest, size) for _, digest, size in sorted(blobs))
+        self._total = sum(self._blobs.values())
+        self._keys = {}
+        for path in (self.root / "keys").glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                digest = path.read_text().strip()
+            except FileNotFoundError:
+                continue
+            self._keys.setdefault(digest, set()).add(path.name)
+        self._scanned = time.monotonic()
+
+    def _evict(self) -> None:
+        """
+        Removes least recently used blobs and the keys pointing to them until the
+        store fits under max_bytes. Called with the index lock held.
+        """
+        assert self.max_bytes is not None and self._blobs is not None
+        while self._total > self.max_bytes and self._blobs:
+            digest, size = self._blobs.popitem(last=False)
+            self._blob_path(digest).unlink(missing_ok=True)
+            for key in self._keys.pop(digest, ()):
+                self._key_path(key).unlink(missing_ok=True)
+            self._total -= size
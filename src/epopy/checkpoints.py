@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+@dataclass
+class QueryCheckpoint:
+    """
+    Sync state of a saved query: the date of the last run (YYYYMMDD) and the numbers
+    yielded within the overlap window, with the date of the run that first yielded them.
+    """
+    cql: str
+    last_date: Optional[str] = None
+    seen: Dict[str, str] = field(default_factory=lambda: {})
+
+class CheckpointStore:
+    """
+    JSON file holding one checkpoint per saved query name.
+    Updates are written through a temporary file and an atomic rename.
+    """
+    
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._checkpoints: Dict[str, QueryCheckpoint] = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self._checkpoints = {name: QueryCheckpoint(**value) for name, value in raw.items()}
+
+    def get(self, name: str) -> Optional[QueryCheckpoint]:
+        return self._checkpoints.get(name)
+
+    def put(self, name: str, checkpoint: QueryCheckpoint) -> None:
+        self._checkpoints[name] = checkpoint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({n: asdict(c) for n, c in self._checkpoints.items()}, f, indent=2)
+        os.replace(tmp_name, self.path)
+
+    def names(self) -> List[str]:
+        return sorted(self._checkpoints)
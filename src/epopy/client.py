@@ -1,34 +1,103 @@
+import asyncio
 import httpx
-from typing import Optional, Any, Dict
+import time
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import cache, cached_property
+from types import ModuleType
+from typing import AsyncGenerator, AsyncIterator, Iterator, Optional, Any, Dict, Sequence, Type
+from . import deadlines
 from .auth import AuthManager
-# Import locally to avoid circular dependencies if any, or reorganize
-# But here we can import safely if models don't import client (they don't)
-# However, api modules import AsyncClient for type hinting.
-# To avoid circular imports, we can use TYPE_CHECKING or just import inside __init__
+from .instrumentation import Instrumentation, endpoint_family
+from .quota import QuotaTracker
+from .scheduler import RequestScheduler
+# The api modules import AsyncClient for type hinting, so they are imported lazily
+# here; the pydantic models and xmltodict are only loaded once a response arrives.
 
 if False: # TYPE_CHECKING
     from .api.search import SearchService
     from .api.retrieval import RetrievalService
+    from .blobstore import BlobStore
+    from .models import OPSResponse
+    from .streaming import ElementStream
+
+# Ends the elements queued by AsyncClient._read_elements
+_END = object()
+# Message of the cancellation of a stream whose consumer stopped early
+_CLOSED = "stream closed by its consumer"
+
+@cache
+def _xmltodict() -> ModuleType:
+    """The xmltodict module, imported on first use and then reused."""
+    import xmltodict
+    module: ModuleType = xmltodict
+    return module
+
+@cache
+def _response_model() -> Type["OPSResponse"]:
+    """The OPSResponse model class, imported on first use and then reused."""
+    from .models import OPSResponse
+    return OPSResponse
+
+# Priority class of the requests made in the current context, see AsyncClient.priority
+_priority: ContextVar[str] = ContextVar("epopy_priority", default="interactive")
 
 class AsyncClient:
     """Async client for EPO OPS API."""
     
     BASE_URL = "https://ops.epo.org/3.2/rest-services"
     
-    def __init__(self, consumer_key: str, consumer_secret: str, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        consumer_key: str,
+        consumer_secret: str,
+        base_url: str = BASE_URL,
+        blob_store: Optional["BlobStore"] = None,
+        quota: Optional[QuotaTracker] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            consumer_key: OPS consumer key.
+            consumer_secret: OPS consumer secret.
+            base_url: Base URL of the REST services.
+            blob_store: Optional local store that image/document downloads go through.
+            quota: Quota tracker to use, e.g. with custom limits. One is created by default.
+            scheduler: Scheduler sharing request slots between priority classes.
+                       Defaults to ``RequestScheduler()`` with its default classes.
+            instrumentation: Event hub for metrics/tracing hooks, see
+                             ``epopy.instrumentation``. One without hooks is created by default.
+            transport: httpx transport for all requests, including token requests, e.g.
+                       ``httpx.ASGITransport`` around a local stand-in for OPS.
+        """
         self.auth = AuthManager(consumer_key, consumer_secret)
         self.base_url = base_url.rstrip("/")
         self._client: Optional[httpx.AsyncClient] = None
-        
-        # Initialize services
-        from .api.search import SearchService
+        self.transport = transport
+        self.blob_store = blob_store
+        self.quota = quota or QuotaTracker()
+        self.scheduler = scheduler or RequestScheduler()
+        self.instrumentation = instrumentation or Instrumentation()
+
+    @cached_property
+    def published_data(self) -> "RetrievalService":
+        """Published-data retrieval service, created on first use."""
         from .api.retrieval import RetrievalService
-        self.published_data = RetrievalService(self)
-        self.search = SearchService(self)
+        return RetrievalService(self)
 
+    @cached_property
+    def search(self) -> "SearchService":
+        """Search service, created on first use."""
+        from .api.search import SearchService
+        return SearchService(self)
+        
+    def _new_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=30.0, transport=self.transport)
         
     async def __aenter__(self) -> "AsyncClient":
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._client = self._new_http_client()
         return self
         
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
@@ -40,22 +109,83 @@ class AsyncClient:
         """Returns the active client or creates a new one temporarily."""
         if self._client:
             return self._client
-        return httpx.AsyncClient(timeout=30.0)
+        return self._new_http_client()
         
-    async def request(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
-        """Makes an authenticated request to the API."""
+    @contextmanager
+    def priority(self, name: str) -> Iterator[None]:
+        """
+        Runs the requests made inside the block (including tasks created there) with the
+        given priority class, e.g. ``with client.priority("bulk"): ...``.
+        """
+        token = _priority.set(name)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def deadline(self, seconds: float) -> AbstractAsyncContextManager[None]:
+        """
+        Gives the operations inside the block ``seconds`` to finish, e.g.
+        ``async with client.deadline(5): await document.download()``.
+        See ``epopy.deadlines.deadline``.
+        """
+        return deadlines.deadline(seconds)
+
+    async def request(self, method: str, endpoint: str, priority: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Makes an authenticated request to the API.
+
+        Args:
+            method: HTTP method.
+            endpoint: Path relative to the base URL.
+            priority: Priority class of the request, defaults to the one set with
+                      ``priority()`` or "interactive". Quota budgets and scheduler
+                      shares apply per class.
+        """
+        async with self.stream(method, endpoint, priority=priority, **kwargs) as response:
+            await response.aread()
+        return response
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, endpoint: str, priority: Optional[str] = None, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Makes an authenticated request like ``request``, but yields the response as
+        soon as its headers arrived, with the body still to be read, e.g. with
+        ``response.aiter_bytes()``.
+
+        The scheduler slot is held until the block is left, so slow processing inside
+        the block delays other requests of the same priority class, and a request
+        made inside the block can wait for the slot forever; ``stream_elements``
+        releases it before the caller sees any element. The reported
+        network time covers the whole block, and an exception raised inside the block
+        (by the caller too) is reported as the request's error. Error responses are
+        read completely before ``httpx.HTTPStatusError`` is raised.
+        """
         endpoint = endpoint.lstrip("/")
         url = f"{self.base_url}/{endpoint}"
+        priority = priority or _priority.get()
+        await self.quota.check(priority)
+        left = deadlines.remaining()
+        if left is not None:
+            if left <= 0:
+                raise deadlines.DeadlineExceeded(f"No time left for {method} {endpoint}")
+            kwargs.setdefault("timeout", deadlines.timeout(30.0))
         
         # Ensure we have a client instance
         local_client = False
         client = self._client
         if not client:
-            client = httpx.AsyncClient(timeout=30.0)
+            client = self._new_http_client()
             local_client = True
             
+        instrumentation = self.instrumentation
+        timings: Dict[str, Any] = {}
+        start = time.perf_counter()
         try:
             token = await self.auth.get_access_token(client)
+            timings["token_time"] = time.perf_counter() - start
             
             headers = kwargs.pop("headers", {})
             headers["Authorization"] = f"Bearer {token}"
@@ -63,20 +193,146 @@ class AsyncClient:
             if "Accept" not in headers:
                 headers["Accept"] = "application/xml"
             
-            response = await client.request(method, url, headers=headers, **kwargs)
-            response.raise_for_status()
-            return response
+            queued = time.perf_counter()
+            async with self.scheduler.slot(priority):
+                sent = time.perf_counter()
+                timings["queue_time"] = sent - queued
+                response = await client.send(client.build_request(method, url, headers=headers, **kwargs), stream=True)
+                try:
+                    timings["status"] = response.status_code
+                    self.quota.update(response.headers)
+                    if instrumentation.enabled:
+                        self._emit_throttle(response.headers)
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    yield response
+                finally:
+                    await response.aclose()
+                    timings["network_time"] = time.perf_counter() - sent
+                    timings["bytes"] = response.num_bytes_downloaded
+        except BaseException as e:
+            # An iterator over the body that is closed early is not a failed request
+            if not isinstance(e, GeneratorExit) and not (isinstance(e, asyncio.CancelledError) and e.args == (_CLOSED,)):
+                timings["error"] = type(e).__name__
+            raise
         finally:
-            if local_client:
+            if instrumentation.enabled:
+                instrumentation.emit(
+                    "request", endpoint_family(endpoint), time.perf_counter() - start,
+                    method=method, path=endpoint, priority=priority, **timings
+                )
+            # A transport given to the client serves every request; a per-request
+            # client must not close it, so only one with its own transport is closed
+            if local_client and self.transport is None:
                 await client.aclose()
+
+    def _emit_throttle(self, headers: httpx.Headers) -> None:
+        """Reports the throttle state and quota usage of a response."""
+        if "X-Throttling-Control" not in headers and "X-IndividualQuotaPerHour-Used" not in headers:
+            return
+        usage = self.quota.usage
+        state = usage.throttle_state or "unknown"
+        self.instrumentation.emit(
+            "throttle", state,
+            state=state,
+            services={name: color for name, (color, _) in usage.services.items()},
+            hourly_used=usage.hourly_used,
+            weekly_used=usage.weekly_used,
+        )
     
+    def parse_response(self, data: Dict[str, Any]) -> "OPSResponse":
+        """
+        Builds the response models from a parsed XML dictionary. Callers that do not
+        need models can use the ``*_raw`` service methods or ``get_data`` instead.
+        """
+        model = _response_model()
+        with self.instrumentation.measure("validate", "OPSResponse"):
+            return model(**data)
+
     async def get_data(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
         """Performs a GET request and returns the parsed dictionary (from XML)."""
-        import xmltodict
         response = await self.request("GET", endpoint, **kwargs)
-        data: Dict[str, Any] = xmltodict.parse(response.text)
+        with self.instrumentation.measure("parse", endpoint_family(endpoint)):
+            data: Dict[str, Any] = _xmltodict().parse(response.text)
+        return data
+
+    async def post_data(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        """Performs a POST request and returns the parsed dictionary (from XML)."""
+        response = await self.request("POST", endpoint, **kwargs)
+        with self.instrumentation.measure("parse", endpoint_family(endpoint)):
+            data: Dict[str, Any] = _xmltodict().parse(response.text)
         return data
 
+    async def stream_elements(
+        self,
+        method: str,
+        endpoint: str,
+        tags: Sequence[str],
+        text: bool = False,
+        parser: Optional["ElementStream"] = None,
+        **kwargs: Any
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Performs a request and yields the selected elements of the XML response as
+        they arrive, without buffering the body. Elements are dicts shaped like the
+        ``get_data`` output, see ``epopy.streaming.ElementStream``.
+
+        The body is read and parsed by a separate task that holds the scheduler slot
+        only until the response has arrived; elements the caller has not taken yet
+        are buffered. The loop body can therefore make requests of the same priority
+        class without waiting for the slot it runs in, and its exceptions are not
+        reported as the request's error. Stop early with ``contextlib.aclosing`` to
+        cancel the request right away.
+
+        Args:
+            method: HTTP method.
+            endpoint: Path relative to the base URL.
+            tags: Qualified names of the elements to yield, e.g. ["exchange-document"].
+            text: Yield the plain text and attributes of the elements instead.
+            parser: ElementStream to parse with, for reading the attributes of the
+                enclosing elements (``ElementStream.attributes``) while iterating;
+                ``tags`` and ``text`` are ignored then.
+        """
+        from .streaming import ElementStream
+        if parser is None:
+            parser = ElementStream(tags, text=text)
+        elements: asyncio.Queue[Any] = asyncio.Queue()
+        reader = asyncio.create_task(self._read_elements(method, endpoint, parser, elements, **kwargs))
+        try:
+            while (element := await elements.get()) is not _END:
+                yield element
+            await reader
+        finally:
+            if not reader.done():
+                reader.cancel(_CLOSED)
+                await asyncio.wait([reader])
+            if not reader.cancelled():
+                # Raised by the await above, or dropped along with the unread elements
+                reader.exception()
+
+    async def _read_elements(
+        self, method: str, endpoint: str, parser: "ElementStream", elements: "asyncio.Queue[Any]", **kwargs: Any
+    ) -> None:
+        """Reads a response into ``parser`` and puts the finished elements on a queue, then ``_END``."""
+        parse_time = 0.0
+        try:
+            async with self.stream(method, endpoint, **kwargs) as response:
+                async for chunk in response.aiter_bytes():
+                    started = time.perf_counter()
+                    for element in parser.feed(chunk):
+                        elements.put_nowait(element)
+                    parse_time += time.perf_counter() - started
+                started = time.perf_counter()
+                for element in parser.close():
+                    elements.put_nowait(element)
+                parse_time += time.perf_counter() - started
+        finally:
+            elements.put_nowait(_END)
+            self.instrumentation.emit(
+                "parse", endpoint_family(endpoint), parse_time, streamed=True, elements=parser.count
+            )
+
     async def get(self, endpoint: str, **kwargs: Any) -> httpx.Response:
         return await self.request("GET", endpoint, **kwargs)
 
@@ -89,10 +345,27 @@ class AsyncClient:
         """
         return await self.search.search_patents(q, **kwargs)
 
-    def get_patent(self, number: str, format: str = "docdb", reference_type: str = "publication") -> Any:
+    async def harvest(self, q: str, out_dir: Any, doc_types: Any = ("FullDocument",), **kwargs: Any) -> Any:
+        """
+        Download the documents of all patents matching a query to a directory.
+        See ``epopy.harvest.Harvester`` for the options.
+        """
+        from .harvest import Harvester
+        return await Harvester(self, out_dir, doc_types=doc_types, **kwargs).run(q)
+
+    def get_patent(
+        self,
+        number: str,
+        format: str = "docdb",
+        reference_type: str = "publication",
+        normalize: bool = False,
+        priority: Optional[str] = None
+    ) -> Any:
         """
         Get a Patent object for high-level interaction.
+        With ``normalize`` free-form numbers are converted to the canonical form of ``format``;
+        ``priority`` tags all requests made through the patent and its documents.
         """
         from .patent import Patent
-        return Patent(self, number, format=format, type=reference_type)
+        return Patent(self, number, format=format, type=reference_type, normalize=normalize, priority=priority)
 
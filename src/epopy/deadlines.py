@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import AsyncIterator, Optional
+
+# Absolute event loop time by which the current operation must finish, see deadline()
+_deadline: ContextVar[Optional[float]] = ContextVar("epopy_deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an operation does not finish within its deadline."""
+
+@asynccontextmanager
+async def deadline(seconds: float) -> AsyncIterator[None]:
+    """
+    Runs the block with a deadline of ``seconds`` from now.
+
+    The deadline applies to everything awaited inside, including tasks created there
+    (they inherit the context): request timeouts are shortened to the time left,
+    back-off waits that would overrun it fail immediately, and when it passes the
+    block is cancelled, which also cancels sibling tasks of a TaskGroup. Nested
+    deadlines can only shorten the outer one.
+
+    Raises:
+        DeadlineExceeded: The block did not finish in time.
+    """
+    loop = asyncio.get_running_loop()
+    when = loop.time() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        when = min(when, outer)
+    token = _deadline.set(when)
+    try:
+        async with asyncio.timeout_at(when):
+            yield
+    except DeadlineExceeded:
+        raise
+    except TimeoutError as e:
+        if loop.time() < when:
+            # Some other timeout inside the block
+            raise
+        raise DeadlineExceeded(f"Deadline of {seconds}s exceeded") from e
+    finally:
+        _deadline.reset(token)
+
+def detached_context() -> Context:
+    """
+    A copy of the current context without a deadline, for work shared by several
+    callers (e.g. a request they all await) that must not end with the deadline of
+    whichever caller started it. Each caller's own deadline still cancels its wait.
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None without one."""
+    when = _deadline.get()
+    if when is None:
+        return None
+    return max(0.0, when - asyncio.get_running_loop().time())
+
+def timeout(default: float) -> float:
+    """A timeout of at most ``default`` seconds that does not extend past the deadline."""
+    left = remaining()
+    return default if left is None else min(default, left)
+
+async def sleep(delay: float) -> None:
+    """
+    Sleeps like ``asyncio.sleep``, but fails right away with DeadlineExceeded if the
+    wait would end after the current deadline; waiting out the deadline only to fail
+    afterwards would be pointless.
+    """
+    left = remaining()
+    if left is not None and delay >= left:
+        raise DeadlineExceeded(f"Waiting {delay:.1f}s would exceed the deadline ({left:.1f}s left)")
+    await asyncio.sleep(delay)
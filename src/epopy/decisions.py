@@ -1,14 +1,32 @@
 
+import asyncio
 import logging
+import mmap
+import threading
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Tuple, Any
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any, FrozenSet, TypeVar
+import os
 import re
 
 from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+# Text parts of a decision that can be requested via the ``fields`` projection.
+# Metadata is always extracted; it is cheap compared to the decision text.
+TEXT_FIELDS: FrozenSet[str] = frozenset({"facts", "reasons", "full_text"})
+
+# Byte markers used by the mmap pre-scan
+_DECISION_OPEN = b"<ep-appeal-decision"
+_DECISION_CLOSE = b"</ep-appeal-decision>"
+_XML_ENCODING = re.compile(rb"""<\?xml[^>]*encoding=["']([A-Za-z0-9._-]+)["']""")
+_CASE_NUM_OPEN = b"<ep-case-num"
+_CASE_NUM_CLOSE = b"</ep-case-num>"
+# Bytes that can follow a tag name, telling <ep-appeal-decision> from <ep-appeal-decisions>
+_TAG_NAME_END = (b" ", b">", b"\t", b"\r", b"\n")
+
 @dataclass
 class DecisionMetadata:
     """Metadata for an EPO Board of Appeal decision."""
@@ -23,14 +41,124 @@ class DecisionMetadata:
     ipc_classes: List[str]
     language: Optional[str]
     
-@dataclass
+@dataclass(init=False)
 class Decision:
-    """Represents a full EPO Board of Appeal decision including text content."""
+    """
+    Represents an EPO Board of Appeal decision including text content.
+
+    ``facts`` and ``reasons`` are None when they were not requested via the
+    ``fields`` projection. ``full_text`` is built on first access.
+    """
     metadata: DecisionMetadata
-    full_text: str
-    facts: str
-    reasons: str
-    
+    facts: Optional[str]
+    reasons: Optional[str]
+
+    def __init__(
+        self,
+        metadata: DecisionMetadata,
+        full_text: Optional[str] = None,
+        facts: Optional[str] = None,
+        reasons: Optional[str] = None
+    ):
+        """
+        Args:
+            metadata: The decision's metadata.
+            full_text: The full text, if already at hand; otherwise it is built from
+                       facts and reasons on first access. Keeps the positional order
+                       of ``Decision(metadata, full_text, facts, reasons)``.
+            facts: Summary of facts, None if not extracted.
+            reasons: Reasons for the decision, None if not extracted.
+        """
+        self.metadata = metadata
+        self.facts = facts
+        self.reasons = reasons
+        if full_text is not None:
+            self.__dict__["full_text"] = full_text
+
+    @cached_property
+    def full_text(self) -> str:
+        """
+        Concatenation of the summary of facts and the reasons for the decision.
+
+        Raises:
+            ValueError: Facts or reasons were left out by the ``fields`` projection.
+        """
+        if self.facts is None or self.reasons is None:
+            raise ValueError(
+                f"full_text of {self.metadata.decision_id} needs facts and reasons; "
+                "request them with fields=['full_text']"
+            )
+        return f"SUMMARY OF FACTS\n\n{self.facts}\n\nREASONS FOR THE DECISION\n\n{self.reasons}"
+
+def _resolve_fields(fields: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """
+    Resolves a ``fields`` projection into the set of text parts to extract.
+    None means everything; "full_text" implies both facts and reasons.
+    """
+    if fields is None:
+        return frozenset({"facts", "reasons"})
+    requested = frozenset(fields)
+    unknown = requested - TEXT_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown decision fields: {sorted(unknown)}. Expected a subset of {sorted(TEXT_FIELDS)}")
+    if "full_text" in requested:
+        requested = requested | {"facts", "reasons"}
+    return requested - {"full_text"}
+
+T = TypeVar("T")
+
+_DONE = object()
+
+async def _iterate_in_thread(factory: Callable[[], Iterator[T]], maxsize: int) -> AsyncIterator[T]:
+    """
+    Drives a blocking iterator in a worker thread and yields its items on the event loop.
+
+    A semaphore bounds the number of items in flight to ``maxsize`` (backpressure); the
+    worker checks the stop flag while waiting so closing the async iterator ends it.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+    slots = threading.Semaphore(maxsize)
+    stop = threading.Event()
+
+    def _put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed, nobody is listening anymore
+            stop.set()
+
+    def _worker() -> None:
+        iterator = factory()
+        try:
+            for item in iterator:
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                _put(item)
+        except BaseException as e:
+            _put(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            _put(_DONE)
+
+    threading.Thread(target=_worker, name="epopy-decisions", daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+
 class DecisionsParser:
     """
     Parser for EPO Decisions XML files (e.g. EPDecisions_September2025.xml).
@@ -40,6 +168,10 @@ class DecisionsParser:
         self.xml_path = Path(xml_path)
         if not self.xml_path.exists():
             raise FileNotFoundError(f"XML file not found: {self.xml_path}")
+        # Case number -> byte range of the decision, see build_index
+        self._index: Optional[Dict[Tuple[str, str, str], Tuple[int, int]]] = None
+        self._index_stamp: Optional[Tuple[int, float]] = None
+        self._index_encoding = "utf-8"
 
     def parse_decision_code(self, code: str) -> Tuple[str, str, str]:
         """
@@ -73,48 +205,322 @@ class DecisionsParser:
         
         return type_char, number, year
 
-    def find_decision(self, decision_code: str) -> Optional[Decision]:
+    def format_decision_code(self, type_code: str, number: str, year: str) -> str:
+        """
+        Formats case number parts back into a decision code like "T 3069/19".
+        """
+        num = str(int(number)) if number.isdigit() else number
+        return f"{type_code} {num}/{year[-2:]}"
+
+    def find_decision(
+        self,
+        decision_code: str,
+        fields: Optional[Iterable[str]] = None,
+        use_mmap: bool = False
+    ) -> Optional[Decision]:
         """
         Searches for a specific decision by its code (e.g. "T 3069/19").
+
+        Args:
+            decision_code: The decision code to look for.
+            fields: Optional projection of text parts to extract ("facts", "reasons",
+                    "full_text"). None extracts everything, an empty list only metadata.
+            use_mmap: Memory-map the file and scan its bytes for the case number,
+                      so lxml only parses the matching decision fragments.
         """
-        target_type, target_num, target_year = self.parse_decision_code(decision_code)
+        wanted = _resolve_fields(fields)
+        target = self.parse_decision_code(decision_code)
         
-        logger.info(f"Searching for decision: Type={target_type}, Num={target_num}, Year={target_year}")
+        logger.info(f"Searching for decision: Type={target[0]}, Num={target[1]}, Year={target[2]}")
+
+        return self._find(target, decision_code, wanted, use_mmap)
+
+    async def afind_decision(
+        self,
+        decision_code: str,
+        fields: Optional[Iterable[str]] = None,
+        use_mmap: bool = False
+    ) -> Optional[Decision]:
+        """
+        Async counterpart of ``find_decision``. The scan runs in a worker thread so the
+        event loop is not blocked; cancelling the call stops the scan at the next decision.
+        """
+        wanted = _resolve_fields(fields)
+        target = self.parse_decision_code(decision_code)
+        stop = threading.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._find, target, decision_code, wanted, use_mmap, stop)
+        except asyncio.CancelledError:
+            stop.set()
+            raise
 
-        # Streaming parser
-        context = etree.iterparse(self.xml_path, events=('end',), tag='ep-appeal-decision')
+    def find_decisions(
+        self,
+        decision_codes: Iterable[str],
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Optional[Decision]]:
+        """
+        Looks up many decisions at once.
+
+        With an index (see ``build_index``) every decision is read from its byte range;
+        otherwise the file is streamed once, stopping as soon as all codes were found.
+
+        Returns:
+            A mapping from each requested code to its decision, or None if not found.
+        """
+        wanted = _resolve_fields(fields)
+        targets: Dict[Tuple[str, str, str], List[str]] = {}
+        for code in decision_codes:
+            targets.setdefault(self.parse_decision_code(code), []).append(code)
+        results: Dict[str, Optional[Decision]] = {code: None for codes in targets.values() for code in codes}
         
-        for _, elem in context:
+        if self._current_index() is not None:
             try:
-                # Check criteria
-                
-                # Check Case Num
-                bib_data = elem.find('ep-appeal-bib-data')
-                if bib_data is None: 
-                    continue
-                    
-                case_num_elem = bib_data.find('ep-case-num')
-                if case_num_elem is None:
-                    continue
-
-                # Code (Type)
-                case_type = case_num_elem.get('code')
-                
-                # ep-appeal-num
-                appeal_num = case_num_elem.find('ep-appeal-num')
-                appeal_num_text = appeal_num.text if appeal_num is not None else ""
-                
-                # ep-year
-                appeal_year = case_num_elem.find('ep-year')
-                appeal_year_text = appeal_year.text if appeal_year is not None else ""
-                
-                if (case_type == target_type and 
-                    appeal_num_text == target_num and 
-                    appeal_year_text == target_year):
+                for target, codes in targets.items():
+                    decision = self._find_indexed(target, codes[0], wanted)
+                    for code in codes:
+                        results[code] = decision
+                return results
+            except (etree.XMLSyntaxError, LookupError) as e:
+                logger.warning(f"Indexed lookup failed ({e}), falling back to streaming parse")
+            
+
+        remaining = dict(targets)
+        for elem in self._iter_elements():
+            if not remaining:
+                break
+            key = self._case_key(elem)
+            matched = remaining.pop(key, None) if key is not None else None
+            if matched:
+                decision = self._extract_decision_data(elem, matched[0], wanted)
+                for code in matched:
+                    results[code] = decision
+        return results
+
+    def build_index(self) -> int:
+        """
+        Scans the file once and records the byte range of every decision, so later
+        lookups parse a single fragment instead of streaming the file. The index is
+        dropped automatically when the file changes.
+
+        Returns:
+            The number of indexed decisions.
+        """
+        index: Dict[Tuple[str, str, str], Tuple[int, int]] = {}
+        stat = self.xml_path.stat()
+        with open(self.xml_path, "rb") as f:
+            if stat.st_size == 0:
+                self._index, self._index_stamp = index, (stat.st_size, stat.st_mtime)
+                return 0
+            encoding = "utf-8"
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoding = self._check_encoding(mm)
+                parser = etree.XMLParser(encoding=encoding) if encoding not in ("utf-8", "utf8") else None
+                pos = 0
+                while True:
+                    start = mm.find(_DECISION_OPEN, pos)
+                    if start == -1:
+                        break
+                    if mm[start + len(_DECISION_OPEN):start + len(_DECISION_OPEN) + 1] not in _TAG_NAME_END:
+                        pos = start + len(_DECISION_OPEN)
+                        continue
+                    end = mm.find(_DECISION_CLOSE, start)
+                    if end == -1:
+                        break
+                    end += len(_DECISION_CLOSE)
+                    key = self._fragment_case_key(mm, start, end, parser)
+                    if key is not None:
+                        # Keep the first occurrence, like the streaming lookup
+                        index.setdefault(key, (start, end))
+                    pos = end
+        self._index, self._index_stamp = index, (stat.st_size, stat.st_mtime)
+        self._index_encoding = encoding
+        logger.info(f"Indexed {len(index)} decisions in {self.xml_path}")
+        return len(index)
+
+    def _current_index(self) -> Optional[Dict[Tuple[str, str, str], Tuple[int, int]]]:
+        """The index, unless the file changed since it was built."""
+        if self._index is None:
+            return None
+        stat = self.xml_path.stat()
+        if (stat.st_size, stat.st_mtime) != self._index_stamp:
+            logger.warning(f"{self.xml_path} changed since it was indexed, dropping the index")
+            self._index = self._index_stamp = None
+            return None
+        return self._index
+
+    def _fragment_case_key(self, mm: mmap.mmap, start: int, end: int, parser: Any) -> Optional[Tuple[str, str, str]]:
+        """
+        Case number of the decision at ``mm[start:end]``, read with the same rules as
+        ``_case_key``. Only the ep-case-num element is parsed, unless it cannot be
+        parsed on its own (e.g. it uses entities declared elsewhere).
+        """
+        case_start = mm.find(_CASE_NUM_OPEN, start, end)
+        case_end = mm.find(_CASE_NUM_CLOSE, case_start, end) if case_start != -1 else -1
+        if case_end != -1:
+            try:
+                return self._case_num_key(etree.fromstring(mm[case_start:case_end + len(_CASE_NUM_CLOSE)], parser))
+            except etree.XMLSyntaxError:
+                pass
+        return self._case_key(etree.fromstring(mm[start:end], parser))
+
+    def _find_indexed(self, target: Tuple[str, str, str], decision_id: str, fields: FrozenSet[str]) -> Optional[Decision]:
+        """
+        Parses the indexed fragment of a decision.
+
+        Raises:
+            LookupError: The fragment holds another decision, i.e. the index is stale;
+                         the index is dropped.
+        """
+        assert self._index is not None
+        span = self._index.get(target)
+        if span is None:
+            return None
+        with open(self.xml_path, "rb") as f:
+            f.seek(span[0])
+            fragment = f.read(span[1] - span[0])
+        encoding = self._index_encoding
+        parser = etree.XMLParser(encoding=encoding) if encoding not in ("utf-8", "utf8") else None
+        elem = etree.fromstring(fragment, parser)
+        if self._case_key(elem) != target:
+            self._index = self._index_stamp = None
+            raise LookupError(f"indexed range of {decision_id} holds another decision, dropping the index")
+        return self._extract_decision_data(elem, decision_id, fields)
+
+    def _find(
+        self,
+        target: Tuple[str, str, str],
+        decision_code: str,
+        wanted: FrozenSet[str],
+        use_mmap: bool,
+        stop: Optional[threading.Event] = None
+    ) -> Optional[Decision]:
+        # Checked on every path, so a stale index is never used
+        index = self._current_index()
+        if use_mmap or index is not None:
+            try:
+                if index is not None:
+                    return self._find_indexed(target, decision_code, wanted)
+                return self._find_mmap(target, decision_code, wanted, stop)
+            except (etree.XMLSyntaxError, LookupError) as e:
+                # Fragments relying on DTD entities, exotic encodings or a stale index:
+                # use the full parse
+                logger.warning(f"mmap pre-scan failed ({e}), falling back to streaming parse")
+
+        for elem in self._iter_elements(stop):
+            if self._case_key(elem) == target:
+                logger.info("Found match!")
+                return self._extract_decision_data(elem, decision_code, wanted)
                     
-                    logger.info("Found match!")
-                    return self._extract_decision_data(elem, decision_code)
-                
+        return None
+
+    def iter_decisions(self, fields: Optional[Iterable[str]] = None) -> Iterator[Decision]:
+        """
+        Iterates over all decisions in the file.
+
+        Args:
+            fields: Optional projection of text parts to extract, see ``find_decision``.
+        """
+        return self._iter_decisions(_resolve_fields(fields))
+
+    def _iter_decisions(self, wanted: FrozenSet[str]) -> Iterator[Decision]:
+        for elem in self._iter_elements():
+            key = self._case_key(elem)
+            if key is None:
+                continue
+            yield self._extract_decision_data(elem, self.format_decision_code(*key), wanted)
+
+    async def aiter_decisions(self, fields: Optional[Iterable[str]] = None, maxsize: int = 64) -> AsyncIterator[Decision]:
+        """
+        Async counterpart of ``iter_decisions``.
+
+        Parsing runs in a worker thread that hands decisions over through a queue of at
+        most ``maxsize`` items; the worker pauses while the queue is full. Closing or
+        cancelling the iterator stops the worker.
+        """
+        # Resolved once, before starting the worker; fields may be a one-shot iterable
+        wanted = _resolve_fields(fields)
+        async for decision in _iterate_in_thread(lambda: self._iter_decisions(wanted), maxsize):
+            yield decision
+
+    def _find_mmap(
+        self,
+        target: Tuple[str, str, str],
+        decision_id: str,
+        fields: FrozenSet[str],
+        stop: Optional[threading.Event] = None
+    ) -> Optional[Decision]:
+        """Parses only the candidate fragments found by the byte-level pre-scan."""
+        for fragment, parser in self._scan_candidates(target[1]):
+            if stop is not None and stop.is_set():
+                return None
+            elem = etree.fromstring(fragment, parser)
+            if self._case_key(elem) == target:
+                logger.info("Found match!")
+                return self._extract_decision_data(elem, decision_id, fields)
+        return None
+
+    def _scan_candidates(self, appeal_num: str) -> Iterator[Tuple[bytes, Any]]:
+        """
+        Yields raw ep-appeal-decision fragments containing the given appeal number,
+        together with the parser to use for them.
+        """
+        with open(self.xml_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoding = self._check_encoding(mm)
+                parser = etree.XMLParser(encoding=encoding) if encoding not in ("utf-8", "utf8") else None
+
+                # The element may carry attributes; _case_key decides on the parsed candidates
+                pattern = re.compile(
+                    rb"<ep-appeal-num\b[^>]*>\s*" + re.escape(appeal_num.encode("ascii")) + rb"\s*</ep-appeal-num>"
+                )
+                pos = 0
+                while True:
+                    match = pattern.search(mm, pos)
+                    if match is None:
+                        return
+                    start = self._find_open_tag(mm, match.start())
+                    end = mm.find(_DECISION_CLOSE, match.end())
+                    if start == -1 or end == -1:
+                        return
+                    end += len(_DECISION_CLOSE)
+                    yield mm[start:end], parser
+                    pos = end
+
+    @staticmethod
+    def _check_encoding(mm: mmap.mmap) -> str:
+        """Returns the declared encoding, rejecting ones a byte-level scan cannot handle."""
+        encoding_match = _XML_ENCODING.match(mm, 0, 200)
+        encoding = encoding_match.group(1).decode("ascii").lower() if encoding_match else "utf-8"
+        if encoding.startswith(("utf-16", "utf-32")):
+            raise LookupError(f"byte scan not supported for {encoding}")
+        return encoding
+
+    @staticmethod
+    def _find_open_tag(mm: mmap.mmap, before: int) -> int:
+        """Finds the closest ``<ep-appeal-decision`` start tag before an offset (skipping the plural root)."""
+        hi = before
+        while True:
+            idx = mm.rfind(_DECISION_OPEN, 0, hi)
+            if idx == -1:
+                return -1
+            following = mm[idx + len(_DECISION_OPEN):idx + len(_DECISION_OPEN) + 1]
+            if following in _TAG_NAME_END:
+                return idx
+            hi = idx
+
+    def _iter_elements(self, stop: Optional[threading.Event] = None) -> Iterator[Any]:
+        """Streams ep-appeal-decision elements, clearing each one once consumed."""
+        context = etree.iterparse(str(self.xml_path), events=('end',), tag='ep-appeal-decision')
+        
+        for _, elem in context:
+            if stop is not None and stop.is_set():
+                return
+            try:
+                yield elem
             finally:
                 # Clear element to save memory
                 elem.clear()
@@ -122,11 +528,36 @@ class DecisionsParser:
                 if parent is not None:
                     while elem.getprevious() is not None:
                         del parent[0]
-                    
-        return None
 
-    def _extract_decision_data(self, elem: Any, decision_id: str) -> Decision:
-        """Extract metadata and content from an ep-appeal-decision element."""
+    def _case_key(self, elem: Any) -> Optional[Tuple[str, str, str]]:
+        """Returns the (type_code, number, year) case number of a decision element."""
+        bib_data = elem.find('ep-appeal-bib-data')
+        if bib_data is None: 
+            return None
+            
+        case_num_elem = bib_data.find('ep-case-num')
+        if case_num_elem is None:
+            return None
+        return self._case_num_key(case_num_elem)
+
+    @staticmethod
+    def _case_num_key(case_num_elem: Any) -> Tuple[str, str, str]:
+        """Returns the (type_code, number, year) case number of an ep-case-num element."""
+        # Code (Type)
+        case_type = case_num_elem.get('code') or ""
+        
+        # ep-appeal-num
+        appeal_num = case_num_elem.find('ep-appeal-num')
+        appeal_num_text = (appeal_num.text or "") if appeal_num is not None else ""
+        
+        # ep-year
+        appeal_year = case_num_elem.find('ep-year')
+        appeal_year_text = (appeal_year.text or "") if appeal_year is not None else ""
+        
+        return case_type, appeal_num_text, appeal_year_text
+
+    def _extract_decision_data(self, elem: Any, decision_id: str, fields: FrozenSet[str] = frozenset({"facts", "reasons"})) -> Decision:
+        """Extract metadata and the requested text content from an ep-appeal-decision element."""
         # Note: 'elem' is an lxml Element, typed as Any because properly typing lxml is complex without stubs
         def _get_text(xpath_expr: str, base_elem: Any = elem) -> Optional[str]:
             """Helper to extract text from an element found via XPath."""
@@ -174,19 +605,21 @@ class DecisionsParser:
             language=lang
         )
         
-        # Content
+        # Content, only touched when requested
         # Facts
-        summary_elem = elem.find('ep-summary-of-facts')
-        facts_text = ""
-        if summary_elem is not None:
-             facts_text = "\n\n".join(["".join(p.itertext()) for p in summary_elem.findall('p')])
+        facts_text: Optional[str] = None
+        if "facts" in fields:
+            summary_elem = elem.find('ep-summary-of-facts')
+            facts_text = ""
+            if summary_elem is not None:
+                 facts_text = "\n\n".join(["".join(p.itertext()) for p in summary_elem.findall('p')])
              
         # Reasons
-        reasons_elem = elem.find('ep-reasons-for-decision')
-        reasons_text = ""
-        if reasons_elem is not None:
-            reasons_text = "\n\n".join(["".join(p.itertext()) for p in reasons_elem.findall('p')])
-            
-        full_text = f"SUMMARY OF FACTS\n\n{facts_text}\n\nREASONS FOR THE DECISION\n\n{reasons_text}"
+        reasons_text: Optional[str] = None
+        if "reasons" in fields:
+            reasons_elem = elem.find('ep-reasons-for-decision')
+            reasons_text = ""
+            if reasons_elem is not None:
+                reasons_text = "\n\n".join(["".join(p.itertext()) for p in reasons_elem.findall('p')])
         
-        return Decision(metadata=metadata, full_text=full_text, facts=facts_text, reasons=reasons_text)
+        return Decision(metadata=metadata, facts=facts_text, reasons=reasons_text)
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Literal, Optional, TYPE_CHECKING
+
+from .decisions import Decision
+
+if TYPE_CHECKING:
+    from .client import AsyncClient
+    from .models import OPSResponse
+
+@dataclass
+class EnrichedDecision:
+    """A Board of Appeal decision joined with the OPS data of its patent."""
+    decision: Decision
+    publication_number: Optional[str]
+    patent_data: Optional['OPSResponse']
+
+def decision_publication_number(decision: Decision) -> Optional[str]:
+    """
+    Returns the epodoc publication number (e.g. "EP2950346") of the patent a decision
+    relates to, or None if the decision has no publication reference.
+    """
+    raw = decision.metadata.publication_num
+    if not raw:
+        return None
+    number = "".join(raw.split()).upper()
+    if number.isdigit():
+        # Decisions only reference the doc-number of the European publication
+        return f"EP{number.zfill(7)}"
+    return number
+
+async def enrich_decisions(
+    client: 'AsyncClient',
+    decisions: Iterable[Decision],
+    endpoint: Literal["biblio", "abstract", "full-cycle"] = "biblio",
+    concurrency: int = 4
+) -> List[EnrichedDecision]:
+    """
+    Joins decisions with the OPS published data of their patents.
+
+    Publication numbers are collected and deduplicated over the whole decision set and
+    fetched with batched, concurrent and cached requests (see
+    ``RetrievalService.published_data_many``).
+    
+    Args:
+        client: The AsyncClient instance.
+        decisions: The decisions to enrich.
+        endpoint: The published-data endpoint to join (biblio, abstract, full-cycle).
+        concurrency: Maximum number of batch requests in flight.
+    """
+    decision_list = list(decisions)
+    numbers = [decision_publication_number(d) for d in decision_list]
+    
+    data = await client.published_data.published_data_many(
+        "publication",
+        "epodoc",
+        [n for n in numbers if n],
+        endpoint=endpoint,
+        concurrency=concurrency
+    )
+    
+    return [
+        EnrichedDecision(decision=d, publication_number=n, patent_data=data.get(n) if n else None)
+        for d, n in zip(decision_list, numbers)
+    ]
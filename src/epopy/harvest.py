@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+from .patent import Document, Patent
+from .quota import QuotaExceeded
+
+if TYPE_CHECKING:
+    from .client import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"application/pdf": "pdf", "image/tiff": "tif", "application/tiff": "tif", "image/png": "png"}
+
+@dataclass
+class HarvestStats:
+    """Progress counters of a harvest run."""
+    patents: int = 0
+    documents: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+class Harvester:
+    """
+    Streaming pipeline from a CQL query to document files on disk.
+
+    The stages (search, document inquiry, download, write) are connected by bounded
+    queues and each stage has its own concurrency limit, so a slow stage applies
+    backpressure instead of piling up work. Finished documents are appended to a
+    manifest in the output directory; a rerun skips everything listed there.
+    """
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        out_dir: str | Path,
+        doc_types: Sequence[str] = ("FullDocument",),
+        document_format: Optional[str] = None,
+        inquiry_concurrency: int = 4,
+        download_concurrency: int = 2,
+        write_concurrency: int = 2,
+        queue_size: int = 32,
+        collapse_families: bool = False,
+        priority: str = "bulk",
+        on_progress: Optional[Callable[[HarvestStats], None]] = None
+    ):
+        """
+        Args:
+            client: The AsyncClient instance.
+            out_dir: Directory the documents and the manifest are written to.
+            doc_types: Document descriptions to download (e.g. "FullDocument", "Drawing").
+            document_format: Format to download, defaults to each document's first format.
+            inquiry_concurrency: Parallel images inquiries.
+            download_concurrency: Parallel document downloads.
+            write_concurrency: Parallel file writes.
+            queue_size: Capacity of the queues between the stages.
+            collapse_families: Download only the preferred member of each patent family.
+            priority: Priority class of the harvest's requests (see ``AsyncClient.priority``).
+            on_progress: Called with the current stats after every finished document.
+        """
+        self.client = client
+        self.out_dir = Path(out_dir)
+        self.doc_types = set(doc_types)
+        self.document_format = document_format
+        self.inquiry_concurrency = inquiry_concurrency
+        self.download_concurrency = download_concurrency
+        self.write_concurrency = write_concurrency
+        self.queue_size = queue_size
+        self.collapse_families = collapse_families
+        self.priority = priority
+        self.on_progress = on_progress
+        self.stats = HarvestStats()
+        self._done: Set[str] = set()
+        self._manifest_lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.out_dir / self.MANIFEST_NAME
+
+    async def run(self, cql: str) -> HarvestStats:
+        """Harvests all documents for a query and returns the final stats."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._done = self._load_manifest()
+        self.stats = HarvestStats()
+        
+        patents: asyncio.Queue[Optional[Patent]] = asyncio.Queue(self.queue_size)
+        documents: asyncio.Queue[Optional[Tuple[Patent, Document]]] = asyncio.Queue(self.queue_size)
+        contents: asyncio.Queue[Optional[Tuple[Patent, Document, bytes]]] = asyncio.Queue(self.queue_size)
+        
+        async def _stage(workers: int, worker: Callable[[], Any], downstream: Optional['asyncio.Queue[Any]'], downstream_workers: int) -> None:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+            if downstream is not None:
+                for _ in range(downstream_workers):
+                    await downstream.put(None)
+                    
+        async def _search() -> None:
+            async for patent in self.client.search.iter_patents(cql, collapse_families=self.collapse_families):
+                self.stats.patents += 1
+                await patents.put(patent)
+                
+        async def _inquire() -> None:
+            while (patent := await patents.get()) is not None:
+                try:
+                    docs = await patent.get_documents()
+                except QuotaExceeded:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Document inquiry failed for {patent.number}: {e}")
+                    self.stats.failed += 1
+                    continue
+                for doc in docs:
+                    if doc.description not in self.doc_types:
+                        continue
+                    if self._key(patent, doc) in self._done:
+                        self.stats.skipped += 1
+                        continue
+                    await documents.put((patent, doc))
+                    
+        async def _download() -> None:
+            while (item := await documents.get()) is not None:
+                patent, doc = item
+                try:
+                    content = await doc.download(document_format=self.document_format)
+                except QuotaExceeded:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Download of {self._key(patent, doc)} failed: {e}")
+                    self.stats.failed += 1
+                    continue
+                await contents.put((patent, doc, content))
+                
+        async def _write() -> None:
+            while (item := await contents.get()) is not None:
+                patent, doc, content = item
+                await asyncio.to_thread(self._write, patent, doc, content)
+                self._done.add(self._key(patent, doc))
+                self.stats.documents += 1
+                self.stats.bytes += len(content)
+                if self.on_progress is not None:
+                    self.on_progress(self.stats)
+                
+        # A failing stage cancels the others instead of leaving them blocked on a queue
+        # Running out of quota budget stops the whole harvest
+        try:
+            with self.client.priority(self.priority):
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(_stage(1, _search, patents, self.inquiry_concurrency))
+                    tg.create_task(_stage(self.inquiry_concurrency, _inquire, documents, self.download_concurrency))
+                    tg.create_task(_stage(self.download_concurrency, _download, contents, self.write_concurrency))
+                    tg.create_task(_stage(self.write_concurrency, _write, None, 0))
+        except ExceptionGroup as eg:
+            # Surface the failure itself rather than the task group wrapper
+            raise eg.exceptions[0]
+        return self.stats
+
+    def _key(self, patent: Patent, doc: Document) -> str:
+        return f"{patent.number}/{doc.description}"
+
+    def _load_manifest(self) -> Set[str]:
+        if not self.manifest_path.exists():
+            return set()
+        done: Set[str] = set()
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    done.add(str(json.loads(line)["key"]))
+        return done
+
+    def _write(self, patent: Patent, doc: Document, content: bytes) -> None:
+        """Writes a document file and records it in the manifest (runs in a worker thread)."""
+        document_format = self.document_format or (doc.formats[0] if doc.formats else "application/pdf")
+        extension = _EXTENSIONS.get(document_format, "bin")
+        path = self.out_dir / f"{patent.number}_{doc.description}.{extension}"
+        
+        tmp_path = path.with_name(path.name + ".part")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        
+        line = json.dumps({"key": self._key(patent, doc), "path": path.name, "bytes": len(content)})
+        with self._manifest_lock, open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
@@ -0,0 +1,210 @@
+import bisect
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Event:
+    """
+    A measurement reported by the client.
+
+    Kinds:
+        request: One OPS call (name is the endpoint family). Attributes: method, path,
+                 priority, status, bytes, token_time, queue_time, network_time, error.
+        parse: XML to dict conversion of a response body.
+        validate: Building the pydantic models of a response.
+        retry: A page download being retried (attributes: attempt, error, wait).
+        cache: A cache lookup (name is the cache, attribute hit).
+        throttle: Quota/throttle headers (name is the throttle state, e.g. "busy").
+                  Attributes: state (the same), services, hourly_used, weekly_used.
+    """
+    kind: str
+    name: str
+    duration: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=lambda: {})
+    timestamp: float = field(default_factory=time.time)
+
+Hook = Callable[[Event], None]
+
+def endpoint_family(path: str) -> str:
+    """Groups request paths into endpoint families, e.g. "search" or "retrieval:biblio"."""
+    path = path.lstrip("/").split("?", 1)[0]
+    if path.startswith("published-data/search"):
+        return "search"
+    if path.startswith("published-data/images"):
+        return "images"
+    if path.startswith("published-data/"):
+        return f"retrieval:{path.rsplit('/', 1)[-1]}"
+    if path.startswith("http"):
+        return "auth" if "/auth/" in path else "external"
+    return path.split("/", 1)[0] or "root"
+
+class Instrumentation:
+    """
+    Event hub of a client. Hooks are called synchronously for every event; without
+    hooks nothing is measured beyond a couple of clock reads.
+    """
+    
+    def __init__(self) -> None:
+        self.hooks: List[Hook] = []
+
+    def add_hook(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hooks)
+
+    def emit(self, kind: str, name: str, duration: Optional[float] = None, **attributes: Any) -> None:
+        if not self.hooks:
+            return
+        event = Event(kind=kind, name=name, duration=duration, attributes=attributes)
+        for hook in list(self.hooks):
+            try:
+                hook(event)
+            except Exception:
+                # A broken hook must never break the request it observes
+                logger.exception(f"Instrumentation hook {hook!r} failed")
+
+    @contextmanager
+    def measure(self, kind: str, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Times the block and emits one event; the yielded dict can add attributes."""
+        start = time.perf_counter()
+        extra: Dict[str, Any] = dict(attributes)
+        try:
+            yield extra
+        except BaseException as e:
+            extra.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            self.emit(kind, name, time.perf_counter() - start, **extra)
+
+    def enable_stats(self) -> 'StatsCollector':
+        """Registers and returns a new StatsCollector."""
+        stats = StatsCollector()
+        self.add_hook(stats)
+        return stats
+
+# Histogram bucket upper bounds in seconds
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+@dataclass
+class Histogram:
+    """Latency histogram with fixed buckets plus a window of recent samples for percentiles."""
+    count: int = 0
+    total: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(BUCKETS))
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+        self.recent.append(value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Percentile (0-100) over the recent samples."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+class StatsCollector:
+    """
+    In-process hook aggregating events: latency histograms per (kind, name), request
+    status counts, bytes transferred, cache hit rates and the last throttle state.
+    """
+    
+    def __init__(self) -> None:
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.status_counts: Dict[Tuple[str, int], int] = {}
+        self.errors: Dict[str, int] = {}
+        self.bytes: Dict[str, int] = {}
+        self.retries = 0
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self.throttle: Dict[str, Any] = {}
+
+    def __call__(self, event: Event) -> None:
+        if event.duration is not None:
+            self.histograms.setdefault((event.kind, event.name), Histogram()).observe(event.duration)
+        attrs = event.attributes
+        if event.kind == "request":
+            status = attrs.get("status")
+            if status is not None:
+                key = (event.name, int(status))
+                self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if attrs.get("error"):
+                self.errors[event.name] = self.errors.get(event.name, 0) + 1
+            self.bytes[event.name] = self.bytes.get(event.name, 0) + int(attrs.get("bytes") or 0)
+        elif event.kind == "retry":
+            self.retries += 1
+        elif event.kind == "cache":
+            target = self.cache_hits if attrs.get("hit") else self.cache_misses
+            target[event.name] = target.get(event.name, 0) + 1
+        elif event.kind == "throttle":
+            self.throttle = dict(attrs)
+
+    def hit_rate(self, cache: str) -> Optional[float]:
+        hits = self.cache_hits.get(cache, 0)
+        total = hits + self.cache_misses.get(cache, 0)
+        return hits / total if total else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain-dict snapshot, e.g. for logging or a metrics endpoint."""
+        return {
+            "latency": {
+                f"{kind}:{name}": {
+                    "count": h.count,
+                    "mean": h.mean,
+                    "p50": h.percentile(50),
+                    "p95": h.percentile(95),
+                    "p99": h.percentile(99),
+                }
+                for (kind, name), h in sorted(self.histograms.items())
+            },
+            "status": {f"{name}:{status}": n for (name, status), n in sorted(self.status_counts.items())},
+            "errors": dict(self.errors),
+            "bytes": dict(self.bytes),
+            "retries": self.retries,
+            "cache_hit_rate": {name: self.hit_rate(name) for name in sorted(set(self.cache_hits) | set(self.cache_misses))},
+            "throttle": dict(self.throttle),
+        }
+
+class OpenTelemetryHook:
+    """
+    Emits every timed event as an OpenTelemetry span (``epopy.<kind>``). Requires the
+    optional ``opentelemetry-api`` package.
+    """
+    
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as e:
+                raise ImportError("OpenTelemetryHook requires the 'opentelemetry-api' package") from e
+            tracer = trace.get_tracer("epopy")
+        self.tracer = tracer
+
+    def __call__(self, event: Event) -> None:
+        if event.duration is None:
+            return
+        end_ns = int(event.timestamp * 1e9)
+        start_ns = end_ns - int(event.duration * 1e9)
+        attributes: Dict[str, Any] = {"epopy.name": event.name}
+        attributes.update({f"epopy.{k}": v for k, v in event.attributes.items() if isinstance(v, (str, int, float, bool))})
+        span = self.tracer.start_span(f"epopy.{event.kind}", start_time=start_ns, attributes=attributes)
+        span.end(end_time=end_ns)
@@ -0,0 +1,97 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# Number part may carry a letter prefix (e.g. US reissues "RE12345", designs "D123456")
+_COMPACT = re.compile(r"^([A-Z]{2})([A-Z]{0,2}\d+)([A-Z]\d?)?$")
+# Original WO publication numbers: "WO 2020/123456", "WO 99/12345"
+_WO_ORIGINAL = re.compile(r"^WO(\d{2}|\d{4})/(\d+)([A-Z]\d?)?$")
+# Original US pre-grant publications: "US 2020/0123456 A1", year and 7-digit serial
+_US_ORIGINAL = re.compile(r"^US(\d{4})/(\d+)([A-Z]\d?)?$")
+
+@dataclass(frozen=True)
+class PatentNumber:
+    """A parsed patent number: country code, number and optional kind code."""
+    country: str
+    number: str
+    kind: Optional[str] = None
+
+    @property
+    def docdb(self) -> str:
+        """DOCDB format, e.g. "EP.1234567.A1" (or "EP.1234567" without kind)."""
+        return f"{self.country}.{self.number}.{self.kind}" if self.kind else f"{self.country}.{self.number}"
+
+    @property
+    def epodoc(self) -> str:
+        """EPODOC format, e.g. "EP1234567"."""
+        return f"{self.country}{self.number}"
+
+    def format(self, input_format: str) -> str:
+        """The number in the given OPS input format ("docdb" or "epodoc")."""
+        if input_format == "docdb":
+            return self.docdb
+        if input_format == "epodoc":
+            return self.epodoc
+        raise ValueError(f"Cannot format numbers as '{input_format}' locally")
+
+    def __str__(self) -> str:
+        return self.docdb
+
+def _pad(country: str, number: str) -> str:
+    """Applies the zero-padding rules of the DOCDB/EPODOC formats."""
+    if country == "EP" and number.isdigit():
+        return number.zfill(7)
+    if country == "US" and number.isdigit() and len(number) == 11 and number[4] == "0":
+        # US pre-grant publications are year plus a 6-digit serial (US.2020123456.A1),
+        # the original 7-digit serial loses its leading zero
+        return number[:4] + number[5:]
+    return number
+
+@lru_cache(maxsize=65536)
+def parse_number(raw: str) -> PatentNumber:
+    """
+    Parses a publication number in docdb ("EP.1234567.A1"), epodoc ("EP1234567",
+    "EP1234567A1") or common original notations ("EP 1 234 567 A1", "WO 2020/123456",
+    "US 2020/0123456 A1"). Results are memoized.
+
+    Raises:
+        ValueError: If the number is not recognised.
+    """
+    cleaned = re.sub(r"[\s,-]", "", raw.upper())
+    
+    if "." in cleaned:
+        parts = cleaned.split(".")
+        if len(parts) >= 2 and re.fullmatch(r"[A-Z]{2}", parts[0]) and parts[1]:
+            kind = parts[2] if len(parts) > 2 and parts[2] else None
+            return PatentNumber(parts[0], _pad(parts[0], parts[1]), kind)
+        raise ValueError(f"Invalid docdb number: {raw!r}")
+        
+    match = _WO_ORIGINAL.match(cleaned)
+    if match:
+        year, serial = match.group(1), match.group(2)
+        if len(year) == 4:
+            return PatentNumber("WO", f"{year}{serial.zfill(6)}", match.group(3))
+        return PatentNumber("WO", f"{year}{serial.zfill(5)}", match.group(3))
+        
+    match = _US_ORIGINAL.match(cleaned)
+    if match:
+        return PatentNumber("US", _pad("US", f"{match.group(1)}{match.group(2).zfill(7)}"), match.group(3))
+        
+    match = _COMPACT.match(cleaned)
+    if match:
+        country = match.group(1)
+        return PatentNumber(country, _pad(country, match.group(2)), match.group(3))
+        
+    raise ValueError(f"Invalid patent number: {raw!r}")
+
+@lru_cache(maxsize=65536)
+def normalize_number(raw: str, input_format: str = "docdb") -> str:
+    """
+    Canonical form of a number in the given format, suitable as a cache key.
+    Numbers that cannot be parsed are returned stripped but otherwise unchanged.
+    """
+    try:
+        return parse_number(raw).format(input_format)
+    except ValueError:
+        return raw.strip()
@@ -1,11 +1,38 @@
-from typing import List, Optional, Any, Dict, TYPE_CHECKING, cast
+import asyncio
+from contextlib import aclosing, nullcontext
+from functools import cache
+from types import ModuleType
+from typing import AsyncIterator, ContextManager, FrozenSet, Iterable, List, Optional, Any, Dict, Literal, Sequence, Tuple, TYPE_CHECKING, cast, overload
+from . import deadlines
+from .numbers import PatentNumber, normalize_number, parse_number
 
 if TYPE_CHECKING:
     from .client import AsyncClient
+    from .models import OPSResponse
+    from .api.retrieval import FulltextSection, Paragraph
+
+@cache
+def _pypdf() -> ModuleType:
+    """The pypdf module, only needed to merge pages; imported on first use."""
+    import pypdf
+    return pypdf
+
+def _priority_scope(client: 'AsyncClient', priority: Optional[str]) -> ContextManager[None]:
+    """Sets the client's priority class for the block, if one is given."""
+    return client.priority(priority) if priority else nullcontext()
+
+PublishedDataPart = Literal["biblio", "abstract", "full-cycle", "claims", "description", "fulltext", "images"]
 
 class Document:
     """Represents a document/image variant associated with a patent."""
     
+    # Seconds to wait after each page request when downloading page by page
+    PAGE_DELAY = 2.0
+    # Base of the exponential back-off between page retries, and the pause after a
+    # RobotDetected (fair use) block
+    RETRY_DELAY = 2.0
+    ROBOT_DELAY = 60.0
+    
     def __init__(
         self, 
         client: 'AsyncClient',
@@ -13,7 +40,8 @@ class Document:
         link: str,
         formats: List[str],
         number_of_pages: Optional[int] = None,
-        sections: Optional[List[Dict[str, Any]]] = None
+        sections: Optional[List[Dict[str, Any]]] = None,
+        priority: Optional[str] = None
     ):
         """
         Initialize a Document instance.
@@ -25,6 +53,8 @@ class Document:
             formats: List of available formats (e.g., ['application/pdf', 'image/tiff']).
             number_of_pages: Total number of pages in the document.
             sections: Optional list of specific sections within the document.
+            priority: Priority class for this document's requests (e.g. 'bulk').
+                      None uses the priority of the calling context.
         """
         self.client = client
         self.description = description
@@ -32,6 +62,7 @@ class Document:
         self.formats = formats
         self.number_of_pages = number_of_pages
         self.sections = sections or []
+        self.priority = priority
 
     @property
     def name(self) -> str:
@@ -43,7 +74,13 @@ class Document:
         """Heuristic type based on description."""
         return self.description.lower()
 
-    async def download(self, document_format: Optional[str] = None, range_position: Optional[int | str] = None) -> bytes:
+    async def download(
+        self,
+        document_format: Optional[str] = None,
+        range_position: Optional[int | str] = None,
+        use_store: bool = True,
+        deadline: Optional[float] = None
+    ) -> bytes:
         """
         Download the document content.
         
@@ -52,59 +89,26 @@ class Document:
                            If None, uses the first available format.
             range_position: The page range/position to download. 
                           If None, defaults to "1-{number_of_pages}" if known, else "1".
+            use_store: Go through the client's blob store, if one is configured.
+            deadline: Seconds the whole download (all pages, retries and waits) may
+                      take before it fails with ``DeadlineExceeded``. An enclosing
+                      ``client.deadline()`` applies as well.
         """
+        with _priority_scope(self.client, self.priority):
+            if deadline is None:
+                return await self._download(document_format, range_position, use_store)
+            async with deadlines.deadline(deadline):
+                return await self._download(document_format, range_position, use_store)
+
+    async def _download(self, document_format: Optional[str], range_position: Optional[int | str], use_store: bool) -> bytes:
         if not document_format:
             document_format = self.formats[0] if self.formats else "application/pdf"
             
         # Case 1: Loop and Merge if full document requested and we have > 1 pages
         if range_position is None and self.number_of_pages and self.number_of_pages > 1 and "pdf" in document_format.lower():
-            import asyncio
-            from io import BytesIO
-            from pypdf import PdfWriter, PdfReader
-            
             # Sequential download with small delay and retries to avoid 403 Forbidden
-            pages_content: List[bytes] = []
-            for i in range(1, self.number_of_pages + 1):
-                # Basic retry logic for transient errors or rate limits
-                last_exc = None
-                for attempt in range(3):
-                    try:
-                        page_bytes: bytes = await self.client.published_data.download_image(
-                            self.link, 
-                            range_position=i,
-                            document_format=document_format  # type: ignore
-                        )
-                        pages_content.append(page_bytes)
-                        break
-                    except Exception as e:
-                        last_exc = e
-                        # If we hit RobotDetected, we need a LONG wait
-                        wait_time = 2 ** (attempt + 1)
-                        if "RobotDetected" in str(e):
-                            # Fair use block usually requires a significant pause
-                            wait_time = 60 
-                        
-                        import asyncio
-                        await asyncio.sleep(wait_time)
-                else:
-                    if last_exc:
-                        raise last_exc
-                
-                # Base delay to respect Fair Use Policy
-                await asyncio.sleep(2.0)
-            
-            # Merge
-            merger = PdfWriter()
-            for page_bytes in pages_content:
-                try:
-                    merger.append(PdfReader(BytesIO(page_bytes)))
-                except Exception:
-                    # Skip corrupt/empty pages to keep the final doc readable
-                    pass
-            
-            output = BytesIO()
-            merger.write(output)
-            return output.getvalue()
+            pages_content = await self.download_pages(range(1, self.number_of_pages + 1), document_format, use_store=use_store)
+            return self._merge_pdf(pages_content)
 
         # Case 2: Standard single request (default or specific range)
         # Determine range
@@ -115,9 +119,158 @@ class Document:
         return await self.client.published_data.download_image(
             self.link, 
             range_position=final_range, 
-            document_format=document_format
+            document_format=document_format,
+            use_store=use_store
         )
 
+    def section_pages(self, name: str) -> List[int]:
+        """
+        Page numbers covered by a section (e.g. "DRAWINGS", "CLAIMS").
+
+        A section runs from its start page up to the page before the next section
+        with a higher start page, or to the last page of the document.
+        """
+        starts: List[Tuple[str, int]] = []
+        for section in self.sections:
+            start_page = section.get("@start-page")
+            if section.get("@name") and start_page:
+                starts.append((str(section["@name"]).upper(), int(start_page)))
+                
+        start = next((page for section_name, page in starts if section_name == name.upper()), None)
+        if start is None:
+            available = ", ".join(sorted({section_name for section_name, _ in starts})) or "none"
+            raise ValueError(f"Document has no section '{name}' (available: {available})")
+            
+        later = [page for _, page in starts if page > start]
+        end = min(later) - 1 if later else (self.number_of_pages or start)
+        return list(range(start, end + 1))
+
+    async def download_section(self, name: str, document_format: Optional[str] = None, concurrency: int = 4) -> bytes:
+        """
+        Download only the pages of one section (e.g. "DRAWINGS"), see ``download_sections``.
+        """
+        return await self.download_sections([name], document_format=document_format, concurrency=concurrency)
+
+    async def download_sections(self, names: Sequence[str], document_format: Optional[str] = None, concurrency: int = 4) -> bytes:
+        """
+        Download only the pages of the given sections and merge them into one PDF.
+
+        Page ranges are derived from the ``ops:document-section`` metadata, pages are
+        fetched concurrently (at most ``concurrency`` at a time) and each page is
+        fetched once even when sections overlap.
+        
+        Args:
+            names: Section names (e.g. ["CLAIMS", "DRAWINGS"]).
+            document_format: Override the format, must be a PDF format.
+            concurrency: Maximum number of page requests in flight.
+        """
+        if not document_format:
+            document_format = self.formats[0] if self.formats else "application/pdf"
+        if "pdf" not in document_format.lower():
+            raise ValueError("Section downloads are merged into a PDF; use download_pages for other formats")
+            
+        pages = sorted({page for name in names for page in self.section_pages(name)})
+        pages_content = await self.download_pages(pages, document_format, concurrency=concurrency)
+        if len(pages_content) == 1:
+            return pages_content[0]
+        return self._merge_pdf(pages_content)
+
+    async def download_pages(
+        self,
+        pages: Iterable[int],
+        document_format: str,
+        concurrency: int = 1,
+        use_store: bool = True
+    ) -> List[bytes]:
+        """
+        Download single pages, returned in the order given.
+
+        Each worker waits ``PAGE_DELAY`` seconds after a page while more pages are
+        waiting, to respect the Fair Use Policy; with the default concurrency of 1
+        pages are fetched sequentially. If a page fails for good (or a deadline
+        passes) the remaining page fetches are cancelled.
+
+        Raises:
+            httpx.HTTPStatusError: A page failed for good; the error of the first
+                                   failing page is raised as is, not wrapped in an
+                                   ``ExceptionGroup``.
+        """
+        page_list = list(pages)
+        results: Dict[int, bytes] = {}
+        semaphore = asyncio.Semaphore(concurrency)
+        unstarted = len(page_list)
+        
+        async def _fetch(page: int) -> None:
+            nonlocal unstarted
+            async with semaphore:
+                unstarted -= 1
+                results[page] = await self._download_page(page, document_format, use_store)
+                if unstarted:
+                    # Base delay to respect Fair Use Policy
+                    await deadlines.sleep(self.PAGE_DELAY)
+                
+        with _priority_scope(self.client, self.priority):
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for page in page_list:
+                        tg.create_task(_fetch(page))
+            except ExceptionGroup as eg:
+                # Surface the failure itself rather than the task group wrapper
+                error: BaseException = eg
+                while isinstance(error, BaseExceptionGroup):
+                    error = error.exceptions[0]
+                raise error
+        return [results[page] for page in page_list]
+
+    async def _download_page(self, page: int, document_format: str, use_store: bool = True) -> bytes:
+        """Downloads one page, retrying transient errors and rate limits."""
+        # Basic retry logic for transient errors or rate limits
+        last_exc: Optional[Exception] = None
+        attempts = 3
+        for attempt in range(attempts):
+            try:
+                return await self.client.published_data.download_image(
+                    self.link, 
+                    range_position=page,
+                    document_format=document_format,
+                    use_store=use_store
+                )
+            except deadlines.DeadlineExceeded:
+                raise
+            except Exception as e:
+                last_exc = e
+                if attempt == attempts - 1:
+                    break
+                # If we hit RobotDetected, we need a LONG wait
+                wait_time = self.RETRY_DELAY * 2 ** attempt
+                if "RobotDetected" in str(e):
+                    # Fair use block usually requires a significant pause
+                    wait_time = self.ROBOT_DELAY
+                self.client.instrumentation.emit(
+                    "retry", "images", attempt=attempt + 1, error=type(e).__name__, wait=wait_time
+                )
+                # Fails right away if the wait would overrun a deadline
+                await deadlines.sleep(wait_time)
+        assert last_exc is not None
+        raise last_exc
+
+    def _merge_pdf(self, pages_content: List[bytes]) -> bytes:
+        """Merges single-page PDFs into one document."""
+        from io import BytesIO
+        pypdf = _pypdf()
+        
+        merger = pypdf.PdfWriter()
+        for page_bytes in pages_content:
+            try:
+                merger.append(pypdf.PdfReader(BytesIO(page_bytes)))
+            except Exception:
+                # Skip corrupt/empty pages to keep the final doc readable
+                pass
+        
+        output = BytesIO()
+        merger.write(output)
+        return output.getvalue()
+
     def __repr__(self) -> str:
         """Return a string representation of the Document."""
         return f"<Document name='{self.name}' pages={self.number_of_pages}>"
@@ -125,7 +278,16 @@ class Document:
 class Patent:
     """High-level abstraction for a Patent."""
     
-    def __init__(self, client: 'AsyncClient', number: str, format: str = "docdb", type: str = "publication"):
+    def __init__(
+        self,
+        client: 'AsyncClient',
+        number: str,
+        format: str = "docdb",
+        type: str = "publication",
+        family_id: Optional[str] = None,
+        normalize: bool = False,
+        priority: Optional[str] = None
+    ):
         """
         Initialize a Patent instance.
 
@@ -134,31 +296,140 @@ class Patent:
             number: The patent number (e.g., 'EP1234567').
             format: The number format ('docdb', 'epodoc', 'original').
             type: The reference type ('publication', 'application', 'priority').
+            family_id: The DOCDB simple family id, when known (e.g. from search results).
+            normalize: Rewrite a free-form number (e.g. 'EP 1234567 A1') into the
+                       canonical docdb/epodoc form before any request is made.
+            priority: Priority class for this patent's requests, inherited by its
+                      documents. None uses the priority of the calling context.
         """
         self.client = client
+        if normalize and format in ("docdb", "epodoc"):
+            number = parse_number(number).format(format)
         self.number = number
         self.format = format
         self.type = type
-        self._biblio: Optional[Dict[str, Any]] = None
+        self.family_id = family_id
+        self.priority = priority
+        # Memoized published-data responses, keyed by endpoint
+        self._data: Dict[str, 'OPSResponse'] = {}
+        # Requests in flight, shared by concurrent calls for the same endpoint
+        self._pending: Dict[str, 'asyncio.Task[OPSResponse]'] = {}
+        self._documents: Optional[List[Document]] = None
 
-    async def get_documents(self) -> List[Document]:
-        """Fetch all available document instances for this patent."""
-        await self.client.published_data.published_data(
+    @property
+    def parsed(self) -> Optional[PatentNumber]:
+        """The parsed number (country, number, kind), or None if it is not recognised."""
+        try:
+            return parse_number(self.number)
+        except ValueError:
+            return None
+
+    @property
+    def key(self) -> str:
+        """Canonical docdb form of the number, usable as a cache or dedup key."""
+        return normalize_number(self.number, "docdb")
+
+    async def published_data(self, endpoint: PublishedDataPart = "biblio") -> 'OPSResponse':
+        """
+        Retrieve a published-data endpoint for this patent. The response is memoized,
+        so repeated calls (or a previous ``prefetch``) do not hit the API again, and
+        concurrent calls share the request in flight. Cancelling one caller, or its
+        deadline passing, does not cancel the request for the others.
+        """
+        cached = self._data.get(endpoint)
+        self.client.instrumentation.emit("cache", "patent", hit=cached is not None)
+        if cached is not None:
+            return cached
+        task = self._pending.get(endpoint)
+        if task is None:
+            # The request is shared, so it runs without the first caller's deadline;
+            # every caller's deadline applies to its own wait below
+            with _priority_scope(self.client, self.priority):
+                task = asyncio.create_task(self._fetch_published_data(endpoint), context=deadlines.detached_context())
+            self._pending[endpoint] = task
+            task.add_done_callback(lambda done: self._request_done(endpoint, done))
+        return await asyncio.shield(task)
+
+    async def _fetch_published_data(self, endpoint: PublishedDataPart) -> 'OPSResponse':
+        response = await self.client.published_data.published_data(
             reference_type=self.type, # type: ignore
             input_format=self.format, # type: ignore
             number=self.number,
-            endpoint="images"
+            endpoint=endpoint
         )
-        
-        # We need the raw data to extract document instances easily or update models
-        # For now, let's use the raw data from client to build Document objects
-        # as the models are still evolving.
-        data = await self.client.get_data(
-            f"/published-data/{self.type}/{self.format}/{self.number}/images"
+        self._data[endpoint] = response
+        return response
+
+    def _request_done(self, endpoint: str, task: 'asyncio.Task[OPSResponse]') -> None:
+        """Forgets a finished request; a failed one is retried by the next call."""
+        self._pending.pop(endpoint, None)
+        if not task.cancelled():
+            # Retrieve the error, in case every caller was cancelled meanwhile
+            task.exception()
+
+    async def biblio(self) -> 'OPSResponse':
+        """Bibliographic data (memoized)."""
+        return await self.published_data("biblio")
+
+    async def abstract(self) -> 'OPSResponse':
+        """Abstract (memoized)."""
+        return await self.published_data("abstract")
+
+    async def full_cycle(self) -> 'OPSResponse':
+        """Full-cycle data (memoized)."""
+        return await self.published_data("full-cycle")
+
+    async def claims(self) -> 'OPSResponse':
+        """Claims (memoized)."""
+        return await self.published_data("claims")
+
+    async def description(self) -> 'OPSResponse':
+        """Description (memoized)."""
+        return await self.published_data("description")
+
+    async def fulltext_sections(self) -> FrozenSet[str]:
+        """
+        Fulltext sections ("claims", "description") OPS has for this publication.
+        The answer is cached by the retrieval service, see ``fulltext_availability``.
+        """
+        if self.type != "publication":
+            raise ValueError("Fulltext is only available for publications")
+        with _priority_scope(self.client, self.priority):
+            available = await self.client.published_data.fulltext_availability(
+                self.format, [self.number] # type: ignore
+            )
+        return available[self.number]
+
+    async def paragraphs(self, section: 'FulltextSection') -> AsyncIterator['Paragraph']:
+        """
+        Stream the claims or description as plain-text paragraphs, see
+        ``RetrievalService.stream_paragraphs``. Yields nothing, without requesting the
+        section, when OPS has no such fulltext for this publication.
+        """
+        if section not in await self.fulltext_sections():
+            return
+        stream = self.client.published_data.stream_paragraphs(
+            self.format, self.number, section, priority=self.priority # type: ignore
         )
-        
-        root = data.get("ops:world-patent-data", {})
-        doc_inquiry = root.get("ops:document-inquiry", {})
+        async with aclosing(stream):
+            async for paragraph in stream:
+                yield paragraph
+
+    async def get_documents(self) -> List[Document]:
+        """
+        Fetch all available document instances for this patent.
+        The images inquiry is requested once and the parsed list is cached.
+        """
+        if self._documents is None:
+            response = await self.published_data("images")
+            self._documents = self._parse_documents(response)
+        return self._documents
+
+    def _parse_documents(self, response: 'OPSResponse') -> List[Document]:
+        """Builds Document objects from an images inquiry response."""
+        # The document inquiry is not modelled explicitly, it is kept as an extra field
+        extra = response.world_patent_data.model_extra or {}
+        doc_inquiry = cast(Dict[str, Any], extra.get("ops:document-inquiry") or {})
         inquiry_res = doc_inquiry.get("ops:inquiry-result", {})
         instances = cast(List[Dict[str, Any]], inquiry_res.get("ops:document-instance", []))
         
@@ -184,9 +455,111 @@ class Patent:
                 link=cast(str, inst.get("@link")),
                 formats=cast(List[str], formats),
                 number_of_pages=int(cast(str, inst.get("@number-of-pages"))) if inst.get("@number-of-pages") else None,
-                sections=sections
+                sections=sections,
+                priority=self.priority
             ))
         return docs
 
     def __repr__(self) -> str:
         return f"<Patent number='{self.number}'>"
+
+
+@overload
+async def get_documents_many(
+    patents: Iterable[Patent], concurrency: int = 8, return_exceptions: Literal[False] = False
+) -> List[List[Document]]: ...
+
+@overload
+async def get_documents_many(
+    patents: Iterable[Patent], concurrency: int = 8, *, return_exceptions: Literal[True]
+) -> List[List[Document] | Exception]: ...
+
+async def get_documents_many(
+    patents: Iterable[Patent], concurrency: int = 8, return_exceptions: bool = False
+) -> List[List[Document]] | List[List[Document] | Exception]:
+    """
+    List the document instances of many patents concurrently.
+
+    OPS has no multi-number images inquiry, so this runs one inquiry per patent with at
+    most ``concurrency`` in flight. Results are cached on each Patent. A failing
+    inquiry does not stop the others: every patent is tried, so after an error a
+    second call only repeats the inquiries that failed.
+
+    Args:
+        patents: The patents to list the documents of.
+        concurrency: Maximum number of inquiries in flight.
+        return_exceptions: Put the error of a failed inquiry in its patent's place
+                           instead of raising it, like ``asyncio.gather``.
+    
+    Returns:
+        The document lists, in the order of the given patents.
+
+    Raises:
+        Exception: The error of the first failed patent, unless ``return_exceptions``
+                   is set.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _fetch(patent: Patent) -> List[Document] | Exception:
+        async with semaphore:
+            try:
+                return await patent.get_documents()
+            except Exception as e:
+                return e
+            
+    results = list(await asyncio.gather(*(_fetch(p) for p in patents)))
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+async def prefetch(
+    patents: Iterable[Patent],
+    parts: Sequence[PublishedDataPart] = ("biblio",),
+    concurrency: int = 4
+) -> None:
+    """
+    Fill the memoized published data of many patents at once.
+
+    Parts that OPS can serve for several numbers per request (biblio, abstract,
+    full-cycle) are fetched in batches of 100; the others are fetched one request per
+    patent with at most ``concurrency`` requests in flight.
+    
+    Args:
+        patents: The patents to prefetch.
+        parts: The published-data endpoints to fill.
+        concurrency: Maximum number of requests in flight per part.
+    """
+    from .api.retrieval import BATCH_ENDPOINTS
+    patent_list = list(patents)
+    
+    for part in parts:
+        pending = [p for p in patent_list if part not in p._data]
+        if not pending:
+            continue
+            
+        if part in BATCH_ENDPOINTS:
+            groups: Dict[Tuple[int, str, str], List[Patent]] = {}
+            for patent in pending:
+                groups.setdefault((id(patent.client), patent.type, patent.format), []).append(patent)
+            for (_, ref_type, fmt), group in groups.items():
+                responses = await group[0].client.published_data.published_data_many(
+                    ref_type, # type: ignore
+                    fmt, # type: ignore
+                    [p.number for p in group],
+                    endpoint=part, # type: ignore
+                    concurrency=concurrency
+                )
+                for patent in group:
+                    response = responses.get(patent.number)
+                    if response is not None:
+                        patent._data[part] = response
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def _fetch(patent: Patent) -> None:
+                async with semaphore:
+                    await patent.published_data(part)
+                    
+            await asyncio.gather(*(_fetch(p) for p in pending))
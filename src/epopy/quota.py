@@ -0,0 +1,141 @@
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Literal, Mapping, Optional, Tuple
+from . import deadlines
+
+logger = logging.getLogger(__name__)
+
+# Free ("non-paying") OPS accounts may retrieve 4 GB per week
+DEFAULT_WEEKLY_LIMIT = 4 * 1024 ** 3
+
+class QuotaExceeded(Exception):
+    """Raised when a request is refused because its priority class is over budget."""
+    pass
+
+@dataclass
+class QuotaUsage:
+    """Usage counters as last reported by OPS."""
+    hourly_used: Optional[int] = None
+    weekly_used: Optional[int] = None
+    # Overall throttle state ("idle", "busy", "overloaded") and per-service
+    # (color, requests per minute) from X-Throttling-Control
+    throttle_state: Optional[str] = None
+    services: Dict[str, Tuple[str, int]] = field(default_factory=lambda: {})
+    updated_at: Optional[float] = None
+
+@dataclass
+class Budget:
+    """Share of the hourly/weekly quota a priority class may use."""
+    hourly: Optional[float] = None
+    weekly: Optional[float] = None
+    action: Literal["refuse", "delay"] = "refuse"
+    delay: float = 300.0
+
+class QuotaTracker:
+    """
+    Tracks the quota usage OPS reports in response headers and enforces budgets.
+
+    A budget limits a priority class (e.g. "bulk") to a fraction of the hourly or
+    weekly quota. Once usage reaches it, requests of that class are refused with
+    ``QuotaExceeded`` or delayed, while other classes keep going.
+    """
+    HOURLY_HEADER = "X-IndividualQuotaPerHour-Used"
+    WEEKLY_HEADER = "X-RegisteredQuotaPerWeek-Used"
+    THROTTLING_HEADER = "X-Throttling-Control"
+    
+    def __init__(self, hourly_limit: Optional[int] = None, weekly_limit: Optional[int] = DEFAULT_WEEKLY_LIMIT):
+        """
+        Args:
+            hourly_limit: Hourly quota in bytes, needed for hourly budgets.
+            weekly_limit: Weekly quota in bytes, needed for weekly budgets.
+        """
+        self.hourly_limit = hourly_limit
+        self.weekly_limit = weekly_limit
+        self.usage = QuotaUsage()
+        self.budgets: Dict[str, Budget] = {}
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Updates the counters from the headers of an OPS response."""
+        hourly = headers.get(self.HOURLY_HEADER)
+        weekly = headers.get(self.WEEKLY_HEADER)
+        throttling = headers.get(self.THROTTLING_HEADER)
+        if hourly is None and weekly is None and throttling is None:
+            return
+        if hourly is not None and hourly.strip().isdigit():
+            self.usage.hourly_used = int(hourly)
+        if weekly is not None and weekly.strip().isdigit():
+            self.usage.weekly_used = int(weekly)
+        if throttling:
+            self._parse_throttling(throttling)
+        self.usage.updated_at = time.time()
+
+    def _parse_throttling(self, value: str) -> None:
+        # e.g. "busy (images=green:100, inpadoc=yellow:45, other=green:1000, retrieval=green:200, search=green:30)"
+        state = value.split("(", 1)[0].strip()
+        self.usage.throttle_state = state or None
+        for service, color, limit in re.findall(r"([\w-]+)=(\w+):(\d+)", value):
+            self.usage.services[service] = (color, int(limit))
+
+    @property
+    def hourly_fraction(self) -> Optional[float]:
+        if self.usage.hourly_used is None or not self.hourly_limit:
+            return None
+        return self.usage.hourly_used / self.hourly_limit
+
+    @property
+    def weekly_fraction(self) -> Optional[float]:
+        if self.usage.weekly_used is None or not self.weekly_limit:
+            return None
+        return self.usage.weekly_used / self.weekly_limit
+
+    def set_budget(
+        self,
+        priority: str,
+        hourly: Optional[float] = None,
+        weekly: Optional[float] = None,
+        action: Literal["refuse", "delay"] = "refuse",
+        delay: float = 300.0
+    ) -> None:
+        """
+        Limits a priority class to a fraction of the quota, e.g.
+        ``set_budget("bulk", weekly=0.8)`` stops bulk work at 80% of the weekly quota.
+        
+        Args:
+            priority: The priority class the budget applies to.
+            hourly: Fraction of the hourly quota.
+            weekly: Fraction of the weekly quota.
+            action: "refuse" raises QuotaExceeded, "delay" waits ``delay`` seconds and
+                    then lets the request through so its response refreshes the counters.
+            delay: Seconds to wait with the "delay" action.
+        """
+        if hourly is not None and not self.hourly_limit:
+            raise ValueError("An hourly budget needs hourly_limit")
+        if weekly is not None and not self.weekly_limit:
+            raise ValueError("A weekly budget needs weekly_limit")
+        self.budgets[priority] = Budget(hourly=hourly, weekly=weekly, action=action, delay=delay)
+
+    def over_budget(self, priority: str) -> Optional[str]:
+        """Returns which budget ("hourly"/"weekly") a priority class has used up, if any."""
+        budget = self.budgets.get(priority)
+        if budget is None:
+            return None
+        hourly_fraction = self.hourly_fraction
+        if budget.hourly is not None and hourly_fraction is not None and hourly_fraction >= budget.hourly:
+            return "hourly"
+        weekly_fraction = self.weekly_fraction
+        if budget.weekly is not None and weekly_fraction is not None and weekly_fraction >= budget.weekly:
+            return "weekly"
+        return None
+
+    async def check(self, priority: str) -> None:
+        """Enforces the budget of a priority class before a request is sent."""
+        exhausted = self.over_budget(priority)
+        if exhausted is None:
+            return
+        budget = self.budgets[priority]
+        if budget.action == "refuse":
+            raise QuotaExceeded(f"'{priority}' requests are over their {exhausted} quota budget")
+        logger.info(f"'{priority}' requests are over their {exhausted} quota budget, waiting {budget.delay}s")
+        await deadlines.sleep(budget.delay)
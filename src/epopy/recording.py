@@ -0,0 +1,202 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Request headers that select a different response for the same URL
+_KEY_HEADERS = ("accept", "range", "content-type")
+
+def _is_token_request(request: httpx.Request) -> bool:
+    return request.url.path.endswith("/auth/accesstoken")
+
+def request_key(method: str, url: str, headers: Dict[str, str], body: bytes) -> str:
+    """Identity of a request in an archive: method, URL, selecting headers and body digest."""
+    parsed = httpx.URL(url)
+    query = "&".join(sorted(f"{k}={v}" for k, v in parsed.params.multi_items()))
+    selected = ",".join(f"{name}={headers.get(name, '')}" for name in _KEY_HEADERS)
+    digest = hashlib.sha256(body).hexdigest() if body else ""
+    return f"{method.upper()} {parsed.copy_with(query=None)}?{query} [{selected}] {digest}"
+
+def _key_of(request: httpx.Request) -> str:
+    headers = {name: request.headers.get(name, "") for name in _KEY_HEADERS}
+    return request_key(request.method, str(request.url), headers, request.content)
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that passes requests on to OPS and appends every exchange to a gzip
+    compressed JSON-lines archive, for later use with ``ReplayTransport``.
+
+    Token requests are not recorded, so the archive holds no credentials or tokens.
+    Appending to an existing archive adds to it. Every exchange is written and flushed
+    as a gzip member of its own, so the archive of a crawl that was killed keeps all
+    exchanges recorded up to then.
+
+    Example::
+
+        transport = RecordingTransport("crawl.jsonl.gz")
+        async with AsyncClient(key, secret, transport=transport) as client:
+            ...
+    """
+
+    def __init__(self, path: str | Path, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            path: Archive file to append to.
+            transport: Transport doing the actual requests, defaults to a plain
+                       ``httpx.AsyncHTTPTransport``.
+        """
+        self.path = Path(path)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.recorded = 0
+        self._lock = asyncio.Lock()
+        self._file: Optional[BinaryIO] = None
+        self._closed = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        if _is_token_request(request):
+            return response
+
+        content = await response.aread()
+        await response.aclose()
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            # The body is stored decoded, so encoding headers no longer apply
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        entry = {
+            "key": _key_of(request),
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(content).decode("ascii"),
+        }
+        line = json.dumps(entry).encode("utf-8") + b"\n"
+        async with self._lock:
+            # Compression and disk writes stay off the event loop
+            await asyncio.to_thread(self._write, line)
+            self.recorded += 1
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions={"http_version": response.extensions.get("http_version", b"HTTP/1.1")},
+        )
+
+    def _write(self, line: bytes) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(gzip.compress(line))
+        self._file.flush()
+
+    async def aclose(self) -> None:
+        """Closes the archive and the inner transport; closing again does nothing."""
+        async with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._file is not None:
+                await asyncio.to_thread(self._file.close)
+                self._file = None
+        await self.transport.aclose()
+
+def _complete_lines(lines: Iterable[bytes], path: str | Path) -> Iterator[bytes]:
+    """The newline-terminated lines of a gzip stream, stopping at a truncated end."""
+    try:
+        for line in lines:
+            if not line.endswith(b"\n"):
+                # Only the last line can be cut off
+                logger.warning(f"{path} ends in a truncated entry, which is skipped")
+                return
+            yield line
+    except EOFError:
+        logger.warning(f"{path} ends in a truncated gzip member, its complete entries are kept")
+
+class ReplayMiss(httpx.TransportError):
+    """Raised by a strict ReplayTransport for a request that is not in the archive."""
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport serving the exchanges of archives written by ``RecordingTransport``,
+    without network access. Token requests get a synthetic token, so any consumer
+    key/secret works and no OPS quota is used.
+
+    Repeated identical requests are answered with the recorded responses in order, and
+    with the last one once they are used up.
+
+    Example::
+
+        async with AsyncClient("offline", "offline", transport=ReplayTransport("crawl.jsonl.gz")) as client:
+            patent = client.get_patent("EP.1000000.A1")
+            biblio = await patent.biblio()
+    """
+
+    def __init__(self, *paths: str | Path, strict: bool = True):
+        """
+        Args:
+            paths: One or more archive files.
+            strict: Raise ``ReplayMiss`` for unknown requests. Otherwise they are
+                    answered with a 404, like OPS does for unknown documents.
+        """
+        self.strict = strict
+        self.misses = 0
+        self._responses: Dict[str, List[Tuple[int, List[Tuple[str, str]], bytes]]] = {}
+        self._served: Dict[str, int] = {}
+        for path in paths:
+            self.load(path)
+
+    def load(self, path: str | Path) -> int:
+        """
+        Adds the exchanges of an archive; returns how many were read. Of an archive
+        that ends in a truncated entry (e.g. of a killed crawl) the complete ones are
+        read.
+        """
+        count = 0
+        with gzip.open(path, "rb") as f:
+            for line in _complete_lines(f, path):
+                entry: Dict[str, Any] = json.loads(line)
+                self._responses.setdefault(entry["key"], []).append(
+                    (
+                        int(entry["status"]),
+                        [(name, value) for name, value in entry["headers"]],
+                        base64.b64decode(entry["body"])
+                    )
+                )
+                count += 1
+        logger.info(f"Loaded {count} recorded exchanges from {path}")
+        return count
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _is_token_request(request):
+            return httpx.Response(
+                200, json={"access_token": "replay", "expires_in": "1200", "token_type": "BearerToken"}, request=request
+            )
+
+        await request.aread()
+        key = _key_of(request)
+        responses = self._responses.get(key)
+        if not responses:
+            self.misses += 1
+            if self.strict:
+                raise ReplayMiss(f"No recorded response for {key}", request=request)
+            return httpx.Response(404, text="<fault><code>SERVER.EntityNotFound</code></fault>", request=request)
+
+        position = self._served.get(key, 0)
+        self._served[key] = position + 1
+        status, headers, content = responses[min(position, len(responses) - 1)]
+        return httpx.Response(status, headers=headers, content=content, request=request)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Optional
+
+@dataclass
+class PriorityClass:
+    """Share and limits of one priority class."""
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None
+
+def default_classes() -> Dict[str, PriorityClass]:
+    """Interactive lookups get four times the share of bulk work, which is also capped."""
+    return {
+        "interactive": PriorityClass(weight=4.0),
+        "bulk": PriorityClass(weight=1.0, max_concurrency=4),
+    }
+
+class RequestScheduler:
+    """
+    Queues requests by priority class and hands out request slots by weighted fair
+    sharing.
+
+    At most ``max_concurrency`` requests are in flight (and, with ``rate``, at most
+    that many start per second). When a slot frees up, it goes to the waiting class
+    that has received the least service relative to its weight, so a busy bulk
+    class cannot starve interactive calls. Classes not configured get weight 1.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        classes: Optional[Dict[str, PriorityClass]] = None,
+        rate: Optional[float] = None
+    ):
+        """
+        Args:
+            max_concurrency: Maximum number of requests in flight overall.
+            classes: Priority classes by name, defaults to ``default_classes()``.
+            rate: Optional maximum number of requests started per second.
+        """
+        self.max_concurrency = max_concurrency
+        self.classes = classes if classes is not None else default_classes()
+        self.rate = rate
+        self._waiters: Dict[str, Deque[asyncio.Future[None]]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._served: Dict[str, float] = {}
+        self._total_in_flight = 0
+        self._tokens = float(max(1.0, rate or 1.0))
+        self._last_refill = time.monotonic()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def _class(self, priority: str) -> PriorityClass:
+        return self.classes.get(priority) or PriorityClass()
+
+    def _virtual_time(self, priority: str) -> float:
+        return self._served.get(priority, 0.0) / self._class(priority).weight
+
+    @property
+    def waiting(self) -> Dict[str, int]:
+        """Number of queued requests per class."""
+        return {name: len(queue) for name, queue in self._waiters.items() if queue}
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        """Waits for a request slot of the given class and holds it for the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    async def acquire(self, priority: str) -> None:
+        queue = self._waiters.setdefault(priority, deque())
+        if not queue:
+            # A class that was idle starts at the current virtual time instead of
+            # using up its idle period as credit
+            busy = [self._virtual_time(p) for p, q in self._waiters.items() if q and p != priority]
+            if busy:
+                floor = min(busy) * self._class(priority).weight
+                self._served[priority] = max(self._served.get(priority, 0.0), floor)
+                
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation arrived: give the slot back
+                self.release(priority)
+            elif future in queue:
+                queue.remove(future)
+            raise
+
+    def release(self, priority: str) -> None:
+        self._in_flight[priority] -= 1
+        self._total_in_flight -= 1
+        self._dispatch()
+
+    def _take_token(self) -> bool:
+        if self.rate is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def _dispatch(self) -> None:
+        while self._total_in_flight < self.max_concurrency:
+            candidates = [
+                name for name, queue in self._waiters.items()
+                if queue and (
+                    self._class(name).max_concurrency is None
+                    or self._in_flight.get(name, 0) < (self._class(name).max_concurrency or 0)
+                )
+            ]
+            if not candidates:
+                return
+            if not self._take_token():
+                self._schedule_wakeup()
+                return
+            name = min(candidates, key=lambda n: (self._virtual_time(n), -self._class(n).weight))
+            future = self._waiters[name].popleft()
+            if future.cancelled():
+                # Token is lost, which only makes the rate more conservative
+                continue
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            self._total_in_flight += 1
+            self._served[name] = self._served.get(name, 0.0) + 1.0
+            future.set_result(None)
+
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup is not None or self.rate is None:
+            return
+        
+        def _wake() -> None:
+            self._wakeup = None
+            self._dispatch()
+            
+        delay = (1.0 - self._tokens) / self.rate
+        self._wakeup = asyncio.get_running_loop().call_later(delay, _wake)
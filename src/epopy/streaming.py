@@ -0,0 +1,196 @@
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+from lxml import etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+# Attributes text-mode elements take from their nearest ancestor when missing
+_INHERITED = ("lang", "num")
+
+class ElementStream:
+    """
+    Incremental parser that turns an XML document fed in chunks into the dicts of
+    selected elements, each available as soon as its end tag was read.
+
+    Elements are named like the keys ``xmltodict.parse`` uses, i.e. with the prefix of
+    the document ("ops:publication-reference", "exchange-document"), and converted
+    to the same dict shape. Once converted, an element is removed from the tree, so
+    memory stays bounded by the largest selected element instead of the document.
+
+    In text mode elements become ``{"@attribute": ..., "#text": ...}`` instead, with
+    all text inside the element (also that of inline markup like ``<b>``) joined in
+    document order and whitespace collapsed. "lang" and "num" attributes missing on
+    the element are taken from the nearest ancestor that has them, e.g. the number
+    of the ``<claim num="0001">`` around a ``<claim-text>``.
+
+    Example::
+
+        stream = ElementStream(["exchange-document"])
+        for chunk in chunks:
+            for document in stream.feed(chunk):
+                ...
+        for document in stream.close():
+            ...
+    """
+
+    def __init__(self, tags: Sequence[str], text: bool = False):
+        """
+        Args:
+            tags: Qualified names of the elements to yield.
+            text: Convert elements to their plain text, see above.
+        """
+        self.tags: FrozenSet[str] = frozenset(tags)
+        self.text = text
+        self.count = 0
+        self._root: Any = None
+        local_names = {tag.rpartition(":")[2] for tag in self.tags}
+        self._parser = etree.XMLPullParser(
+            events=("end",), tag=[f"{{*}}{name}" for name in local_names],
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Parses the next chunk of the document and returns the elements it completed."""
+        self._parser.feed(data)
+        return list(self._completed())
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Ends the document and returns the remaining elements.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: The document is malformed or incomplete.
+        """
+        self._root = self._parser.close()
+        return list(self._completed())
+
+    def attributes(self, tag: str) -> Optional[Dict[str, str]]:
+        """
+        Attributes of the first element named ``tag`` that is still in the tree, e.g.
+        ``attributes("ops:biblio-search")`` once a hit inside it was returned. Elements
+        that enclose a returned one are kept, earlier siblings are not.
+        """
+        if self._root is None:
+            return None
+        for elem in self._root.iter(f"{{*}}{tag.rpartition(':')[2]}"):
+            if _name(elem) == tag:
+                return {str(k): str(v) for k, v in elem.attrib.items()}
+        return None
+
+    def _completed(self) -> Iterator[Dict[str, Any]]:
+        for _, elem in self._parser.read_events():
+            if self._root is None:
+                self._root = elem.getroottree().getroot()
+            if _name(elem) not in self.tags or any(_name(a) in self.tags for a in elem.iterancestors()):
+                # Nested matches are part of the enclosing element
+                continue
+            yield self._convert(elem)
+            self.count += 1
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def _convert(self, elem: Any) -> Dict[str, Any]:
+        if self.text:
+            return _to_text(elem)
+        parent = elem.getparent()
+        value = _to_dict(elem, parent.nsmap if parent is not None else {})
+        if not isinstance(value, dict):
+            return {"#text": value} if value is not None else {}
+        return value
+
+def _to_dict(elem: Any, inherited: Optional[Dict[Optional[str], str]]) -> Any:
+    """
+    Converts an element to the value ``xmltodict.parse`` gives it: attributes and
+    namespace declarations as "@" keys, children by qualified name (lists when
+    repeated), stripped text as "#text", or just the text for a bare element.
+
+    Namespace declarations are looked for where ``inherited`` (the namespaces in
+    scope at the parent) is given, i.e. on the converted element and on descendants
+    in a different namespace than their parent; building the namespace map of
+    every element would cost more than the rest of the conversion.
+    """
+    result: Dict[str, Any] = {}
+    nsmap: Optional[Dict[Optional[str], str]] = None
+    if inherited is not None:
+        nsmap = elem.nsmap
+        if nsmap != inherited:
+            for prefix, uri in nsmap.items():
+                if inherited.get(prefix) != uri:
+                    result["@xmlns" if prefix is None else f"@xmlns:{prefix}"] = uri
+    for key, value in elem.attrib.items():
+        if key[0] == "{":
+            if nsmap is None:
+                nsmap = elem.nsmap
+            key = _qualify(key, nsmap)
+        result[f"@{key}"] = value
+    text = elem.text or ""
+    namespace = elem.tag.partition("}")[0]
+    for child in elem:
+        if child.tail:
+            text += child.tail
+        name = _name(child)
+        if name is None:
+            # Comments and processing instructions
+            continue
+        if child.tag.partition("}")[0] != namespace:
+            if nsmap is None:
+                nsmap = elem.nsmap
+            converted = _to_dict(child, nsmap)
+        else:
+            converted = _to_dict(child, None)
+        if name not in result:
+            result[name] = converted
+        elif isinstance(result[name], list):
+            result[name].append(converted)
+        else:
+            result[name] = [result[name], converted]
+    text = text.strip()
+    if not result:
+        return text or None
+    if text:
+        result["#text"] = text
+    return result
+
+def _to_text(elem: Any) -> Dict[str, Any]:
+    """Converts an element to its attributes and collapsed plain text, see ElementStream."""
+    nsmap = elem.nsmap
+    result: Dict[str, Any] = {
+        f"@{_qualify(key, nsmap) if key[0] == '{' else key}": value for key, value in elem.attrib.items()
+    }
+    for name in _INHERITED:
+        if f"@{name}" in result:
+            continue
+        for ancestor in elem.iterancestors():
+            value = ancestor.get(name)
+            if value is not None:
+                result[f"@{name}"] = value
+                break
+    result["#text"] = " ".join("".join(elem.itertext()).split())
+    return result
+
+def _qualify(key: str, nsmap: Dict[Optional[str], str]) -> str:
+    """Attribute name with the prefix of its namespace."""
+    uri, _, local = key[1:].partition("}")
+    if uri == XML_NAMESPACE:
+        return f"xml:{local}"
+    for prefix, value in nsmap.items():
+        if value == uri and prefix is not None:
+            return f"{prefix}:{local}"
+    return local
+
+# Qualified names by (tag, prefix), there are only a few distinct ones per document type
+_names: Dict[Tuple[str, Optional[str]], str] = {}
+
+def _name(elem: Any) -> Optional[str]:
+    """Qualified name of an element the way xmltodict writes it."""
+    tag = elem.tag
+    if not isinstance(tag, str):
+        return None
+    prefix = elem.prefix
+    name = _names.get((tag, prefix))
+    if name is None:
+        local = tag.rpartition("}")[2]
+        name = _names[(tag, prefix)] = f"{prefix}:{local}" if prefix else local
+    return name
@@ -1,3 +1,5 @@
+import asyncio
+import httpx
 from typing import Any, List
 from httpx import Response
 import pytest
@@ -7,7 +9,7 @@ from epopy.patent import Patent, Document
 @pytest.mark.asyncio
 async def test_patent_abstraction_mock(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
     # Mock imagery inquiry
-    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP1234567/images").mock(
+    inquiry_route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP1234567/images").mock(
         return_value=Response(200, content='''<?xml version="1.0" encoding="UTF-8"?>
 <ops:world-patent-data xmlns:ops="http://ops.epo.org">
     <ops:document-inquiry>
@@ -30,6 +32,11 @@ async def test_patent_abstraction_mock(client: AsyncClient, mock_token: None, re
     assert doc.name == "Drawing"
     assert doc.link == "path/to/img"
     
+    # The inquiry is fetched once and the document list is cached
+    assert inquiry_route.call_count == 1
+    assert await patent.get_documents() is docs
+    assert inquiry_route.call_count == 1
+    
     # Mock download
     respx_mock.get("https://ops.epo.org/3.2/rest-services/path/to/img?range=1").mock(
         return_value=Response(200, content=b"fake_pdf")
@@ -39,3 +46,137 @@ async def test_patent_abstraction_mock(client: AsyncClient, mock_token: None, re
     assert content == b"fake_pdf"
 
 
+
+BIBLIO_XML = """
+<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <exchange-documents>
+        <exchange-document country="EP" doc-number="{num}" kind="A1">
+            <bibliographic-data><invention-title>Title {num}</invention-title></bibliographic-data>
+        </exchange-document>
+    </exchange-documents>
+</ops:world-patent-data>
+"""
+
+@pytest.mark.asyncio
+async def test_patent_biblio_memoized(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP.1000000.A1/biblio").mock(
+        return_value=Response(200, text=BIBLIO_XML.format(num="1000000"))
+    )
+    
+    patent = client.get_patent("EP.1000000.A1")
+    first = await patent.biblio()
+    second = await patent.biblio()
+    
+    assert first is second
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_patent_concurrent_calls_share_request(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP.1000000.A1/biblio").mock(
+        side_effect=[Response(500), Response(200, text=BIBLIO_XML.format(num="1000000"))]
+    )
+    patent = client.get_patent("EP.1000000.A1")
+    
+    # A failed request is shared too, and retried by the next call
+    results = await asyncio.gather(patent.biblio(), patent.biblio(), return_exceptions=True)
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert route.call_count == 1
+    
+    first, second = await asyncio.gather(patent.biblio(), patent.biblio())
+    assert first is second
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_prefetch_batches_biblio(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    from epopy.patent import prefetch
+    
+    batch_xml = BIBLIO_XML.replace("</exchange-documents>", """
+        <exchange-document country="EP" doc-number="1000001" kind="A1">
+            <bibliographic-data><invention-title>Title 1000001</invention-title></bibliographic-data>
+        </exchange-document>
+    </exchange-documents>""").format(num="1000000")
+    route = respx_mock.post("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/biblio").mock(
+        return_value=Response(200, text=batch_xml)
+    )
+    
+    patents = [client.get_patent("EP.1000000.A1"), client.get_patent("EP.1000001.A1")]
+    await prefetch(patents, parts=["biblio"])
+    
+    assert route.call_count == 1
+    for patent in patents:
+        biblio = await patent.biblio()
+        docs = biblio.world_patent_data.exchange_documents
+        assert docs is not None
+        exch = docs.exchange_document
+        assert isinstance(exch, list)
+        assert patent.number == f"EP.{exch[0].doc_number}.A1"
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_documents_many(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    from epopy.patent import get_documents_many
+    
+    for num in ("1000000", "1000001"):
+        respx_mock.get(f"https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP{num}/images").mock(
+            return_value=Response(200, content=f'''<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:document-inquiry><ops:inquiry-result>
+        <ops:document-instance desc="FullDocument" link="images/EP/{num}" number-of-pages="3">
+            <ops:document-format-options><ops:document-format>application/pdf</ops:document-format></ops:document-format-options>
+        </ops:document-instance>
+    </ops:inquiry-result></ops:document-inquiry>
+</ops:world-patent-data>''')
+        )
+        
+    patents = [client.get_patent("EP1000000"), client.get_patent("EP1000001")]
+    documents = await get_documents_many(patents, concurrency=2)
+    
+    assert [docs[0].link for docs in documents] == ["images/EP/1000000", "images/EP/1000001"]
+    assert documents[1][0].number_of_pages == 3
+
+@pytest.mark.asyncio
+async def test_get_documents_many_keeps_results_on_failure(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    import httpx
+    from epopy.patent import get_documents_many
+    
+    base = "https://ops.epo.org/3.2/rest-services/published-data/publication/docdb"
+    ok = respx_mock.get(f"{base}/EP1000000/images").mock(return_value=Response(200, content='''<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:document-inquiry><ops:inquiry-result>
+        <ops:document-instance desc="FullDocument" link="images/EP/1000000" number-of-pages="3"/>
+    </ops:inquiry-result></ops:document-inquiry>
+</ops:world-patent-data>'''))
+    respx_mock.get(f"{base}/EP1000001/images").mock(return_value=Response(500))
+    patents = [client.get_patent("EP1000000"), client.get_patent("EP1000001")]
+    
+    documents = await get_documents_many(patents, return_exceptions=True)
+    assert isinstance(documents[0], list) and documents[0][0].link == "images/EP/1000000"
+    assert isinstance(documents[1], httpx.HTTPStatusError)
+    
+    # Successful inquiries stay cached, a retry only repeats the failed one
+    with pytest.raises(httpx.HTTPStatusError):
+        await get_documents_many(patents)
+    assert ok.call_count == 1
+
+@pytest.mark.asyncio
+async def test_patent_paragraphs_checks_availability(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    base = "https://ops.epo.org/3.2/rest-services/published-data/publication/docdb"
+    inquiry = respx_mock.post(f"{base}/fulltext").mock(return_value=Response(200, text="""
+        <ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange" xmlns:ftxt="http://www.epo.org/fulltext">
+            <ftxt:fulltext-inquiry><ftxt:inquiry-result>
+                <ftxt:fulltext-instance desc="description"/>
+            </ftxt:inquiry-result></ftxt:fulltext-inquiry>
+        </ops:world-patent-data>"""))
+    claims = respx_mock.get(f"{base}/EP.1000000.A1/claims")
+    respx_mock.get(f"{base}/EP.1000000.A1/description").mock(return_value=Response(200, text="""
+        <ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns:ftxt="http://www.epo.org/fulltext">
+            <ftxt:fulltext-documents><ftxt:fulltext-document>
+                <description lang="EN"><p num="0001">Field of the invention.</p><p num="0002">Background.</p></description>
+            </ftxt:fulltext-document></ftxt:fulltext-documents>
+        </ops:world-patent-data>"""))
+
+    patent = client.get_patent("EP.1000000.A1")
+    assert [p async for p in patent.paragraphs("claims")] == []
+    description = [p async for p in patent.paragraphs("description")]
+
+    assert [(p.num, p.text) for p in description] == [("0001", "Field of the invention."), ("0002", "Background.")]
+    assert not claims.called
+    assert inquiry.call_count == 1
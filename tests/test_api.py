@@ -3,7 +3,7 @@ import pytest
 from httpx import Response
 from epopy.models import OPSResponse
 
-from typing import Any
+from typing import Any, Dict, List
 from epopy import AsyncClient
 
 @pytest.mark.asyncio
@@ -34,6 +34,9 @@ async def test_search_service(client: AsyncClient, mock_token: None, respx_mock:
     assert response.world_patent_data.biblio_search is not None
     assert response.world_patent_data.biblio_search.total_result_count == 10
     assert response.world_patent_data.biblio_search.query == "ti=plastic"
+    
+    raw = await client.search.published_data_search_raw("ti=plastic")
+    assert raw["ops:world-patent-data"]["ops:biblio-search"]["@total-result-count"] == "10"
 
 @pytest.mark.asyncio
 async def test_retrieval_service(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
@@ -71,3 +74,299 @@ async def test_retrieval_service(client: AsyncClient, mock_token: None, respx_mo
          assert exch_doc[0].country == "EP"
     else:
          assert exch_doc.country == "EP"
+         
+    # The raw variant returns the parsed XML without building models
+    raw = await client.published_data.published_data_raw("publication", "epodoc", "EP1000000", "biblio")
+    assert raw["ops:world-patent-data"]["exchange-documents"]["exchange-document"]["@doc-number"] == "1000000"
+
+@pytest.mark.asyncio
+async def test_search_patents_include_biblio(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    xml_response = """
+    <ops:world-patent-data xmlns:ops="http://ops.epo.org">
+        <ops:biblio-search total-result-count="2">
+            <ops:query>ti=plastic</ops:query>
+            <ops:search-result>
+                <exchange-documents>
+                    <exchange-document country="EP" doc-number="1000000" kind="A1" family-id="10">
+                        <bibliographic-data><invention-title>Plastic one</invention-title></bibliographic-data>
+                    </exchange-document>
+                </exchange-documents>
+                <exchange-documents>
+                    <exchange-document country="WO" doc-number="2020123456" kind="A1" family-id="11">
+                        <bibliographic-data><invention-title>Plastic two</invention-title></bibliographic-data>
+                    </exchange-document>
+                </exchange-documents>
+            </ops:search-result>
+        </ops:biblio-search>
+    </ops:world-patent-data>
+    """
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search/biblio,abstract").mock(
+        return_value=Response(200, text=xml_response)
+    )
+    
+    patents = await client.search_patents("ti=plastic", include=["biblio", "abstract"])
+    
+    assert [p.number for p in patents] == ["EP.1000000.A1", "WO.2020123456.A1"]
+    biblio = await patents[1].biblio()
+    await patents[1].abstract()
+    assert route.call_count == 1
+    assert biblio.world_patent_data.exchange_documents is not None
+    exch = biblio.world_patent_data.exchange_documents.exchange_document
+    assert not isinstance(exch, list) and exch.family_id == "11"
+
+def _search_xml(total: int, start: int, end: int) -> str:
+    refs = "".join(
+        f"""<ops:publication-reference family-id="{i}">
+            <document-id document-id-type="docdb">
+                <country>EP</country><doc-number>{1000000 + i}</doc-number><kind>A1</kind>
+            </document-id>
+        </ops:publication-reference>"""
+        for i in range(start, min(end, total) + 1)
+    )
+    return f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+        <ops:biblio-search total-result-count="{total}">
+            <ops:search-result>{refs}</ops:search-result>
+        </ops:biblio-search>
+    </ops:world-patent-data>"""
+
+def _search_side_effect(total: int) -> Any:
+    def _respond(request: Any) -> Response:
+        start, end = (int(x) for x in request.headers["Range"].split("-"))
+        return Response(200, text=_search_xml(total, start, end))
+    return _respond
+
+@pytest.mark.asyncio
+async def test_search_result_cache_subranges(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        side_effect=_search_side_effect(total=70)
+    )
+    
+    first = await client.search_patents("ti=plastic AND pa=siemens", start=1, end=50)
+    assert len(first) == 50
+    assert route.call_count == 1
+    
+    # Sub-range of a normalized-equal query: served from the cache
+    window = await client.search_patents("TI = Plastic  and pa=Siemens", start=11, end=20)
+    assert [p.number for p in window] == [f"EP.{1000000 + i}.A1" for i in range(11, 21)]
+    assert route.call_count == 1
+    
+    # Only the missing tail is fetched, clipped to the known total result count
+    tail = await client.search_patents("ti=plastic and pa=siemens", start=41, end=100)
+    assert len(tail) == 30
+    assert route.call_count == 2
+    assert route.calls.last.request.headers["Range"] == "51-70"
+    
+    client.search.clear_cache()
+    await client.search_patents("ti=plastic and pa=siemens", start=1, end=10)
+    assert route.call_count == 3
+
+FAMILY_SEARCH_XML = """
+<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:biblio-search total-result-count="5">
+        <ops:search-result>
+            <ops:publication-reference family-id="1"><document-id document-id-type="docdb">
+                <country>WO</country><doc-number>2020000001</doc-number><kind>A1</kind></document-id></ops:publication-reference>
+            <ops:publication-reference family-id="2"><document-id document-id-type="docdb">
+                <country>US</country><doc-number>11000000</doc-number><kind>B2</kind></document-id></ops:publication-reference>
+            <ops:publication-reference family-id="1"><document-id document-id-type="docdb">
+                <country>EP</country><doc-number>3000000</doc-number><kind>A1</kind></document-id></ops:publication-reference>
+            <ops:publication-reference family-id="1"><document-id document-id-type="docdb">
+                <country>EP</country><doc-number>3000000</doc-number><kind>B1</kind></document-id></ops:publication-reference>
+            <ops:publication-reference><document-id document-id-type="docdb">
+                <country>JP</country><doc-number>2020000002</doc-number><kind>A</kind></document-id></ops:publication-reference>
+        </ops:search-result>
+    </ops:biblio-search>
+</ops:world-patent-data>
+"""
+
+@pytest.mark.asyncio
+async def test_search_patents_collapse_families(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    from epopy.api.search import FamilyPolicy
+    
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        return_value=Response(200, text=FAMILY_SEARCH_XML)
+    )
+    
+    patents = await client.search_patents("ti=plastic", collapse_families=True)
+    assert [p.number for p in patents] == ["EP.3000000.B1", "US.11000000.B2", "JP.2020000002.A"]
+    assert patents[0].family_id == "1"
+    
+    # A WO-first policy keeps the WO publication instead
+    wo_first = FamilyPolicy(countries=("WO", "EP"))
+    patents = await client.search_patents("ti=plastic", collapse_families=True, policy=wo_first)
+    assert patents[0].number == "WO.2020000001.A1"
+    
+    iterated = [p.number async for p in client.search.iter_patents("ti=plastic", collapse_families=True)]
+    assert iterated == ["EP.3000000.B1", "US.11000000.B2", "JP.2020000002.A"]
+
+@pytest.mark.asyncio
+async def test_search_sync_incremental(client: AsyncClient, mock_token: None, respx_mock: Any, tmp_path: Any) -> None:
+    from datetime import date
+    from epopy.checkpoints import CheckpointStore
+    
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        side_effect=_search_side_effect(total=3)
+    )
+    store = CheckpointStore(tmp_path / "checkpoints.json")
+    
+    first = [p.number async for p in client.search.sync("plastics", "ti=plastic", store, today=date(2026, 1, 5))]
+    assert first == ["EP.1000001.A1", "EP.1000002.A1", "EP.1000003.A1"]
+    assert route.calls.last.request.url.params["q"] == "ti=plastic"
+    
+    # The delta query reaches back before the previous run; already seen numbers are skipped
+    route.side_effect = _search_side_effect(total=4)
+    reloaded = CheckpointStore(tmp_path / "checkpoints.json")
+    second = [p.number async for p in client.search.sync("plastics", "ti=plastic", reloaded, today=date(2026, 1, 6))]
+    assert second == ["EP.1000004.A1"]
+    assert route.calls.last.request.url.params["q"] == "(ti=plastic) and pd>=20251229"
+    
+    checkpoint = reloaded.get("plastics")
+    assert checkpoint is not None
+    assert checkpoint.last_date == "20260106"
+    assert checkpoint.seen["EP.1000001.A1"] == "20260105"
+    assert checkpoint.seen["EP.1000004.A1"] == "20260106"
+    
+    # Numbers first seen before the window of the next delta are dropped
+    later = [p.number async for p in client.search.sync("plastics", "ti=plastic", reloaded, today=date(2026, 1, 13))]
+    assert later == []
+    checkpoint = reloaded.get("plastics")
+    assert checkpoint is not None
+    assert checkpoint.seen == {"EP.1000004.A1": "20260106"}
+
+def _inquiry_xml(available: Dict[str, List[str]]) -> str:
+    results = "".join(
+        f"""<ftxt:inquiry-result>
+            <publication-reference data-format="docdb">
+                <document-id document-id-type="docdb">
+                    <country>{number.split(".")[0]}</country><doc-number>{number.split(".")[1]}</doc-number><kind>{number.split(".")[2]}</kind>
+                </document-id>
+            </publication-reference>
+            {"".join(f'<ftxt:fulltext-instance desc="{section}"><ftxt:fulltext-format>text-only</ftxt:fulltext-format></ftxt:fulltext-instance>' for section in sections)}
+        </ftxt:inquiry-result>"""
+        for number, sections in available.items()
+    )
+    return f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange" xmlns:ftxt="http://www.epo.org/fulltext">
+        <ftxt:fulltext-inquiry>{results}</ftxt:fulltext-inquiry>
+    </ops:world-patent-data>"""
+
+CLAIMS_XML = """<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange" xmlns:ftxt="http://www.epo.org/fulltext">
+    <ftxt:fulltext-documents>
+        <ftxt:fulltext-document fulltext-format="text-only">
+            <claims lang="EN">
+                <claim num="0001"><claim-text>1. A container made of <b>plastic</b>,
+                    comprising a lid.</claim-text></claim>
+                <claim num="0002"><claim-text>2. The container of claim 1.</claim-text></claim>
+            </claims>
+            <claims lang="DE">
+                <claim><claim-text>1. Ein Behälter.</claim-text></claim>
+            </claims>
+        </ftxt:fulltext-document>
+    </ftxt:fulltext-documents>
+</ops:world-patent-data>"""
+
+@pytest.mark.asyncio
+async def test_fulltext_fetches_only_available_sections(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    base = "https://ops.epo.org/3.2/rest-services/published-data/publication/docdb"
+    inquiry = respx_mock.post(f"{base}/fulltext").mock(side_effect=[
+        Response(200, text=_inquiry_xml({"EP.1000000.A1": ["claims"], "EP.1000001.A1": []})),
+        Response(404, text="<fault><code>SERVER.EntityNotFound</code></fault>"),
+    ])
+    claims = respx_mock.get(f"{base}/EP.1000000.A1/claims").mock(return_value=Response(200, text=CLAIMS_XML))
+
+    numbers = ["EP.1000000.A1", "EP 1000001 A1", "EP.1000002.A1"]
+    paragraphs = [p async for p in client.published_data.iter_fulltext("docdb", numbers)]
+
+    assert [(p.lang, p.position, p.num, p.text) for p in paragraphs] == [
+        ("EN", 0, "0001", "1. A container made of plastic, comprising a lid."),
+        ("EN", 1, "0002", "2. The container of claim 1."),
+        ("DE", 2, None, "1. Ein Behälter."),
+    ]
+    assert all(p.number == "EP.1000000.A1" and p.section == "claims" for p in paragraphs)
+    assert inquiry.call_count == 1
+    assert inquiry.calls.last.request.content == b"EP.1000000.A1,EP.1000001.A1,EP.1000002.A1"
+    assert claims.call_count == 1
+
+    # Availability is cached, including the publications without fulltext; the number
+    # the answer left out is asked about again
+    expected = {
+        "EP.1000000.A1": frozenset({"claims"}),
+        "EP 1000001 A1": frozenset(),
+        "EP.1000002.A1": frozenset(),
+    }
+    assert await client.published_data.fulltext_availability("docdb", numbers) == expected
+    assert inquiry.call_count == 2
+    assert inquiry.calls.last.request.content == b"EP.1000002.A1"
+    assert await client.published_data.fulltext_availability("docdb", numbers) == expected
+    assert inquiry.call_count == 2
+
+@pytest.mark.asyncio
+async def test_iter_patents_stops_at_result_cap(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        side_effect=_search_side_effect(2500)
+    )
+
+    count = 0
+    async for _ in client.search.iter_patents("ti=plastic", page_size=30):
+        count += 1
+
+    assert count == 2000
+    ranges = [tuple(int(x) for x in call.request.headers["Range"].split("-")) for call in route.calls]
+    assert all(start <= 2000 and end <= 2000 for start, end in ranges)
+    assert ranges[-1] == (1981, 2000)
+
+@pytest.mark.asyncio
+async def test_search_hits_total_on_slice_boundary(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    def _respond(request: Any) -> Response:
+        start, end = (int(x) for x in request.headers["Range"].split("-"))
+        total = 100 if request.url.params["q"] == "ti=x" else 2500
+        if start > min(total, 2000):
+            return Response(404, text="<fault><code>SERVER.EntityNotFound</code></fault>")
+        return Response(200, text=_search_xml(total, start, end))
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(side_effect=_respond)
+
+    total, hits = await client.search.search_hits("ti=x", start=1, end=200)
+    assert total == 100 and len(hits) == 100
+    assert route.call_count == 1
+
+    await client.search.search_hits("ti=y", start=1901, end=2100)
+    assert route.calls.last.request.headers["Range"] == "1901-2000"
+
+@pytest.mark.asyncio
+async def test_search_result_cache_is_bounded(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        side_effect=_search_side_effect(10)
+    )
+    client.search.cache_size = 1
+
+    await client.search.search_hits("ti=a")
+    await client.search.search_hits("ti=b")
+    await client.search.search_hits("ti=b")
+    assert route.call_count == 2
+    await client.search.search_hits("ti=a")
+    assert route.call_count == 3
+
+@pytest.mark.asyncio
+async def test_published_data_many_cache_is_bounded(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    def _respond(request: Any) -> Response:
+        documents = "".join(
+            f'<exchange-document country="EP" doc-number="{n.split(".")[1]}" kind="A1"/>'
+            for n in request.content.decode().split(",")
+        )
+        return Response(200, text=f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+            <exchange-documents>{documents}</exchange-documents></ops:world-patent-data>""")
+    route = respx_mock.post("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/biblio").mock(
+        side_effect=_respond
+    )
+    service = client.published_data
+    service.cache_size = 2
+
+    await service.published_data_many("publication", "docdb", ["EP.1000001.A1", "EP.1000002.A1", "EP.1000003.A1"])
+    assert len(service._cache) == 2
+    await service.published_data_many("publication", "docdb", ["EP.1000002.A1", "EP.1000003.A1"])
+    assert route.call_count == 1
+    await service.published_data_many("publication", "docdb", ["EP.1000001.A1"])
+    assert route.call_count == 2
+
+    service.clear_cache()
+    await service.published_data_many("publication", "docdb", ["EP.1000001.A1"])
+    assert route.call_count == 3
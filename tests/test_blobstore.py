@@ -0,0 +1,85 @@
+import asyncio
+import os
+import pytest
+from httpx import Response
+from pathlib import Path
+from typing import Any, List
+from epopy import AsyncClient
+from epopy.blobstore import BlobStore
+
+def test_blob_store_dedup_and_eviction(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, max_bytes=10)
+    key_a = store.key("images/EP/1/A1/fullimage", 1, "application/pdf")
+    key_b = store.key("images/EP/1/B1/fullimage", 1, "application/pdf")
+    
+    store.put(key_a, b"12345")
+    store.put(key_b, b"12345")
+    assert store.get(key_a) == store.get(key_b) == b"12345"
+    assert store.size() == 5
+    
+    # Make the shared blob the least recently used one, then exceed the cap
+    old_blob = next((tmp_path / "blobs").glob("*/*"))
+    os.utime(old_blob, (1, 1))
+    key_c = store.key("images/EP/2/A1/fullimage", 1, "application/pdf")
+    store.put(key_c, b"abcdefgh")
+    
+    assert store.get(key_a) is None
+    assert store.get(key_c) == b"abcdefgh"
+    assert store.size() == 8
+    # Keys of evicted blobs are removed with them
+    assert sorted(p.name for p in (tmp_path / "keys").glob("*/*")) == [key_c]
+
+def test_blob_store_sees_other_processes(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, max_bytes=10, rescan_interval=0)
+    other = BlobStore(tmp_path, max_bytes=10, rescan_interval=0)
+    key_a = store.key("images/EP/1/A1/fullimage", 1, "application/pdf")
+    key_b = store.key("images/EP/2/A1/fullimage", 1, "application/pdf")
+    store.put(key_a, b"12345")
+    
+    # The other store's blob is accounted for when this one decides what to evict
+    other.put(key_b, b"678")
+    os.utime(next(p for p in (tmp_path / "blobs").glob("*/*") if p.stat().st_size == 5), (1, 1))
+    store.put(store.key("images/EP/3/A1/fullimage", 1, "application/pdf"), b"abcd")
+    
+    assert store.get(key_a) is None
+    assert other.get(key_b) == b"678"
+    assert store.size() == 7
+
+def test_full_blob_store_evicts_from_memory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = BlobStore(tmp_path, max_bytes=50)
+    for i in range(10):
+        store.put(store.key(f"images/EP/{i}/A1/fullimage", 1, "application/pdf"), b"%05d" % i)
+    assert store.size() == 50
+    
+    # Puts into the full store evict without reading the disk again
+    scans: List[int] = []
+    monkeypatch.setattr(store, "_rescan", lambda: scans.append(1))
+    for i in range(10, 30):
+        store.put(store.key(f"images/EP/{i}/A1/fullimage", 1, "application/pdf"), b"%05d" % i)
+    assert scans == []
+    assert store.size() == 50
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 10
+    assert store.get(store.key("images/EP/29/A1/fullimage", 1, "application/pdf")) == b"00029"
+    assert store.get(store.key("images/EP/19/A1/fullimage", 1, "application/pdf")) is None
+
+@pytest.mark.asyncio
+async def test_download_image_through_store(consumer_key: str, consumer_secret: str, mock_token: None, respx_mock: Any, tmp_path: Path) -> None:
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/images/EP/1/A1/fullimage").mock(
+        return_value=Response(200, content=b"%PDF-page")
+    )
+    
+    async with AsyncClient(consumer_key, consumer_secret, blob_store=BlobStore(tmp_path)) as client:
+        results = await asyncio.gather(*(
+            client.published_data.download_image("published-data/images/EP/1/A1/fullimage") for _ in range(3)
+        ))
+        assert results == [b"%PDF-page"] * 3
+        assert route.call_count == 1
+        
+        # Bypassing the store always hits the API
+        await client.published_data.download_image("published-data/images/EP/1/A1/fullimage", use_store=False)
+        assert route.call_count == 2
+        
+    # A second client sharing the volume is served from disk
+    async with AsyncClient(consumer_key, consumer_secret, blob_store=BlobStore(tmp_path)) as client:
+        assert await client.published_data.download_image("published-data/images/EP/1/A1/fullimage") == b"%PDF-page"
+        assert route.call_count == 2
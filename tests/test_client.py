@@ -1,8 +1,9 @@
+import httpx
 import pytest
 
 from httpx import Response
 
-from typing import Any
+from typing import Any, List
 from epopy import AsyncClient
 
 @pytest.mark.asyncio
@@ -35,3 +36,50 @@ async def test_get_data_parsing(client: AsyncClient, mock_token: None, respx_moc
     
     assert "ops:world-patent-data" in data
     assert data["ops:world-patent-data"]["ops:biblio-search"]["ops:query"] == "ti=plastic"
+
+@pytest.mark.asyncio
+async def test_quota_tracking_and_budget(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    from epopy.quota import QuotaExceeded
+    
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/endpoint").mock(
+        return_value=Response(200, text="<root/>", headers={
+            "X-IndividualQuotaPerHour-Used": "1000",
+            "X-RegisteredQuotaPerWeek-Used": "85",
+            "X-Throttling-Control": "busy (images=green:100, inpadoc=yellow:45, retrieval=green:200, search=black:0)",
+        })
+    )
+    client.quota.weekly_limit = 100
+    client.quota.set_budget("bulk", weekly=0.8)
+    
+    await client.request("GET", "/endpoint", priority="bulk")
+    
+    usage = client.quota.usage
+    assert usage.hourly_used == 1000
+    assert usage.weekly_used == 85
+    assert usage.throttle_state == "busy"
+    assert usage.services["search"] == ("black", 0)
+    assert client.quota.weekly_fraction == 0.85
+    
+    # Bulk work is now refused, interactive traffic keeps going
+    with pytest.raises(QuotaExceeded):
+        await client.request("GET", "/endpoint", priority="bulk")
+    with client.priority("bulk"):
+        with pytest.raises(QuotaExceeded):
+            await client.get("/endpoint")
+    await client.get("/endpoint")
+
+@pytest.mark.asyncio
+async def test_custom_transport(consumer_key: str, consumer_secret: str) -> None:
+    seen: List[str] = []
+    
+    def handler(request: httpx.Request) -> Response:
+        seen.append(request.url.path)
+        if request.url.path.endswith("/accesstoken"):
+            return Response(200, json={"access_token": "local", "expires_in": 1200})
+        return Response(200, text="<root><data>ok</data></root>")
+        
+    async with AsyncClient(consumer_key, consumer_secret, transport=httpx.MockTransport(handler)) as client:
+        data = await client.get_data("/endpoint")
+        
+    assert data == {"root": {"data": "ok"}}
+    assert seen == ["/3.2/auth/accesstoken", "/3.2/rest-services/endpoint"]
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from httpx import Response
+
+from typing import Any, Dict, List
+from epopy import AsyncClient
+from epopy import deadlines
+from epopy.deadlines import DeadlineExceeded
+from epopy.patent import Document
+
+def _transport(page_handler: Any, seen: List[Dict[str, Any]]) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> Response:
+        if request.url.path.endswith("/accesstoken"):
+            return Response(200, json={"access_token": "t", "expires_in": 1200})
+        seen.append(dict(request.extensions["timeout"]))
+        result: Response = await page_handler(request)
+        return result
+    return httpx.MockTransport(handler)
+
+def _document(client: AsyncClient, pages: int) -> Document:
+    return Document(client, "FullDocument", "published-data/images/EP/1/A1/fullimage", ["application/pdf"], pages)
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_page_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Document, "PAGE_DELAY", 0.0)
+    seen: List[Dict[str, Any]] = []
+    finished: List[str] = []
+    
+    async def slow(request: httpx.Request) -> Response:
+        await asyncio.sleep(0.2)
+        finished.append(request.url.params["range"])
+        return Response(200, content=b"%PDF-page")
+        
+    async with AsyncClient("k", "s", transport=_transport(slow, seen)) as client:
+        document = _document(client, 10)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await document.download(deadline=0.3)
+        elapsed = time.monotonic() - start
+        
+        # Concurrent siblings are cancelled as well, nothing keeps running
+        with pytest.raises(DeadlineExceeded):
+            async with client.deadline(0.1):
+                await document.download_pages(range(1, 6), "application/pdf", concurrency=5)
+        await asyncio.sleep(0.3)
+        
+    assert elapsed < 0.5
+    assert finished == ["1"]
+    # Request timeouts were cut down to the time left
+    assert all(timeouts["read"] <= 0.3 for timeouts in seen)
+    assert len([t for t in asyncio.all_tasks() if t is not asyncio.current_task()]) == 0
+
+@pytest.mark.asyncio
+async def test_backoff_fails_fast_within_deadline() -> None:
+    seen: List[Dict[str, Any]] = []
+    
+    async def failing(request: httpx.Request) -> Response:
+        return Response(500)
+        
+    async with AsyncClient("k", "s", transport=_transport(failing, seen)) as client:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded) as info:
+            await _document(client, 2).download(deadline=1.0)
+            
+    # The 2s back-off would overrun the deadline, so there is no point in waiting
+    assert time.monotonic() - start < 0.5
+    assert "would exceed the deadline" in str(info.value)
+    assert len(seen) == 2  # one attempt per page
+
+@pytest.mark.asyncio
+async def test_nested_deadlines_only_shorten() -> None:
+    assert deadlines.remaining() is None
+    async with deadlines.deadline(1.0):
+        async with deadlines.deadline(60.0):
+            left = deadlines.remaining()
+            assert left is not None and left <= 1.0
+        async with deadlines.deadline(0.5):
+            left = deadlines.remaining()
+            assert left is not None and left <= 0.5
+    assert deadlines.remaining() is None
+    
+    # Timeouts raised inside the block that are not the deadline pass through unchanged
+    with pytest.raises(TimeoutError) as info:
+        async with deadlines.deadline(10):
+            async with asyncio.timeout(0.01):
+                await asyncio.sleep(1)
+    assert not isinstance(info.value, DeadlineExceeded)
+
+@pytest.mark.asyncio
+async def test_shared_request_ignores_first_callers_deadline() -> None:
+    seen: List[Dict[str, Any]] = []
+    
+    async def slow(request: httpx.Request) -> Response:
+        await asyncio.sleep(0.3)
+        return Response(200, text="""<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+            <exchange-documents><exchange-document country="EP" doc-number="1" kind="A1"/></exchange-documents>
+        </ops:world-patent-data>""")
+        
+    async with AsyncClient("k", "s", transport=_transport(slow, seen)) as client:
+        patent = client.get_patent("EP.1.A1")
+        
+        async def impatient() -> Any:
+            async with client.deadline(0.1):
+                return await patent.biblio()
+                
+        results = await asyncio.gather(impatient(), patent.biblio(), return_exceptions=True)
+        
+    assert isinstance(results[0], DeadlineExceeded)
+    assert not isinstance(results[1], BaseException)
+    assert results[1].world_patent_data.exchange_documents is not None
+    # The shared request was not cut to the impatient caller's deadline
+    assert len(seen) == 1 and seen[0]["read"] == 30.0
@@ -80,3 +80,197 @@ def test_parse_decision_code_logic(decisions_parser: DecisionsParser):
     assert n == "0001"
     assert y == "2000"
 
+
+SAMPLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<ep-appeal-decisions>
+    <ep-appeal-decision lang="en">
+        <ep-appeal-bib-data>
+            <ep-case-num code="T"><ep-appeal-num>0641</ep-appeal-num><ep-year>2000</ep-year></ep-case-num>
+            <application-reference><document-id><doc-number>94302349</doc-number></document-id></application-reference>
+            <publication-reference><document-id><doc-number>0623868</doc-number></document-id></publication-reference>
+            <invention-title>Two identities/COMVIK</invention-title>
+        </ep-appeal-bib-data>
+        <ep-board-of-appeal-code>3.5.01</ep-board-of-appeal-code>
+        <ep-keywords><keyword>Inventive step - no</keyword></ep-keywords>
+        <ep-summary-of-facts><p>Facts one.</p><p>Facts two.</p></ep-summary-of-facts>
+        <ep-reasons-for-decision><p>Reasons one.</p></ep-reasons-for-decision>
+    </ep-appeal-decision>
+    <ep-appeal-decision lang="de">
+        <ep-appeal-bib-data>
+            <ep-case-num code="T"><ep-appeal-num>3069</ep-appeal-num><ep-year>2019</ep-year></ep-case-num>
+            <application-reference><document-id><doc-number>14197959</doc-number></document-id></application-reference>
+            <publication-reference><document-id><doc-number>2950346</doc-number></document-id></publication-reference>
+            <invention-title>Semiconductor radiation detector</invention-title>
+        </ep-appeal-bib-data>
+        <ep-board-of-appeal-code>3.4.03</ep-board-of-appeal-code>
+        <ep-keywords><keyword>Amendments - allowable (yes)</keyword></ep-keywords>
+        <ep-summary-of-facts><p>Detector facts.</p></ep-summary-of-facts>
+        <ep-reasons-for-decision><p>Detector reasons.</p></ep-reasons-for-decision>
+    </ep-appeal-decision>
+</ep-appeal-decisions>
+"""
+
+@pytest.fixture
+def sample_parser(tmp_path: Any) -> DecisionsParser:
+    path = tmp_path / "EPDecisions_sample.xml"
+    path.write_text(SAMPLE_XML, encoding="utf-8")
+    return DecisionsParser(path)
+
+def test_find_decision_sample(sample_parser: DecisionsParser) -> None:
+    decision = sample_parser.find_decision("T 3069/19")
+    assert decision is not None
+    assert decision.metadata.application_num == "14197959"
+    assert decision.metadata.language == "de"
+    assert decision.facts == "Detector facts."
+    assert decision.full_text == "SUMMARY OF FACTS\n\nDetector facts.\n\nREASONS FOR THE DECISION\n\nDetector reasons."
+
+    assert sample_parser.find_decision("T 1/19") is None
+
+def test_find_decision_fields_projection(sample_parser: DecisionsParser) -> None:
+    decision = sample_parser.find_decision("T 641/00", fields=[])
+    assert decision is not None
+    assert decision.metadata.board == "3.5.01"
+    assert decision.metadata.publication_num == "0623868"
+    assert decision.facts is None
+    assert decision.reasons is None
+
+    decision = sample_parser.find_decision("T 641/00", fields=["reasons"])
+    assert decision is not None
+    assert decision.facts is None
+    assert decision.reasons == "Reasons one."
+    # The full text is not rendered with sections missing
+    with pytest.raises(ValueError):
+        decision.full_text
+
+    with pytest.raises(ValueError):
+        sample_parser.find_decision("T 641/00", fields=["bogus"])
+
+def test_decision_positional_construction() -> None:
+    from epopy.decisions import Decision, DecisionMetadata
+    
+    metadata = DecisionMetadata(
+        decision_id="T 1/20", date_decision=None, board=None, keywords=[], headnotes=[],
+        application_num=None, publication_num=None, title=None, ipc_classes=[], language=None
+    )
+    decision = Decision(metadata, "Full text.", "Facts.", "Reasons.")
+    assert decision.full_text == "Full text."
+    assert (decision.facts, decision.reasons) == ("Facts.", "Reasons.")
+    assert Decision(metadata, facts="F", reasons="R").full_text.endswith("REASONS FOR THE DECISION\n\nR")
+
+def test_iter_decisions(sample_parser: DecisionsParser) -> None:
+    decisions = list(sample_parser.iter_decisions(fields=["full_text"]))
+    assert [d.metadata.decision_id for d in decisions] == ["T 641/00", "T 3069/19"]
+    assert decisions[0].facts == "Facts one.\n\nFacts two."
+    assert "Reasons one." in decisions[0].full_text
+
+def test_find_decision_mmap(sample_parser: DecisionsParser) -> None:
+    decision = sample_parser.find_decision("T 3069/19", use_mmap=True)
+    assert decision is not None
+    assert decision.metadata.title == "Semiconductor radiation detector"
+    assert decision.reasons == "Detector reasons."
+
+    # Same appeal number, different year: the candidate is rejected after parsing
+    assert sample_parser.find_decision("T 3069/20", use_mmap=True) is None
+    assert sample_parser.find_decision("T 9999/19", use_mmap=True) is None
+
+@pytest.mark.asyncio
+async def test_afind_decision(sample_parser: DecisionsParser) -> None:
+    decision = await sample_parser.afind_decision("T 641/00", fields=[])
+    assert decision is not None
+    assert decision.metadata.decision_id == "T 641/00"
+    assert decision.facts is None
+
+    assert await sample_parser.afind_decision("T 1/99") is None
+
+def test_find_mmap_checks_stop(sample_parser: DecisionsParser) -> None:
+    import threading
+    
+    stop = threading.Event()
+    stop.set()
+    target = sample_parser.parse_decision_code("T 3069/19")
+    assert sample_parser._find(target, "T 3069/19", frozenset(), use_mmap=True, stop=stop) is None
+    assert sample_parser._find(target, "T 3069/19", frozenset(), use_mmap=True) is not None
+
+@pytest.mark.asyncio
+async def test_aiter_decisions(sample_parser: DecisionsParser) -> None:
+    ids = [d.metadata.decision_id async for d in sample_parser.aiter_decisions(maxsize=1)]
+    assert ids == ["T 641/00", "T 3069/19"]
+
+    # A one-shot iterable of fields is read only once
+    decisions = [d async for d in sample_parser.aiter_decisions(fields=(f for f in ["facts"]))]
+    assert [d.facts for d in decisions] == ["Facts one.\n\nFacts two.", "Detector facts."]
+
+    # Stopping early must not hang the worker
+    async for decision in sample_parser.aiter_decisions(maxsize=1):
+        assert decision.metadata.decision_id == "T 641/00"
+        break
+
+def test_find_decisions_batch(sample_parser: DecisionsParser) -> None:
+    results = sample_parser.find_decisions(["T 3069/19", "T 641/00", "T 1/19"], fields=[])
+    assert set(results) == {"T 3069/19", "T 641/00", "T 1/19"}
+    assert results["T 3069/19"] is not None
+    assert results["T 3069/19"].metadata.title == "Semiconductor radiation detector"
+    assert results["T 641/00"] is not None
+    assert results["T 1/19"] is None
+
+def test_indexed_lookup(sample_parser: DecisionsParser) -> None:
+    assert sample_parser.build_index() == 2
+    
+    decision = sample_parser.find_decision("T 641/00")
+    assert decision is not None
+    assert decision.facts == "Facts one.\n\nFacts two."
+    assert sample_parser.find_decision("T 3069/20") is None
+    
+    results = sample_parser.find_decisions(["T 3069/19", "T 9999/19"])
+    assert results["T 3069/19"] is not None
+    assert results["T 3069/19"].reasons == "Detector reasons."
+    assert results["T 9999/19"] is None
+
+def test_indexed_lookup_matches_streaming_layout(sample_parser: DecisionsParser) -> None:
+    # Attributes, whitespace, comments and other elements inside the case number
+    layout = SAMPLE_XML.replace(
+        '<ep-case-num code="T"><ep-appeal-num>3069</ep-appeal-num><ep-year>2019</ep-year></ep-case-num>',
+        """<ep-case-num code="T" kind="appeal">
+                <!-- case -->
+                <ep-appeal-num type="x">3069</ep-appeal-num>
+                <ep-case-suffix/>
+                <ep-year>2019</ep-year>
+            </ep-case-num>"""
+    )
+    sample_parser.xml_path.write_text(layout, encoding="utf-8")
+    
+    mmap_decision = sample_parser.find_decision("T 3069/19", use_mmap=True)
+    assert mmap_decision is not None and mmap_decision.reasons == "Detector reasons."
+    
+    assert sample_parser.build_index() == 2
+    decision = sample_parser.find_decision("T 3069/19")
+    assert decision is not None
+    assert decision.reasons == "Detector reasons."
+    assert sample_parser.find_decisions(["T 3069/19"])["T 3069/19"] is not None
+
+def test_stale_index_not_used_with_mmap(sample_parser: DecisionsParser) -> None:
+    sample_parser.build_index()
+    # Same size, so only the mtime tells the change
+    sample_parser.xml_path.write_text(SAMPLE_XML.replace("3069", "3070"), encoding="utf-8")
+    
+    decision = sample_parser.find_decision("T 3070/19", use_mmap=True)
+    assert decision is not None and decision.reasons == "Detector reasons."
+    assert sample_parser._index is None
+
+def test_indexed_lookup_checks_case_number(sample_parser: DecisionsParser) -> None:
+    sample_parser.build_index()
+    assert sample_parser._index is not None
+    # A range pointing at another decision is not returned under the requested code
+    sample_parser._index[("T", "0641", "2000")] = sample_parser._index[("T", "3069", "2019")]
+    
+    decision = sample_parser.find_decision("T 641/00")
+    assert decision is not None
+    assert decision.facts == "Facts one.\n\nFacts two."
+    assert sample_parser._index is None
+
+def test_index_dropped_when_file_changes(sample_parser: DecisionsParser) -> None:
+    sample_parser.build_index()
+    sample_parser.xml_path.write_text(SAMPLE_XML.replace("3069", "13070"), encoding="utf-8")
+    
+    assert sample_parser.find_decision("T 13070/19") is not None
+    assert sample_parser._index is None
@@ -49,3 +49,63 @@ async def test_download_image_custom_params(client: AsyncClient, mock_token: Non
     last_request = route.calls.last.request
     assert last_request.headers["Accept"] == "application/tiff"
     assert last_request.url.params["range"] == "2"
+
+def _pdf_page() -> bytes:
+    from io import BytesIO
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+@pytest.mark.asyncio
+async def test_download_section_pages(client: AsyncClient, mock_token: None, respx_mock: Any, monkeypatch: Any) -> None:
+    from io import BytesIO
+    from pypdf import PdfReader
+    from epopy.patent import Document
+    
+    monkeypatch.setattr(Document, "PAGE_DELAY", 0)
+    doc = Document(
+        client, "FullDocument", "published-data/images/EP/1000000/A1/fullimage", ["application/pdf"],
+        number_of_pages=9,
+        sections=[
+            {"@name": "ABSTRACT", "@start-page": "1"},
+            {"@name": "BIBLIOGRAPHY", "@start-page": "1"},
+            {"@name": "DESCRIPTION", "@start-page": "2"},
+            {"@name": "CLAIMS", "@start-page": "5"},
+            {"@name": "DRAWINGS", "@start-page": "7"},
+        ]
+    )
+    assert doc.section_pages("claims") == [5, 6]
+    assert doc.section_pages("DRAWINGS") == [7, 8, 9]
+    assert doc.section_pages("ABSTRACT") == [1]
+    with pytest.raises(ValueError):
+        doc.section_pages("SEARCH_REPORT")
+    
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/images/EP/1000000/A1/fullimage").mock(
+        return_value=Response(200, content=_pdf_page())
+    )
+    
+    content = await doc.download_section("DRAWINGS")
+    assert len(PdfReader(BytesIO(content)).pages) == 3
+    assert sorted(call.request.url.params["range"] for call in route.calls) == ["7", "8", "9"]
+    
+    content = await doc.download_sections(["CLAIMS", "DRAWINGS"])
+    assert len(PdfReader(BytesIO(content)).pages) == 5
+    assert route.call_count == 8
+
+@pytest.mark.asyncio
+async def test_download_raises_failing_page_error(client: AsyncClient, mock_token: None, respx_mock: Any, monkeypatch: Any) -> None:
+    import httpx
+    from epopy.patent import Document
+    
+    monkeypatch.setattr(Document, "PAGE_DELAY", 0)
+    monkeypatch.setattr(Document, "RETRY_DELAY", 0)
+    doc = Document(client, "FullDocument", "published-data/images/EP/1000000/A1/fullimage", ["application/pdf"], number_of_pages=3)
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/images/EP/1000000/A1/fullimage").mock(
+        side_effect=lambda request: Response(500 if request.url.params["range"] == "2" else 200, content=_pdf_page())
+    )
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await doc.download()
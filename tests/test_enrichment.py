@@ -0,0 +1,54 @@
+import pytest
+from httpx import Response
+from typing import Any
+from epopy import AsyncClient
+from epopy.decisions import Decision, DecisionMetadata
+from epopy.enrichment import enrich_decisions
+
+BATCH_XML = """
+<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <exchange-documents>
+        <exchange-document country="EP" doc-number="2950346" kind="A2" family-id="1">
+            <bibliographic-data><invention-title>Detector</invention-title></bibliographic-data>
+        </exchange-document>
+        <exchange-document country="EP" doc-number="0623868" kind="A1" family-id="2">
+            <bibliographic-data><invention-title>Identities</invention-title></bibliographic-data>
+        </exchange-document>
+    </exchange-documents>
+</ops:world-patent-data>
+"""
+
+def _decision(decision_id: str, publication_num: str | None) -> Decision:
+    metadata = DecisionMetadata(
+        decision_id=decision_id, date_decision=None, board=None, keywords=[], headnotes=[],
+        application_num=None, publication_num=publication_num, title=None, ipc_classes=[], language=None
+    )
+    return Decision(metadata=metadata)
+
+@pytest.mark.asyncio
+async def test_enrich_decisions(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.post("https://ops.epo.org/3.2/rest-services/published-data/publication/epodoc/biblio").mock(
+        return_value=Response(200, text=BATCH_XML)
+    )
+    decisions = [
+        _decision("T 3069/19", "2950346"),
+        _decision("T 1/20", "2950346"),
+        _decision("T 641/00", "0623868"),
+        _decision("G 1/19", None),
+    ]
+    
+    enriched = await enrich_decisions(client, decisions)
+    
+    assert route.call_count == 1
+    assert route.calls.last.request.content == b"EP2950346,EP0623868"
+    assert [e.publication_number for e in enriched] == ["EP2950346", "EP2950346", "EP0623868", None]
+    
+    patent_data = enriched[0].patent_data
+    assert patent_data is not None and patent_data.world_patent_data.exchange_documents is not None
+    docs = patent_data.world_patent_data.exchange_documents.exchange_document
+    assert isinstance(docs, list) and docs[0].doc_number == "2950346"
+    assert enriched[3].patent_data is None
+    
+    # Second pass is served from the per-number cache
+    await enrich_decisions(client, decisions)
+    assert route.call_count == 1
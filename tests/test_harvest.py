@@ -0,0 +1,66 @@
+import json
+import pytest
+from httpx import Response
+from pathlib import Path
+from typing import Any, List
+from epopy import AsyncClient
+from epopy.harvest import HarvestStats
+
+SEARCH_XML = """
+<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:biblio-search total-result-count="2">
+        <ops:search-result>
+            <ops:publication-reference><document-id document-id-type="docdb">
+                <country>EP</country><doc-number>1000000</doc-number><kind>A1</kind></document-id></ops:publication-reference>
+            <ops:publication-reference><document-id document-id-type="docdb">
+                <country>EP</country><doc-number>1000001</doc-number><kind>A1</kind></document-id></ops:publication-reference>
+        </ops:search-result>
+    </ops:biblio-search>
+</ops:world-patent-data>
+"""
+
+def _images_xml(num: str) -> str:
+    return f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:document-inquiry><ops:inquiry-result>
+        <ops:document-instance desc="FullDocument" link="images/EP/{num}/A1/fullimage" number-of-pages="1">
+            <ops:document-format-options><ops:document-format>application/pdf</ops:document-format></ops:document-format-options>
+        </ops:document-instance>
+        <ops:document-instance desc="Drawing" link="images/EP/{num}/A1/thumbnail" number-of-pages="1">
+            <ops:document-format-options><ops:document-format>application/pdf</ops:document-format></ops:document-format-options>
+        </ops:document-instance>
+    </ops:inquiry-result></ops:document-inquiry>
+</ops:world-patent-data>"""
+
+@pytest.mark.asyncio
+async def test_harvest_and_resume(client: AsyncClient, mock_token: None, respx_mock: Any, tmp_path: Path) -> None:
+    base = "https://ops.epo.org/3.2/rest-services"
+    respx_mock.get(f"{base}/published-data/search").mock(return_value=Response(200, text=SEARCH_XML))
+    downloads = []
+    for num in ("1000000", "1000001"):
+        respx_mock.get(f"{base}/published-data/publication/docdb/EP.{num}.A1/images").mock(
+            return_value=Response(200, text=_images_xml(num))
+        )
+        downloads.append(respx_mock.get(f"{base}/images/EP/{num}/A1/fullimage").mock(
+            return_value=Response(200, content=f"%PDF-{num}".encode())
+        ))
+        
+    progress: List[int] = []
+    stats = await client.harvest(
+        "ti=plastic", out_dir=tmp_path, doc_types=["FullDocument"],
+        on_progress=lambda s: progress.append(s.documents)
+    )
+    
+    assert isinstance(stats, HarvestStats)
+    assert stats.patents == 2
+    assert stats.documents == 2
+    assert stats.bytes == 2 * len(b"%PDF-1000000")
+    assert sorted(progress) == [1, 2]
+    assert (tmp_path / "EP.1000000.A1_FullDocument.pdf").read_bytes() == b"%PDF-1000000"
+    manifest = [json.loads(line) for line in (tmp_path / "manifest.jsonl").read_text().splitlines()]
+    assert sorted(m["key"] for m in manifest) == ["EP.1000000.A1/FullDocument", "EP.1000001.A1/FullDocument"]
+    
+    # A second run resumes from the manifest and downloads nothing
+    stats = await client.harvest("ti=plastic", out_dir=tmp_path, doc_types=["FullDocument"])
+    assert stats.documents == 0
+    assert stats.skipped == 2
+    assert all(route.call_count == 1 for route in downloads)
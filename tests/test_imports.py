@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("httpx", "pydantic", "lxml", "pypdf", "xmltodict")
+
+def _loaded_after(code: str) -> set[str]:
+    """Runs code in a fresh interpreter and returns which heavy modules it loaded."""
+    script = f"import sys\n{code}\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    return set(output.split())
+
+def test_import_is_lazy() -> None:
+    assert _loaded_after("import epopy") == set()
+    assert _loaded_after("import epopy.decisions") == {"lxml"}
+    # Constructing a client needs httpx, but models, xmltodict and pypdf wait for a response
+    assert _loaded_after("from epopy import AsyncClient; AsyncClient('key', 'secret')") == {"httpx"}
+
+def test_lazy_attributes() -> None:
+    import epopy
+    from epopy.client import AsyncClient
+    from epopy.models import OPSResponse
+    
+    assert epopy.AsyncClient is AsyncClient
+    assert epopy.OPSResponse is OPSResponse
+    assert "AsyncClient" in dir(epopy)
+    with pytest.raises(AttributeError):
+        epopy.DoesNotExist
@@ -0,0 +1,87 @@
+import pytest
+
+from httpx import Response
+
+from typing import Any, List
+from epopy import AsyncClient
+from epopy.instrumentation import Event, Instrumentation, StatsCollector, endpoint_family
+
+BIBLIO_XML = """
+<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+    <exchange-documents>
+        <exchange-document country="EP" doc-number="1234567" kind="A1"/>
+    </exchange-documents>
+</ops:world-patent-data>
+"""
+
+def test_endpoint_family() -> None:
+    assert endpoint_family("/published-data/search/biblio") == "search"
+    assert endpoint_family("published-data/images/EP/1234567/A1/fullimage") == "images"
+    assert endpoint_family("/published-data/publication/docdb/EP1234567/biblio") == "retrieval:biblio"
+    assert endpoint_family("/number-service/publication/original/docdb") == "number-service"
+
+def test_hook_errors_are_swallowed() -> None:
+    instrumentation = Instrumentation()
+    received: List[Event] = []
+    
+    def broken(event: Event) -> None:
+        raise RuntimeError("boom")
+        
+    instrumentation.add_hook(broken)
+    instrumentation.add_hook(received.append)
+    instrumentation.emit("cache", "search", hit=True)
+    
+    assert len(received) == 1
+    assert received[0].attributes == {"hit": True}
+
+@pytest.mark.asyncio
+async def test_request_and_parse_events(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP1234567/biblio").mock(
+        return_value=Response(
+            200,
+            text=BIBLIO_XML,
+            headers={
+                "X-Throttling-Control": "idle (images=green:200, retrieval=green:200, search=green:30)",
+                "X-IndividualQuotaPerHour-Used": "1000",
+            }
+        )
+    )
+    events: List[Event] = []
+    client.instrumentation.add_hook(events.append)
+    stats = client.instrumentation.enable_stats()
+    
+    patent = client.get_patent("EP1234567")
+    await patent.biblio()
+    await patent.biblio()
+    
+    request = next(e for e in events if e.kind == "request")
+    assert request.name == "retrieval:biblio"
+    assert request.attributes["status"] == 200
+    assert request.attributes["priority"] == "interactive"
+    assert request.attributes["bytes"] > 0
+    assert {"token_time", "queue_time", "network_time"} <= set(request.attributes)
+    assert any(e.kind == "parse" for e in events)
+    assert any(e.kind == "validate" for e in events)
+    
+    summary = stats.summary()
+    assert summary["status"] == {"retrieval:biblio:200": 1}
+    assert summary["latency"]["request:retrieval:biblio"]["count"] == 1
+    assert summary["cache_hit_rate"]["patent"] == 0.5
+    assert summary["throttle"]["hourly_used"] == 1000
+    assert summary["throttle"]["state"] == "idle"
+    assert next(e for e in events if e.kind == "throttle").name == "idle"
+    assert summary["throttle"]["services"]["search"] == "green"
+
+@pytest.mark.asyncio
+async def test_error_requests_are_counted(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        return_value=Response(404, text="<error/>")
+    )
+    stats = StatsCollector()
+    client.instrumentation.add_hook(stats)
+    
+    with pytest.raises(Exception):
+        await client.search.published_data_search("ti=nothing")
+        
+    assert stats.status_counts == {("search", 404): 1}
+    assert stats.errors == {"search": 1}
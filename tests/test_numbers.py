@@ -0,0 +1,56 @@
+import pytest
+from httpx import Response
+from typing import Any
+from epopy import AsyncClient
+from epopy.numbers import PatentNumber, normalize_number, parse_number
+
+def test_parse_number_formats() -> None:
+    assert parse_number("EP.1234567.A1") == PatentNumber("EP", "1234567", "A1")
+    assert parse_number("EP1234567A1") == PatentNumber("EP", "1234567", "A1")
+    assert parse_number("ep 1 234 567 a1") == PatentNumber("EP", "1234567", "A1")
+    assert parse_number("EP623868") == PatentNumber("EP", "0623868")
+    assert parse_number("WO 2020/12345 A1") == PatentNumber("WO", "2020012345", "A1")
+    assert parse_number("US 2020/0123456 A1") == PatentNumber("US", "2020123456", "A1")
+    assert parse_number("US20200123456A1") == parse_number("US.2020123456.A1") == PatentNumber("US", "2020123456", "A1")
+    assert parse_number("US 11000000 B2") == PatentNumber("US", "11000000", "B2")
+    assert parse_number("USRE12345E") == PatentNumber("US", "RE12345", "E")
+    
+    with pytest.raises(ValueError):
+        parse_number("not a number")
+
+def test_normalize_number_cache_key() -> None:
+    assert normalize_number("EP 1234567 A1") == normalize_number("EP.1234567.A1") == "EP.1234567.A1"
+    assert normalize_number("EP.1234567.A1", "epodoc") == "EP1234567"
+    assert normalize_number(" garbage ") == "garbage"
+
+def test_patent_normalize(client: AsyncClient) -> None:
+    patent = client.get_patent("ep 1234567 a1", normalize=True)
+    assert patent.number == "EP.1234567.A1"
+    assert patent.key == "EP.1234567.A1"
+    assert client.get_patent("EP1234567", format="epodoc").parsed == PatentNumber("EP", "1234567")
+
+@pytest.mark.asyncio
+async def test_convert_numbers(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    route = respx_mock.post("https://ops.epo.org/3.2/rest-services/number-service/application/original/docdb").mock(
+        return_value=Response(200, text="""
+        <ops:world-patent-data xmlns:ops="http://ops.epo.org">
+            <ops:standardization inputFormat="original" outputFormat="docdb">
+                <ops:output>
+                    <ops:application-reference>
+                        <document-id document-id-type="docdb">
+                            <country>JP</country><doc-number>2006147056</doc-number><kind>A</kind>
+                        </document-id>
+                    </ops:application-reference>
+                </ops:output>
+            </ops:standardization>
+        </ops:world-patent-data>""")
+    )
+    
+    converted = await client.published_data.convert_numbers(["JP.(2006-147056).A"], reference_type="application")
+    assert converted == {"JP.(2006-147056).A": "JP.2006147056.A"}
+    await client.published_data.convert_numbers(["JP.(2006-147056).A"], reference_type="application")
+    assert route.call_count == 1
+    
+    # docdb <-> epodoc publication conversions never hit the API
+    local = await client.published_data.convert_numbers(["EP.1234567.A1"], input_format="docdb", output_format="epodoc")
+    assert local == {"EP.1234567.A1": "EP1234567"}
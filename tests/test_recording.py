@@ -0,0 +1,99 @@
+import httpx
+import pytest
+
+from httpx import Response
+
+from pathlib import Path
+from typing import List
+from epopy import AsyncClient
+from epopy.recording import RecordingTransport, ReplayMiss, ReplayTransport
+
+BIBLIO_XML = """<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+    <exchange-documents><exchange-document country="EP" doc-number="1000000" kind="A1"/></exchange-documents>
+</ops:world-patent-data>"""
+
+SEARCH_XML = """<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+    <ops:biblio-search total-result-count="{total}"><ops:search-result/></ops:biblio-search>
+</ops:world-patent-data>"""
+
+def _ops(seen: List[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> Response:
+        seen.append(request.url.path)
+        if request.url.path.endswith("/accesstoken"):
+            return Response(200, json={"access_token": "secret-token", "expires_in": 1200})
+        if "search" in request.url.path:
+            # The answer depends on the requested range
+            return Response(200, text=SEARCH_XML.format(total=request.headers["Range"].split("-")[0]))
+        return Response(200, text=BIBLIO_XML, headers={"X-Throttling-Control": "idle (retrieval=green:200)"})
+    return httpx.MockTransport(handler)
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path: Path) -> None:
+    archive = tmp_path / "crawl.jsonl.gz"
+    seen: List[str] = []
+    recorder = RecordingTransport(archive, transport=_ops(seen))
+    async with AsyncClient("key", "secret", transport=recorder) as client:
+        recorded = await client.get_patent("EP.1000000.A1").biblio()
+        await client.search.published_data_search("ti=x", start=1, end=25)
+        await client.search.published_data_search("ti=x", start=26, end=50)
+    assert recorder.recorded == 3
+    assert b"secret-token" not in archive.read_bytes()
+    
+    replay = ReplayTransport(archive)
+    assert len(replay) == 3
+    async with AsyncClient("offline", "offline", transport=replay) as client:
+        replayed = await client.get_patent("EP.1000000.A1").biblio()
+        second = await client.search.published_data_search("ti=x", start=26, end=50)
+        
+    assert replayed.model_dump() == recorded.model_dump()
+    assert second.world_patent_data.biblio_search is not None
+    assert second.world_patent_data.biblio_search.total_result_count == 26
+    assert client.quota.usage.throttle_state == "idle"
+    assert len(seen) == 4  # token + 3 requests, none during replay
+
+@pytest.mark.asyncio
+async def test_replay_miss(tmp_path: Path) -> None:
+    archive = tmp_path / "empty.jsonl.gz"
+    async with AsyncClient("key", "secret", transport=RecordingTransport(archive, transport=_ops([]))) as client:
+        await client.get_patent("EP.1000000.A1").biblio()
+        
+    async with AsyncClient("offline", "offline", transport=ReplayTransport(archive)) as client:
+        with pytest.raises(ReplayMiss):
+            await client.get_patent("EP.2000000.A1").biblio()
+            
+    lenient = ReplayTransport(archive, strict=False)
+    async with AsyncClient("offline", "offline", transport=lenient) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_patent("EP.2000000.A1").biblio()
+    assert lenient.misses == 1
+
+@pytest.mark.asyncio
+async def test_recording_without_client_context(tmp_path: Path) -> None:
+    # Per-request clients share the transport instead of closing it after each request
+    archive = tmp_path / "crawl.jsonl.gz"
+    recorder = RecordingTransport(archive, transport=_ops([]))
+    client = AsyncClient("key", "secret", transport=recorder)
+    await client.get_patent("EP.1000000.A1").biblio()
+    await client.search.published_data_search("ti=x", start=1, end=25)
+    assert recorder._file is not None
+    await recorder.aclose()
+    await recorder.aclose()
+    
+    assert recorder.recorded == 2
+    assert len(ReplayTransport(archive)) == 2
+
+@pytest.mark.asyncio
+async def test_replay_truncated_archive(tmp_path: Path) -> None:
+    # The archive of a crawl killed before aclose() is read up to its last complete entry
+    archive = tmp_path / "crawl.jsonl.gz"
+    recorder = RecordingTransport(archive, transport=_ops([]))
+    async with AsyncClient("key", "secret", transport=recorder) as client:
+        for start in range(1, 31):
+            await client.search.published_data_search("ti=x", start=start, end=start)
+        killed = archive.read_bytes()
+    
+    copy = tmp_path / "killed.jsonl.gz"
+    copy.write_bytes(killed)
+    assert len(ReplayTransport(copy)) == 30
+    copy.write_bytes(killed[:-10])
+    assert len(ReplayTransport(copy)) == 29
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from httpx import Response
+from typing import Any, List
+from epopy import AsyncClient
+from epopy.scheduler import PriorityClass, RequestScheduler
+
+@pytest.mark.asyncio
+async def test_scheduler_prefers_interactive() -> None:
+    scheduler = RequestScheduler(max_concurrency=1)
+    order: List[str] = []
+    
+    async def _request(priority: str) -> None:
+        async with scheduler.slot(priority):
+            order.append(priority)
+            await asyncio.sleep(0)
+            
+    await scheduler.acquire("bulk")
+    tasks = [asyncio.create_task(_request("bulk")) for _ in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_request("interactive")))
+    await asyncio.sleep(0)
+    assert scheduler.waiting == {"bulk": 3, "interactive": 1}
+    
+    scheduler.release("bulk")
+    await asyncio.gather(*tasks)
+    # The interactive call overtakes the queued bulk work
+    assert order[0] == "interactive"
+
+@pytest.mark.asyncio
+async def test_scheduler_class_concurrency_cap() -> None:
+    scheduler = RequestScheduler(max_concurrency=10, classes={"bulk": PriorityClass(max_concurrency=2)})
+    active = 0
+    peak = 0
+    
+    async def _request() -> None:
+        nonlocal active, peak
+        async with scheduler.slot("bulk"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            
+    await asyncio.gather(*(_request() for _ in range(6)))
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter() -> None:
+    scheduler = RequestScheduler(max_concurrency=1)
+    await scheduler.acquire("bulk")
+    waiter = asyncio.create_task(scheduler.acquire("bulk"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    scheduler.release("bulk")
+    
+    # The slot is free again
+    await asyncio.wait_for(scheduler.acquire("interactive"), timeout=1)
+
+@pytest.mark.asyncio
+async def test_patent_priority_tag(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    from epopy.quota import QuotaExceeded
+    
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP.1000000.A1/biblio").mock(
+        return_value=Response(200, text="<ops:world-patent-data xmlns:ops='http://ops.epo.org'/>")
+    )
+    client.quota.usage.weekly_used = client.quota.weekly_limit
+    client.quota.set_budget("bulk", weekly=0.5)
+    
+    with pytest.raises(QuotaExceeded):
+        await client.get_patent("EP.1000000.A1", priority="bulk").biblio()
+    await client.get_patent("EP.1000000.A1").biblio()
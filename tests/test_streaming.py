@@ -0,0 +1,216 @@
+import asyncio
+import httpx
+import pytest
+import xmltodict
+
+from httpx import Response
+
+from typing import Any, AsyncIterator, Dict, List
+from epopy import AsyncClient
+from epopy.scheduler import RequestScheduler
+from epopy.streaming import ElementStream
+
+SEARCH_BIBLIO_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+    <ops:biblio-search total-result-count="2">
+        <ops:query>ti=plastic</ops:query>
+        <ops:search-result>
+            <exchange-documents>
+                <exchange-document country="EP" doc-number="1000000" kind="A1" family-id="10">
+                    <bibliographic-data>
+                        <publication-reference><document-id><doc-number>1000000</doc-number></document-id></publication-reference>
+                        <invention-title lang="en">Plastic &amp; one</invention-title>
+                    </bibliographic-data>
+                </exchange-document>
+            </exchange-documents>
+            <exchange-documents>
+                <exchange-document country="WO" doc-number="2020123456" kind="A1" family-id="11">
+                    <bibliographic-data><invention-title>Plastic two</invention-title></bibliographic-data>
+                </exchange-document>
+            </exchange-documents>
+        </ops:search-result>
+    </ops:biblio-search>
+</ops:world-patent-data>"""
+
+def _refs_xml(total: int, start: int, end: int) -> str:
+    refs = "".join(
+        f"""<ops:publication-reference family-id="{i}">
+            <document-id document-id-type="docdb">
+                <country>EP</country><doc-number>{1000000 + i}</doc-number><kind>A1</kind>
+            </document-id>
+        </ops:publication-reference>"""
+        for i in range(start, min(end, total) + 1)
+    )
+    return f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+        <ops:biblio-search total-result-count="{total}">
+            <ops:search-result>{refs}</ops:search-result>
+        </ops:biblio-search>
+    </ops:world-patent-data>"""
+
+def test_element_stream_matches_full_parse() -> None:
+    # Tiny chunks split tags, entities and attributes
+    stream = ElementStream(["exchange-document"])
+    data = SEARCH_BIBLIO_XML.encode("utf-8")
+    streamed: List[Dict[str, Any]] = []
+    for i in range(0, len(data), 7):
+        streamed.extend(stream.feed(data[i:i + 7]))
+    streamed.extend(stream.close())
+
+    result = xmltodict.parse(SEARCH_BIBLIO_XML)["ops:world-patent-data"]["ops:biblio-search"]["ops:search-result"]
+    assert streamed == [wrapper["exchange-document"] for wrapper in result["exchange-documents"]]
+    assert stream.count == 2
+    assert stream.attributes("ops:biblio-search") == {"total-result-count": "2"}
+
+def test_element_stream_edge_cases_match_full_parse() -> None:
+    xml = """<ops:world-patent-data xmlns:ops="http://ops.epo.org" xmlns="http://www.epo.org/exchange">
+        <exchange-document country="EP">
+            <!-- comment -->
+            <abstract lang="en"><p>Text with <b>bold</b> tail</p><p/></abstract>
+            <ftxt:claims xmlns:ftxt="http://www.epo.org/fulltext" xml:lang="en">
+                <ftxt:claim ftxt:num="1">One</ftxt:claim>
+                <ftxt:claim ftxt:num="2">Two</ftxt:claim>
+            </ftxt:claims>
+            <ops:meta name="x"/>
+        </exchange-document>
+    </ops:world-patent-data>"""
+    stream = ElementStream(["exchange-document"])
+    streamed = stream.feed(xml.encode("utf-8")) + stream.close()
+    assert streamed == [xmltodict.parse(xml)["ops:world-patent-data"]["exchange-document"]]
+
+def test_element_stream_prefix_selects_element() -> None:
+    # ops:publication-reference hits, not the publication-reference inside exchange documents
+    stream = ElementStream(["ops:publication-reference"])
+    assert stream.feed(SEARCH_BIBLIO_XML.encode("utf-8")) + stream.close() == []
+
+    stream = ElementStream(["ops:publication-reference"])
+    xml = _refs_xml(3, 1, 3)
+    streamed = stream.feed(xml.encode("utf-8")) + stream.close()
+    assert streamed == xmltodict.parse(xml)["ops:world-patent-data"]["ops:biblio-search"]["ops:search-result"]["ops:publication-reference"]
+
+@pytest.mark.asyncio
+async def test_stream_elements_yields_before_body_ends() -> None:
+    release = asyncio.Event()
+    body = _refs_xml(2, 1, 2).encode("utf-8")
+    split = body.index(b"</ops:publication-reference>") + len(b"</ops:publication-reference>")
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        yield body[:split]
+        await release.wait()
+        yield body[split:]
+
+    def handler(request: httpx.Request) -> Response:
+        if request.url.path.endswith("/accesstoken"):
+            return Response(200, json={"access_token": "token", "expires_in": 1200})
+        return Response(200, content=_chunks())
+
+    async with AsyncClient("key", "secret", transport=httpx.MockTransport(handler)) as client:
+        stats = client.instrumentation.enable_stats()
+        elements = client.stream_elements("GET", "/published-data/search", ["ops:publication-reference"])
+        first = await anext(elements)
+        assert first["@family-id"] == "1"
+        release.set()
+        rest = [element async for element in elements]
+
+    assert [element["@family-id"] for element in rest] == ["2"]
+    assert stats.histograms[("parse", "search")].count == 1
+
+@pytest.mark.asyncio
+async def test_stream_hits_fills_result_cache(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    def _respond(request: Any) -> Response:
+        start, end = (int(x) for x in request.headers["Range"].split("-"))
+        return Response(200, text=_refs_xml(150, start, end))
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(side_effect=_respond)
+
+    hits = [hit async for hit in client.search.stream_hits("ti=plastic", start=1, end=120)]
+
+    assert [hit["@family-id"] for hit in hits] == [str(i) for i in range(1, 121)]
+    assert [call.request.headers["Range"] for call in route.calls] == ["1-100", "101-120"]
+    total, cached = await client.search.search_hits("ti=plastic", start=90, end=110)
+    assert total == 150 and len(cached) == 21
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_stream_documents_skips_unknown_batches(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    def _respond(request: Any) -> Response:
+        numbers = request.content.decode().split(",")
+        if "EP.9999999.A1" in numbers:
+            return Response(404, text="<fault><code>SERVER.EntityNotFound</code></fault>")
+        documents = "".join(
+            f'<exchange-document country="EP" doc-number="{n.split(".")[1]}" kind="A1"/>' for n in numbers
+        )
+        return Response(200, text=f"""<ops:world-patent-data xmlns:ops="http://ops.epo.org">
+            <exchange-documents>{documents}</exchange-documents></ops:world-patent-data>""")
+    route = respx_mock.post("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/biblio").mock(
+        side_effect=_respond
+    )
+
+    numbers = [f"EP.{1000000 + i}.A1" for i in range(100)] + ["EP.9999999.A1", "EP.1000000.A1"]
+    documents = [doc async for doc in client.published_data.stream_documents("publication", "docdb", numbers)]
+
+    assert len(documents) == 100
+    assert documents[0] == {"@country": "EP", "@doc-number": "1000000", "@kind": "A1"}
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_stream_hits_stops_at_total(client: AsyncClient, mock_token: None, respx_mock: Any) -> None:
+    def _respond(request: Any) -> Response:
+        start, end = (int(x) for x in request.headers["Range"].split("-"))
+        if start > 100:
+            return Response(404, text="<fault><code>SERVER.EntityNotFound</code></fault>")
+        return Response(200, text=_refs_xml(100, start, end))
+    route = respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(side_effect=_respond)
+
+    hits = [hit async for hit in client.search.stream_hits("ti=plastic", start=1, end=200)]
+
+    assert len(hits) == 100
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_stream_hits_releases_slot_for_loop_body(mock_token: None, respx_mock: Any) -> None:
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/search").mock(
+        return_value=Response(200, text=_refs_xml(2, 1, 2))
+    )
+    respx_mock.get("https://ops.epo.org/3.2/rest-services/published-data/publication/docdb/EP1/biblio").mock(
+        return_value=Response(200, text="<ops:world-patent-data xmlns:ops=\"http://ops.epo.org\"/>")
+    )
+
+    async def _consume() -> List[Dict[str, Any]]:
+        hits = []
+        async for hit in client.search.stream_hits("ti=plastic", start=1, end=2):
+            # Same priority class as the stream, with a single slot overall
+            await client.get_data("/published-data/publication/docdb/EP1/biblio")
+            hits.append(hit)
+        return hits
+
+    async with AsyncClient("key", "secret", scheduler=RequestScheduler(max_concurrency=1)) as client:
+        stats = client.instrumentation.enable_stats()
+        hits = await asyncio.wait_for(_consume(), timeout=5)
+
+    assert [hit["@family-id"] for hit in hits] == ["1", "2"]
+    assert stats.errors == {}
+
+@pytest.mark.asyncio
+async def test_stream_elements_closed_early_is_not_an_error() -> None:
+    release = asyncio.Event()
+    body = _refs_xml(2, 1, 2).encode("utf-8")
+    split = body.index(b"</ops:publication-reference>") + len(b"</ops:publication-reference>")
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        yield body[:split]
+        await release.wait()
+        yield body[split:]
+
+    def handler(request: httpx.Request) -> Response:
+        if request.url.path.endswith("/accesstoken"):
+            return Response(200, json={"access_token": "token", "expires_in": 1200})
+        return Response(200, content=_chunks())
+
+    async with AsyncClient("key", "secret", transport=httpx.MockTransport(handler)) as client:
+        stats = client.instrumentation.enable_stats()
+        elements = client.stream_elements("GET", "/published-data/search", ["ops:publication-reference"])
+        first = await anext(elements)
+        await elements.aclose()
+
+    assert first["@family-id"] == "1"
+    assert stats.histograms[("request", "search")].count == 1
+    assert stats.errors == {}